@@ -0,0 +1,86 @@
+"""
+Ejecuta la suite de benchmarks con los drivers dummy de SDL.
+
+Uso:
+    python -m benchmarks [--out resultados.json] [--only draw_text level1] [--repeat 50]
+    python -m benchmarks --compare base.json --out nuevo.json
+"""
+import sys
+import json
+import time
+import platform
+import argparse
+import subprocess
+
+import numpy
+import pygame
+
+from src.headless import init_headless
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "desconocida"
+
+
+def result_key(result) -> str:
+    params = ",".join(f"{k}={v}" for k, v in sorted(result['params'].items()))
+    return f"{result['name']}[{params}]"
+
+
+def print_results(results, baseline=None):
+    reference = {result_key(r): r for r in (baseline or {}).get('results', [])}
+    for result in results:
+        key = result_key(result)
+        line = f"{key:<55} mediana {result['median_ms']:9.3f} ms   p95 {result['p95_ms']:9.3f} ms"
+        previous = reference.get(key)
+        if previous and previous['median_ms'] > 0:
+            ratio = result['median_ms'] / previous['median_ms']
+            marker = "⚠️" if ratio > 1.10 else "  "
+            line += f"   {marker} x{ratio:.2f} vs base"
+        print(line)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Suite de benchmarks de The Shadow Curse")
+    parser.add_argument("--out", help="Archivo JSON donde guardar los resultados")
+    parser.add_argument("--only", nargs="*", help="Ejecutar solo los casos cuyo nombre contenga estos textos")
+    parser.add_argument("--repeat", type=int, default=50, help="Repeticiones por caso")
+    parser.add_argument("--compare", help="JSON de una ejecución anterior para comparar")
+    args = parser.parse_args(argv)
+
+    init_headless()
+    from benchmarks.suite import run_benchmarks
+
+    started = time.time()
+    results = run_benchmarks(args.only, args.repeat)
+    report = {
+        'meta': {
+            'timestamp': started,
+            'revision': git_revision(),
+            'python': platform.python_version(),
+            'pygame': pygame.version.ver,
+            'numpy': numpy.__version__,
+            'platform': platform.platform()
+        },
+        'results': results
+    }
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_results(results, baseline)
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, default=list)
+        print(f"📄 Resultados guardados en {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
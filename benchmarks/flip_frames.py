@@ -0,0 +1,92 @@
+"""
+Micro-benchmark: volteo de frames por tick frente a frames espejados precalculados.
+
+Simula 50 Golems mirando a la derecha (los sprites originales miran a la
+izquierda, así que todos necesitan el frame espejado) y mide cuántas
+Surfaces y bytes se crean por frame con cada estrategia.
+
+Uso:
+    python -m benchmarks.flip_frames [--enemies 50] [--ticks 600]
+"""
+import sys
+import time
+import argparse
+
+import pygame
+
+from src.headless import init_headless
+from src.enemies import Golem1
+
+
+def surface_bytes(surface: pygame.Surface) -> int:
+    return surface.get_pitch() * surface.get_height()
+
+
+def run_legacy(enemies, ticks: int):
+    """Estrategia anterior: pygame.transform.flip en cada tick."""
+    allocated = 0
+    surfaces = 0
+    start = time.perf_counter()
+    for _ in range(ticks):
+        for enemy in enemies:
+            animation = enemy.animations[enemy.current_animation]
+            animation.update()
+            image = pygame.transform.flip(animation.frames[animation.current_frame], True, False)
+            allocated += surface_bytes(image)
+            surfaces += 1
+            enemy.image = image
+    return time.perf_counter() - start, surfaces, allocated
+
+
+def run_cached(enemies, ticks: int):
+    """Estrategia actual: se elige el frame espejado precalculado."""
+    allocated = 0
+    surfaces = 0
+    known = set()
+    for enemy in enemies:
+        for animation in enemy.animations.values():
+            known.update(id(frame) for frame in animation.frames + animation.flipped_frames)
+    start = time.perf_counter()
+    for _ in range(ticks):
+        for enemy in enemies:
+            enemy.update_animation()
+            if id(enemy.image) not in known:
+                allocated += surface_bytes(enemy.image)
+                surfaces += 1
+    return time.perf_counter() - start, surfaces, allocated
+
+
+def make_enemies(count: int):
+    """Crea `count` Golems mirando a la derecha (necesitan el frame espejado)."""
+    enemies = []
+    for i in range(count):
+        enemy = Golem1(10 * i, 450)
+        enemy.facing_right = True
+        enemies.append(enemy)
+    return enemies
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--enemies", type=int, default=50)
+    parser.add_argument("--ticks", type=int, default=600)
+    args = parser.parse_args(argv)
+
+    init_headless()
+    enemies = make_enemies(args.enemies)
+
+    results = {
+        "transform.flip por tick": run_legacy(enemies, args.ticks),
+        "frames precalculados": run_cached(enemies, args.ticks),
+    }
+
+    print(f"{args.enemies} enemigos, {args.ticks} ticks")
+    for name, (elapsed, surfaces, allocated) in results.items():
+        print(f"  {name:<24} {elapsed * 1000 / args.ticks:8.3f} ms/frame  "
+              f"{surfaces / args.ticks:6.1f} Surfaces/frame  "
+              f"{allocated / args.ticks / 1024:8.1f} KB/frame")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,385 @@
+"""
+Casos de benchmark de los caminos calientes del juego.
+
+Cada caso se registra con @benchmark(nombre, parámetros). La función del caso
+recibe los parámetros, hace su preparación y retorna la función a medir; el
+runner la llama `repeat` veces y guarda los tiempos de cada llamada.
+"""
+import time
+import random
+import statistics
+from typing import Callable, Dict, List, Optional, Sequence
+
+import pygame
+
+from src import utils
+from src.headless import HeadlessRunner
+from src.enemies import Golem1
+from src.particles import ParticleSystem
+
+BenchmarkCase = Callable[..., Callable[[], None]]
+
+# nombre -> (función del caso, lista de combinaciones de parámetros)
+BENCHMARKS: Dict[str, tuple] = {}
+
+def benchmark(name: str, params: Sequence[Dict[str, object]] = ({},), repeat: Optional[int] = None):
+    """Registra un caso de benchmark con sus combinaciones de parámetros."""
+    def decorator(case: BenchmarkCase) -> BenchmarkCase:
+        BENCHMARKS[name] = (case, list(params), repeat)
+        return case
+    return decorator
+
+def measure(fn: Callable[[], None], repeat: int, warmup: int = 1) -> Dict[str, float]:
+    """Ejecuta `fn` repetidamente y retorna estadísticas en milisegundos."""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        fn()
+        samples.append((time.perf_counter_ns() - start) / 1e6)
+    samples.sort()
+    return {
+        'repeat': repeat,
+        'min_ms': samples[0],
+        'mean_ms': statistics.fmean(samples),
+        'median_ms': statistics.median(samples),
+        'p95_ms': samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+        'max_ms': samples[-1]
+    }
+
+def run_benchmarks(names: Optional[Sequence[str]] = None, repeat: int = 50) -> List[Dict[str, object]]:
+    """Ejecuta los casos seleccionados (todos por defecto)."""
+    results = []
+    for name, (case, params_list, case_repeat) in BENCHMARKS.items():
+        if names and not any(selected in name for selected in names):
+            continue
+        for params in params_list:
+            fn = case(**params)
+            stats = measure(fn, case_repeat or repeat)
+            results.append({'name': name, 'params': params, **stats})
+    return results
+
+# --- Carga de assets ---------------------------------------------------------
+
+@benchmark('load_animation', [{'size': (90, 90)}, {'size': (96, 96)}], repeat=5)
+def bench_load_animation(size):
+    def run():
+        utils.load_animation("Golem1/Idle", "Golem_03_Idle", 12, size)
+    return run
+
+@benchmark('load_background', [{'image': 'corrupted_forest.png'}, {'image': 'shadow_castle.png'}], repeat=5)
+def bench_load_background(image):
+    return lambda: utils.read_background(image)
+
+@benchmark('load_character_animations.cached', [{}])
+def bench_cached_character(**_):
+    config = {'idle': ('Golem_03_Idle', 12), 'walking': ('Golem_03_Walking', 18)}
+    utils.load_character_animations("Golem1", config, (90, 90))
+    return lambda: utils.load_character_animations("Golem1", config, (90, 90))
+
+def _probe_frame_path(folder: str, prefix: str, index: int):
+    """Búsqueda anterior al índice: dos candidatos por frame con Path.exists()."""
+    base_path = utils.ASSETS_DIR / "images" / "characters" / folder
+    for frame_name in (f"{prefix}_{index:03d}.png", f"{prefix}_{index + 1}.png"):
+        if (base_path / frame_name).exists():
+            return base_path / frame_name
+    return None
+
+@benchmark('frame_lookup', [{'strategy': 'exists'}, {'strategy': 'index.cold'}, {'strategy': 'index'}], repeat=10)
+def bench_frame_lookup(strategy):
+    """Resolver las rutas de todos los frames de todos los personajes."""
+    from src.asset_pack import animated_classes
+    frames = [(utils.animation_folder(cls.CHARACTER, anim_name), prefix, i)
+              for cls in animated_classes()
+              for anim_name, (prefix, frame_count) in cls.ANIMATIONS.items()
+              for i in range(frame_count)]
+    find = _probe_frame_path if strategy == 'exists' else utils.find_frame_path
+    def run():
+        if strategy == 'index.cold':
+            utils.refresh_frame_index()
+        for folder, prefix, i in frames:
+            find(folder, prefix, i)
+    return run
+
+@benchmark('preload_level', [{'mode': 'thread'}, {'mode': 'process'}], repeat=3)
+def bench_preload_level(mode):
+    """Arranque en frío de Level4: decodificar, escalar y convertir todos sus assets."""
+    from levels.level_4 import Level4
+    from src.preloader import AssetPreloader
+    loader = AssetPreloader(mode=mode)
+    def run():
+        utils.clear_animation_cache()
+        utils._background_cache.clear()
+        loader._requested.clear()
+        loader.preload_level(Level4)
+        loader.wait()
+    return run
+
+# --- Dibujado ---------------------------------------------------------------
+
+@benchmark('draw_text', [{'texts': 5}, {'texts': 50}, {'texts': 200}])
+def bench_draw_text(texts):
+    screen = pygame.display.get_surface()
+    labels = [f"+{100 + i % 20}" for i in range(texts)]
+    def run():
+        for i, label in enumerate(labels):
+            utils.draw_text(screen, label, (i % 700, i % 500), 24)
+    return run
+
+@benchmark('show_floating_text', [{'texts': 10}, {'texts': 100}])
+def bench_floating_text(texts):
+    screen = pygame.display.get_surface()
+    def run():
+        for i in range(texts):
+            utils.show_floating_text(screen, f"+{i % 10 * 50}", (i % 700, i % 500), (255, 215, 0))
+    return run
+
+@benchmark('draw_particles', [{'particles': 100}, {'particles': 1000}, {'particles': 5000}])
+def bench_draw_particles(particles):
+    screen = pygame.display.get_surface()
+    system = ParticleSystem(capacity=particles)
+    colors = [(255, 100, 0), (100, 200, 255), (255, 255, 0), (100, 0, 0)]
+    def run():
+        if len(system) < particles // 2:
+            for i in range(particles // 20):
+                system.emit((400, 300), colors[i % len(colors)], 20)
+        system.update()
+        system.draw(screen)
+    return run
+
+@benchmark('world_background', [{'strategy': 'image'}, {'strategy': 'tiles'}, {'strategy': 'tiles.dirty'}])
+def bench_world_background(strategy):
+    """
+    Fondo de un mundo de 1500x1125 desplazándose: la imagen completa en cada
+    frame, solo las teselas visibles, o solo las zonas sucias de un frame.
+    """
+    from src.camera import TiledBackground
+    screen = pygame.display.get_surface()
+    world_size = (1500, 1125)
+    areas = [pygame.Rect(100 + i * 150, 400, 90, 90) for i in range(4)]
+    position = {'x': 0}
+    if strategy == 'image':
+        image = utils.read_background("corrupted_forest.png", world_size)
+        def run():
+            position['x'] = (position['x'] + 7) % 700
+            screen.blit(image, (-position['x'], -300))
+        return run
+    background = TiledBackground("corrupted_forest.png", world_size)
+    def run():
+        position['x'] = (position['x'] + 7) % 700
+        background.draw(screen, (position['x'], 300), areas if strategy == 'tiles.dirty' else None)
+    return run
+
+# --- Actualización ----------------------------------------------------------
+
+class _Target:
+    """Jugador mínimo para que los Golems tengan a quién perseguir."""
+    def __init__(self, x: int, y: int):
+        self.rect = pygame.Rect(x, y, 96, 96)
+
+@benchmark('golem_update', [{'enemies': 1}, {'enemies': 10}, {'enemies': 50}, {'enemies': 500}])
+def bench_golem_update(enemies):
+    target = _Target(400, 450)
+    golems = []
+    for i in range(enemies):
+        golem = Golem1(20 + (i * 37) % 760, 450)
+        golem.set_player(target)
+        golems.append(golem)
+    def run():
+        for golem in golems:
+            golem.update()
+    return run
+
+@benchmark('enemy_batch.update', [{'enemies': 50}, {'enemies': 500}])
+def bench_enemy_batch_update(enemies):
+    from src.enemy_batch import EnemyBatch
+    target = _Target(400, 450)
+    batch = EnemyBatch([Golem1], capacity=enemies)
+    for i in range(enemies):
+        batch.spawn(Golem1, 20 + (i * 37) % 760, 450)
+    def run():
+        batch.update(target.rect)
+        batch.attack_damage(target.rect)
+    return run
+
+@benchmark('enemy_batch.draw', [{'enemies': 50}, {'enemies': 500}])
+def bench_enemy_batch_draw(enemies):
+    from src.enemy_batch import EnemyBatch
+    screen = pygame.display.get_surface()
+    batch = EnemyBatch([Golem1], capacity=enemies)
+    for i in range(enemies):
+        batch.spawn(Golem1, 20 + (i * 37) % 760, 450)
+    return lambda: batch.draw(screen)
+
+def _level1_with_enemies(enemies: int) -> HeadlessRunner:
+    """Nivel 1 con `enemies` golems; el reloj real queda restaurado al terminar."""
+    runner = HeadlessRunner(1, seed=0)
+    level = runner.level
+    level.current_enemy_index = len(level.wave_enemies)  # sin spawns adicionales
+    level.player.invulnerable_duration = float('inf')
+    level.player.invulnerable = True
+    for i in range(enemies):
+        golem = Golem1(100 + (i * 53) % 650, 450)
+        golem.set_player(level.player)
+        level.enemies.add(golem)
+    runner.close()
+    return runner
+
+def _simulated(runner: HeadlessRunner, step: Callable[[], None]) -> Callable[[], None]:
+    """Ejecuta `step` con el reloj simulado de `runner` sin dejarlo instalado para otros casos."""
+    def run():
+        utils.set_time_source(runner.clock.get_ticks)
+        try:
+            step()
+        finally:
+            runner.close()
+    return run
+
+@benchmark('level1.update', [{'enemies': 1}, {'enemies': 10}, {'enemies': 50}])
+def bench_level_update(enemies):
+    runner = _level1_with_enemies(enemies)
+    def step():
+        runner.level.update()
+        runner.clock.advance()
+    return _simulated(runner, step)
+
+@benchmark('ai_scheduler', [{'enemies': 200, 'strategy': 'every_tick'}, {'enemies': 200, 'strategy': 'scheduled'},
+                            {'enemies': 200, 'strategy': 'budget'}])
+def bench_ai_scheduler(enemies, strategy):
+    """Oleada grande repartida más allá de la pantalla: IA en cada tick frente al planificador."""
+    from src.ai_scheduler import AIScheduler
+    runner = _level1_with_enemies(0)
+    level = runner.level
+    def spawn():
+        for i in range(enemies):
+            golem = Golem1(100 + (i * 53) % 2900, 450)
+            golem.set_player(level.player)
+            level.enemies.add(golem)
+    _simulated(runner, spawn)()
+    if strategy == 'every_tick':
+        level.ai = AIScheduler(budget_ms=None, idle_interval=1, far_interval=1)
+    elif strategy == 'scheduled':
+        level.ai = AIScheduler(budget_ms=None)
+    else:
+        level.ai = AIScheduler(budget_ms=0.5)
+    def step():
+        level.update()
+        runner.clock.advance()
+    return _simulated(runner, step)
+
+@benchmark('level1.draw', [{'enemies': 1, 'renderer': 'full'}, {'enemies': 1, 'renderer': 'dirty'},
+                           {'enemies': 10, 'renderer': 'full'}, {'enemies': 10, 'renderer': 'dirty'},
+                           {'enemies': 50, 'renderer': 'full'}, {'enemies': 50, 'renderer': 'dirty'}])
+def bench_level_draw(enemies, renderer):
+    runner = _level1_with_enemies(enemies)
+    level = runner.level
+    _simulated(runner, level.update)()
+    level.renderer.enabled = renderer == 'dirty'
+    def step():
+        level.draw()
+        level.renderer.present()
+    return _simulated(runner, step)
+
+@benchmark('animation_frames', [{'enemies': 50, 'strategy': 'flip'}, {'enemies': 50, 'strategy': 'precomputed'}])
+def bench_animation_frames(enemies, strategy):
+    from benchmarks.flip_frames import make_enemies, run_legacy
+    golems = make_enemies(enemies)
+    if strategy == 'flip':
+        return lambda: run_legacy(golems, 1)
+    def run():
+        for golem in golems:
+            golem.update_animation()
+    return run
+
+@benchmark('animation_lod', [{'enemies': 200, 'lod': False}, {'enemies': 200, 'lod': True}])
+def bench_animation_lod(enemies, lod):
+    """Animación de una oleada repartida más allá de la pantalla, con y sin LOD."""
+    from src.lod import animation_lod
+    golems = [Golem1(-1000 + (i * 53) % 2900, 450) for i in range(enemies)]
+    clock = {'now': 0}
+    def run():
+        animation_lod.enabled = lod
+        utils.set_time_source(lambda: clock['now'])
+        try:
+            for golem in golems:
+                golem.update_animation()
+        finally:
+            utils.set_time_source(None)
+            animation_lod.enabled = True
+        clock['now'] += 17
+    return run
+
+# --- Colisiones -------------------------------------------------------------
+
+@benchmark('collision.query', [{'enemies': 50, 'strategy': 'pairs'}, {'enemies': 50, 'strategy': 'grid'},
+                               {'enemies': 500, 'strategy': 'pairs'}, {'enemies': 500, 'strategy': 'grid'},
+                               {'enemies': 500, 'strategy': 'grid.pixels'},
+                               {'enemies': 500, 'strategy': 'grid.pixels.uncached'}])
+def bench_collision_query(enemies, strategy):
+    """
+    Proyectiles contra enemigos: todos los pares frente a la rejilla, y la
+    rejilla con fase precisa de máscaras (cacheadas o creadas en cada consulta
+    como hace pygame.sprite.collide_mask sin atributo `mask`).
+    """
+    from src.collision import SpatialHash
+    rng = random.Random(0)
+    golem = utils.load_animation_frames("Golem1", Golem1.ANIMATIONS, Golem1.SIZE)['idle'][0][0]
+    bolt = pygame.Surface((16, 16), pygame.SRCALPHA)
+    pygame.draw.circle(bolt, (255, 128, 0), (8, 8), 6)
+    def sprites(count, image):
+        group = []
+        for _ in range(count):
+            sprite = pygame.sprite.Sprite()
+            sprite.image = image
+            sprite.rect = image.get_rect(topleft=(rng.randrange(800), rng.randrange(600)))
+            group.append(sprite)
+        return group
+    targets = sprites(enemies, golem)
+    projectiles = sprites(enemies, bolt)
+    if strategy == 'pairs':
+        def run():
+            for projectile in projectiles:
+                for target in targets:
+                    projectile.rect.colliderect(target.rect)
+        return run
+    grid = SpatialHash()
+    def run():
+        for target in targets:
+            target.rect.x = (target.rect.x + 1) % 800
+        grid.sync(targets)
+        if strategy == 'grid':
+            grid.collide(projectiles)
+        elif strategy == 'grid.pixels':
+            grid.collide(projectiles, pixels=True)
+        else:
+            for projectile, target in grid.collide(projectiles):
+                pygame.sprite.collide_mask(projectile, target)
+    return run
+
+# --- HUD --------------------------------------------------------------------
+
+@benchmark('hud', [{'strategy': 'draw_game_ui'}, {'strategy': 'cached'}])
+def bench_hud(strategy):
+    """HUD completo por frame frente a la capa precompuesta (valores que cambian poco)."""
+    from src.hud import GameHUD
+    from src.renderer import DirtyRenderer
+    screen = pygame.display.get_surface()
+    runner = HeadlessRunner(1, seed=0)
+    player = runner.level.player
+    runner.close()
+    state = {'tick': 0}
+    if strategy == 'draw_game_ui':
+        def run():
+            state['tick'] += 1
+            utils.draw_game_ui(screen, player, "Bosque Corrupto - Nivel 1", state['tick'] // 30 * 100, 1)
+        return run
+    hud = GameHUD()
+    renderer = DirtyRenderer(screen, utils.load_background("corrupted_forest.png"))
+    def run():
+        state['tick'] += 1
+        hud.update(player, "Bosque Corrupto - Nivel 1", state['tick'] // 30 * 100, 1)
+        renderer.begin_frame(invalid=hud.invalid_rects())
+        hud.draw(renderer)
+        renderer.end_frame()
+    return run
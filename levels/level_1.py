@@ -1,25 +1,47 @@
 import pygame
 from src.player import Player
 from src.enemies import Golem1, Golem2
+from src.collision import SpatialHash, rect_hits_sprite
+from src.ai_scheduler import AIScheduler
+from src.renderer import DirtyRenderer
+from src.camera import Camera, load_world_background
+from src.game_clock import GameClock
+from src.hud import GameHUD
+from src.profiler import profiler
+from src.audio import audio
+from src.preloader import preloader
+from src.snapshot import save_checkpoint
+from src.pools import FloatingTexts, enemy_pool
 from src.utils import (
-    load_background, 
     draw_text, 
-    draw_game_ui, 
-    play_music, 
-    show_floating_text,
-    create_placeholder_image
+    create_placeholder_image,
+    get_ticks
 )
 
 class Level1:
+    # Assets que el precargador puede preparar antes de construir el nivel
+    BACKGROUND = "corrupted_forest.png"
+    ENEMY_TYPES = (Golem1, Golem2)
+    MUSIC = "level1_background.mp3"
+    MUSIC_VOLUME = 0.6
+    # Tamaño del mundo en px; si supera la pantalla, la cámara sigue al jugador
+    WORLD_SIZE = (800, 600)
+
     def __init__(self, screen):
         self.screen = screen
-        self.background = load_background("corrupted_forest.png")
+        self.background = load_world_background(self.BACKGROUND, self.WORLD_SIZE)
+        self.renderer = DirtyRenderer(screen, self.background)
+        self.clock = GameClock()
+        self.camera = Camera(self.clock, self.WORLD_SIZE)
+        self.hud = GameHUD()
         self.player = Player(50, 450)
         self.enemies = pygame.sprite.Group()
+        self.ai = AIScheduler(view=self.camera.view_rect)
+        self.enemy_grid = SpatialHash()
         
         # Sistema de spawn y progresión
         self.score = 0
-        self.spawn_timer = pygame.time.get_ticks()
+        self.spawn_timer = get_ticks()
         self.spawn_delay = 2000
         self.enemies_defeated = 0
         self.required_kills = 4  # Número de Golems que hay que derrotar
@@ -38,18 +60,20 @@ class Level1:
         self.running = True
         self.victory = False
         self.game_over = False
+        # Instantánea para reintentar tras un Game Over (ver src.snapshot)
+        self.checkpoint = None
         self.paused = False
         self.game_started = False
         
         # Efectos visuales
-        self.floating_texts = []
+        self.floating_texts = FloatingTexts()
         
         # Música y sonidos
-        play_music("level1_background.mp3", volume=0.6)
+        audio.play_music(self.MUSIC, volume=self.MUSIC_VOLUME)
 
     def spawn_enemy(self):
         """Sistema de spawn de enemigos."""
-        current_time = pygame.time.get_ticks()
+        current_time = get_ticks()
         
         # Solo spawner si no hay enemigos y aún quedan enemigos por spawner
         if (len(self.enemies) == 0 and 
@@ -58,29 +82,33 @@ class Level1:
             
             # Obtener el siguiente enemigo de la lista
             enemy_class, x, y = self.wave_enemies[self.current_enemy_index]
-            enemy = enemy_class(x, y)
+            enemy = enemy_pool.acquire(enemy_class, x, y)
             # Establecer el jugador como objetivo del enemigo
             enemy.set_player(self.player)  # Añadir esta línea
             self.enemies.add(enemy)
             print(f"Spawneando {enemy_class.__name__} en ({x}, {y})")
             
             self.spawn_timer = current_time
+            # Cada Golem es una oleada: reintentar empieza en su aparición
+            save_checkpoint(self)
 
     def draw_enemy_health(self, enemy):
         """Dibuja la barra de vida del enemigo."""
         # Barra de vida
         bar_width = 50
         bar_height = 5
-        bar_position = (enemy.rect.x, enemy.rect.y - 10)
+        x, y = self.camera.to_screen(enemy.rect.topleft)
+        bar_position = (x, y - 10)
         
         # Fondo de la barra (rojo)
-        pygame.draw.rect(self.screen, (255, 0, 0),
-                        (bar_position[0], bar_position[1], bar_width, bar_height))
+        bar_rect = pygame.draw.rect(self.screen, (255, 0, 0),
+                                    (bar_position[0], bar_position[1], bar_width, bar_height))
         
         # Vida actual (verde)
         health_width = (enemy.health / enemy.max_health) * bar_width
         pygame.draw.rect(self.screen, (0, 255, 0),
                         (bar_position[0], bar_position[1], health_width, bar_height))
+        return bar_rect
 
     def run(self):
         """Loop principal del nivel."""
@@ -91,17 +119,42 @@ class Level1:
             self.handle_start_screen()
             clock.tick(60)
         
-        # Loop principal del juego
+        # Loop principal del juego: simulación a paso fijo, render según GAME_RENDER_FPS
+        self.clock.start()
+        if self.checkpoint is None:
+            save_checkpoint(self)
         while self.running:
+            profiler.begin_frame()
             if not self.paused:
-                self.handle_events()
-                self.update()
-            self.draw()
-            pygame.display.flip()
-            clock.tick(60)
+                with profiler.phase('handle_events'):
+                    self.handle_events()
+                for _ in range(self.clock.pending_steps()):
+                    self.clock.remember([self.player, *self.enemies])
+                    self.update()
+                    self.clock.advance()
+                    if not self.running:
+                        break
+            else:
+                self.clock.hold()
+            with profiler.phase('draw'):
+                self.draw()
+                self.renderer.add(profiler.draw(self.screen))
+            with profiler.phase('display.flip'):
+                self.renderer.present()
+            profiler.end_frame()
+            self.clock.tick()
+        self.clock.stop()
+        profiler.log_summary()
+        self.release_enemies()
+        self.floating_texts.clear()
         
         return self.victory
 
+    def release_enemies(self):
+        """Devuelve al pool los enemigos que seguían vivos al salir del nivel."""
+        for enemy in list(self.enemies):
+            enemy_pool.release(enemy)
+
     def handle_start_screen(self):
         """Maneja la pantalla de inicio del nivel."""
         for event in pygame.event.get():
@@ -113,6 +166,9 @@ class Level1:
                 elif event.key == pygame.K_ESCAPE:
                     self.running = False
         
+        # Integrar los assets del siguiente nivel mientras se espera
+        preloader.poll()
+        
         # Dibujar pantalla de inicio
         self.screen.fill((0, 0, 0))
         draw_text(
@@ -136,6 +192,8 @@ class Level1:
     def handle_events(self):
         """Maneja los eventos del nivel."""
         for event in pygame.event.get():
+            if profiler.handle_event(event):
+                continue
             if event.type == pygame.QUIT:
                 self.running = False
             elif event.type == pygame.KEYDOWN:
@@ -149,95 +207,92 @@ class Level1:
 
     def update(self):
         """Actualiza el estado del nivel."""
-        current_time = pygame.time.get_ticks()
+        current_time = get_ticks()
         
         # Actualizar jugador
-        self.player.update()
+        with profiler.phase('player.update'):
+            self.player.update()
         
-        # Mantener al jugador dentro de los límites de la pantalla
+        # Mantener al jugador dentro de los límites del mundo
         if self.player.rect.left < 0:
             self.player.rect.left = 0
-        if self.player.rect.right > 800:
-            self.player.rect.right = 800
+        if self.player.rect.right > self.WORLD_SIZE[0]:
+            self.player.rect.right = self.WORLD_SIZE[0]
+        self.camera.follow(self.player)
         
         # Actualizar y verificar enemigos
-        for enemy in list(self.enemies):
+        with profiler.phase('enemies'):
+            self.update_enemies(current_time)
+
+        # Spawn de enemigos
+        with profiler.phase('spawn'):
+            self.spawn_enemy()
+        
+        # Actualizar textos flotantes
+        self.floating_texts.expire(current_time)
+
+    def update_enemies(self, current_time: int):
+        """Actualiza los enemigos y resuelve sus colisiones con el jugador."""
+        for enemy in self.enemies:
             # Asegurar que el enemigo tenga referencia al jugador
             enemy.set_player(self.player)
-            enemy.update()
-            
-            # Verificar colisión con el jugador
-            if self.player.rect.colliderect(enemy.rect):
-                # Verificar si el jugador está cayendo sobre el enemigo
-                player_falling = self.player.velocity_y > 0
-                player_above = self.player.rect.bottom < enemy.rect.centery
-                
-                if player_falling and player_above:
-                    # El jugador está cayendo sobre el enemigo
-                    # Solo ajustamos la posición del jugador sin hacer daño
-                    self.player.rect.bottom = enemy.rect.top
-                    self.player.velocity_y = self.player.jump_speed * 0.5  # Rebote pequeño
-                else:
-                    # Solo recibe daño si el enemigo está atacando
-                    if enemy.is_attacking:
-                        # Verificar si el jugador está en el área de ataque del enemigo
-                        if enemy.attack_rect and enemy.attack_rect.colliderect(self.player.rect):
-                            self.player.take_damage(enemy.attack_damage)
-                            if self.player.health <= 0:
-                                self.game_over = True
-                                self.running = False
-            
-            # Verificar si el jugador está atacando y golpea al enemigo
-            if self.player.is_attacking and self.player.attack_rect:
-                if self.player.attack_rect.colliderect(enemy.rect):
-                    enemy.take_damage(self.player.attack_damage)
+        # Los enemigos lejanos o en reposo no piensan en todos los ticks
+        self.ai.update(self.enemies, self.player)
+        
+        # Solo se revisan los enemigos de las celdas que tocan al jugador y a su ataque;
+        # de esos, solo los que lo tocan con píxeles opacos
+        self.enemy_grid.sync(self.enemies)
+        for enemy in self.enemy_grid.query_sprite(self.player):
+            # Verificar si el jugador está cayendo sobre el enemigo
+            player_falling = self.player.velocity_y > 0
+            player_above = self.player.rect.bottom < enemy.rect.centery
             
+            if player_falling and player_above:
+                # El jugador está cayendo sobre el enemigo
+                # Solo ajustamos la posición del jugador sin hacer daño
+                self.player.rect.bottom = enemy.rect.top
+                self.player.velocity_y = self.player.jump_speed * 0.5  # Rebote pequeño
+            else:
+                # Solo recibe daño si el enemigo está atacando
+                if enemy.is_attacking:
+                    # Verificar si el jugador está en el área de ataque del enemigo
+                    if rect_hits_sprite(enemy.attack_rect, self.player):
+                        self.player.take_damage(enemy.attack_damage)
+                        if self.player.health <= 0:
+                            self.game_over = True
+                            self.running = False
+        
+        # Verificar si el jugador está atacando y golpea a algún enemigo
+        if self.player.is_attacking and self.player.attack_rect:
+            for enemy in self.enemy_grid.query_rect_pixels(self.player.attack_rect):
+                enemy.take_damage(self.player.attack_damage)
+        
+        for enemy in list(self.enemies):
             # Verificar si el enemigo murió
             if enemy.health <= 0:
                 score_value = 150 if isinstance(enemy, Golem2) else 100
                 self.score += score_value
                 self.enemies_defeated += 1
                 self.current_enemy_index += 1
-                enemy.kill()
+                enemy_pool.release(enemy)
                 
                 # Mostrar texto de puntuación
-                self.floating_texts.append({
-                    'text': f"+{score_value}",
-                    'position': enemy.rect.topleft,
-                    'color': (255, 215, 0),
-                    'end_time': current_time + 1000
-                })
+                self.floating_texts.add(f"+{score_value}", enemy.rect.topleft, (255, 215, 0),
+                                        current_time + 1000)
                 
                 # Mostrar texto de progreso
                 enemies_left = self.required_kills - self.enemies_defeated
                 if enemies_left > 0:
-                    self.floating_texts.append({
-                        'text': f"¡Faltan {enemies_left} enemigos!",
-                        'position': (400, 300),
-                        'color': (255, 255, 255),
-                        'end_time': current_time + 2000
-                    })
+                    self.floating_texts.add(f"¡Faltan {enemies_left} enemigos!", (400, 300),
+                                            (255, 255, 255), current_time + 2000, screen_space=True)
                 
                 # Verificar victoria
                 if self.enemies_defeated >= self.required_kills:
                     self.victory = True
                     self.running = False
                     # Mostrar mensaje de victoria
-                    self.floating_texts.append({
-                        'text': "¡Nivel Completado!",
-                        'position': (400, 300),
-                        'color': (255, 215, 0),
-                        'end_time': current_time + 3000
-                    })
-
-        # Spawn de enemigos
-        self.spawn_enemy()
-        
-        # Actualizar textos flotantes
-        self.floating_texts = [
-            text for text in self.floating_texts 
-            if current_time < text['end_time']
-        ]
+                    self.floating_texts.add("¡Nivel Completado!", (400, 300), (255, 215, 0),
+                                            current_time + 3000, screen_space=True)
         
     def get_collision_side(self, rect1, rect2):
         """
@@ -270,36 +325,31 @@ class Level1:
 
     def draw(self):
         """Dibuja todos los elementos del nivel."""
-        # Dibujar fondo
-        self.screen.blit(self.background, (0, 0))
+        # Dibujar fondo (completo en pausa; si no, solo lo que ensució el frame anterior)
+        renderer = self.renderer
+        self.hud.update(self.player, "Bosque Corrupto - Nivel 1", self.score, self.wave_number)
+        camera = self.camera
+        camera.begin_draw()
+        renderer.begin_frame(full=self.paused, invalid=self.hud.invalid_rects(), scroll=camera.scroll)
         
         # Dibujar jugador
-        self.screen.blit(self.player.image, self.player.rect)
+        renderer.blit(self.player.image, camera.position(self.player))
+        renderer.add(self.player.particles.draw(self.screen, camera.offset))
         
         # Dibujar enemigos y sus barras de vida
         for enemy in self.enemies:
-            self.screen.blit(enemy.image, enemy.rect)
-            self.draw_enemy_health(enemy)
+            if renderer.blit_sprite(enemy.image, camera.position(enemy)):
+                renderer.add(self.draw_enemy_health(enemy))
         
         # Dibujar textos flotantes
-        current_time = pygame.time.get_ticks()
+        current_time = get_ticks()
         for text in self.floating_texts:
-            if current_time < text['end_time']:
-                show_floating_text(
-                    self.screen,
-                    text['text'],
-                    text['position'],
-                    text['color']
-                )
+            if current_time < text.end_time:
+                position = text.position if text.screen_space else camera.to_screen(text.position)
+                renderer.add(draw_text(self.screen, text.text, position, 24, text.color))
         
-        # UI
-        draw_game_ui(
-            self.screen,
-            self.player,
-            "Bosque Corrupto - Nivel 1",
-            self.score,
-            self.wave_number
-        )
+        # UI (solo se recompone si cambió algún valor)
+        self.hud.draw(renderer)
         
         # Menú de pausa
         if self.paused:
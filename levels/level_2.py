@@ -2,21 +2,43 @@ import pygame
 import random
 from src.player import Player
 from src.enemies import Ghost1, Ghost2
+from src.collision import SpatialHash
+from src.ai_scheduler import AIScheduler
+from src.renderer import DirtyRenderer
+from src.camera import Camera, load_world_background
+from src.game_clock import GameClock
+from src.hud import GameHUD
+from src.profiler import profiler
+from src.audio import audio
+from src.preloader import preloader
+from src.snapshot import save_checkpoint
+from src.pools import FloatingTexts, enemy_pool
 from src.utils import (
-    load_background, 
     draw_text, 
-    draw_game_ui, 
-    play_music, 
-    show_floating_text,
-    create_placeholder_image
+    create_placeholder_image,
+    get_ticks
 )
 
 class Level2:
+    # Assets que el precargador puede preparar antes de construir el nivel
+    BACKGROUND = "shadow_mountains.png"
+    ENEMY_TYPES = (Ghost1, Ghost2)
+    MUSIC = "level2_background.mp3"
+    MUSIC_VOLUME = 0.6
+    # Tamaño del mundo en px; si supera la pantalla, la cámara sigue al jugador
+    WORLD_SIZE = (800, 600)
+
     def __init__(self, screen):
         self.screen = screen
-        self.background = load_background("shadow_mountains.png")
+        self.background = load_world_background(self.BACKGROUND, self.WORLD_SIZE)
+        self.renderer = DirtyRenderer(screen, self.background)
+        self.clock = GameClock()
+        self.camera = Camera(self.clock, self.WORLD_SIZE)
+        self.hud = GameHUD()
         self.player = Player(50, 300)
         self.enemies = pygame.sprite.Group()
+        self.ai = AIScheduler(view=self.camera.view_rect)
+        self.enemy_grid = SpatialHash()
         
         # Sistema de spawn y puntuación
         self.score = 0
@@ -31,14 +53,16 @@ class Level2:
         self.running = True
         self.victory = False
         self.game_over = False
+        # Instantánea para reintentar tras un Game Over (ver src.snapshot)
+        self.checkpoint = None
         self.paused = False
         self.game_started = False
         
         # Efectos visuales
-        self.floating_texts = []
+        self.floating_texts = FloatingTexts()
         
         # Música y sonidos
-        play_music("level2_background.mp3", volume=0.6)
+        audio.play_music(self.MUSIC, volume=self.MUSIC_VOLUME)
 
     def spawn_enemy(self):
         """Sistema de spawn de enemigos."""
@@ -61,8 +85,8 @@ class Level2:
                 # Mayormente Ghost1 en oleadas iniciales
                 enemy_type = Ghost2 if random.random() < 0.2 else Ghost1
             
-            # Crear y añadir el enemigo
-            enemy = enemy_type(*pos)
+            # Crear (o reutilizar) y añadir el enemigo
+            enemy = enemy_pool.acquire(enemy_type, *pos)
             self.enemies.add(enemy)
 
     def handle_wave(self):
@@ -74,22 +98,14 @@ class Level2:
             self.max_enemies = min(6, self.max_enemies + 1)
             
             # Mostrar texto de nueva oleada
-            self.floating_texts.append({
-                'text': f"¡Oleada {self.wave_number}!",
-                'position': (400, 300),
-                'color': (255, 215, 0),
-                'end_time': show_floating_text(
-                    self.screen,
-                    f"¡Oleada {self.wave_number}!",
-                    (400, 300),
-                    (255, 215, 0)
-                )
-            })
+            self.floating_texts.add(f"¡Oleada {self.wave_number}!", (400, 300), (255, 215, 0),
+                                    get_ticks() + 1000, screen_space=True)
             
             # Spawn especial para nuevas oleadas
             if self.wave_number % 2 == 0:
-                self.enemies.add(Ghost2(800, 200))
-                self.enemies.add(Ghost2(850, 300))
+                self.enemies.add(enemy_pool.acquire(Ghost2, 800, 200))
+                self.enemies.add(enemy_pool.acquire(Ghost2, 850, 300))
+            save_checkpoint(self)
 
     def run(self):
         """Loop principal del nivel."""
@@ -100,17 +116,42 @@ class Level2:
             self.handle_start_screen()
             clock.tick(60)
         
-        # Loop principal del juego
+        # Loop principal del juego: simulación a paso fijo, render según GAME_RENDER_FPS
+        self.clock.start()
+        if self.checkpoint is None:
+            save_checkpoint(self)
         while self.running:
+            profiler.begin_frame()
             if not self.paused:
-                self.handle_events()
-                self.update()
-            self.draw()
-            pygame.display.flip()
-            clock.tick(60)
+                with profiler.phase('handle_events'):
+                    self.handle_events()
+                for _ in range(self.clock.pending_steps()):
+                    self.clock.remember([self.player, *self.enemies])
+                    self.update()
+                    self.clock.advance()
+                    if not self.running:
+                        break
+            else:
+                self.clock.hold()
+            with profiler.phase('draw'):
+                self.draw()
+                self.renderer.add(profiler.draw(self.screen))
+            with profiler.phase('display.flip'):
+                self.renderer.present()
+            profiler.end_frame()
+            self.clock.tick()
+        self.clock.stop()
+        profiler.log_summary()
+        self.release_enemies()
+        self.floating_texts.clear()
         
         return self.victory
 
+    def release_enemies(self):
+        """Devuelve al pool los enemigos que seguían vivos al salir del nivel."""
+        for enemy in list(self.enemies):
+            enemy_pool.release(enemy)
+
     def handle_start_screen(self):
         """Maneja la pantalla de inicio del nivel."""
         for event in pygame.event.get():
@@ -122,6 +163,9 @@ class Level2:
                 elif event.key == pygame.K_ESCAPE:
                     self.running = False
         
+        # Integrar los assets del siguiente nivel mientras se espera
+        preloader.poll()
+        
         # Dibujar pantalla de inicio
         self.screen.fill((0, 0, 0))
         draw_text(
@@ -152,6 +196,8 @@ class Level2:
     def handle_events(self):
         """Maneja los eventos del nivel."""
         for event in pygame.event.get():
+            if profiler.handle_event(event):
+                continue
             if event.type == pygame.QUIT:
                 self.running = False
             elif event.type == pygame.KEYDOWN:
@@ -165,35 +211,48 @@ class Level2:
 
     def update(self):
         """Actualiza el estado del nivel."""
-        current_time = pygame.time.get_ticks()
+        current_time = get_ticks()
         
         # Actualizar jugador y enemigos
-        self.player.update()
-        self.enemies.update()
+        with profiler.phase('player.update'):
+            self.player.update()
+        self.camera.follow(self.player)
+        with profiler.phase('enemies'):
+            self.ai.update(self.enemies, self.player)
 
         # Sistema de spawn
-        if current_time - self.spawn_timer > self.spawn_delay:
-            self.spawn_enemy()
-            self.spawn_timer = current_time
+        with profiler.phase('spawn'):
+            if current_time - self.spawn_timer > self.spawn_delay:
+                self.spawn_enemy()
+                self.spawn_timer = current_time
 
-        self.handle_wave()
+            self.handle_wave()
 
         # Actualizar textos flotantes
-        self.floating_texts = [
-            text for text in self.floating_texts 
-            if current_time < text['end_time']
-        ]
+        self.floating_texts.expire(current_time)
 
         # Colisiones y combate
-        for enemy in list(self.enemies):
-            # Colisión jugador-enemigo
-            if self.player.rect.colliderect(enemy.rect):
-                damage = 20 if isinstance(enemy, Ghost2) else 15
-                self.player.take_damage(damage)
-                if self.player.health <= 0:
-                    self.game_over = True
-                    self.running = False
+        with profiler.phase('enemies'):
+            self.handle_collisions()
 
+        # Victoria
+        if self.score >= self.victory_score:
+            self.victory = True
+            self.running = False
+
+    def handle_collisions(self):
+        """Resuelve las colisiones entre el jugador y los enemigos."""
+        # Colisión jugador-enemigo: solo los enemigos de las celdas del jugador
+        # cuyos píxeles opacos tocan los suyos
+        self.enemy_grid.sync(self.enemies)
+        for enemy in self.enemy_grid.query_sprite(self.player):
+            damage = 20 if isinstance(enemy, Ghost2) else 15
+            self.player.take_damage(damage)
+            if self.player.health <= 0:
+                self.game_over = True
+                self.running = False
+
+        for enemy in list(self.enemies):
             # Verificar si el enemigo murió
             if enemy.health <= 0:
                 score_value = 150 if isinstance(enemy, Ghost2) else 100
@@ -202,53 +261,35 @@ class Level2:
                 self.player.add_experience(25)
                 
                 # Mostrar texto de puntuación
-                self.floating_texts.append({
-                    'text': f"+{score_value}",
-                    'position': enemy.rect.topleft,
-                    'color': (255, 215, 0),
-                    'end_time': show_floating_text(
-                        self.screen,
-                        f"+{score_value}",
-                        enemy.rect.topleft,
-                        (255, 215, 0)
-                    )
-                })
+                self.floating_texts.add(f"+{score_value}", enemy.rect.topleft, (255, 215, 0),
+                                        get_ticks() + 1000)
                 
-                enemy.kill()
-
-        # Victoria
-        if self.score >= self.victory_score:
-            self.victory = True
-            self.running = False
+                enemy_pool.release(enemy)
 
     def draw(self):
         """Dibuja todos los elementos del nivel."""
-        # Dibujar fondo
-        self.screen.blit(self.background, (0, 0))
+        # Dibujar fondo (completo en pausa; si no, solo lo que ensució el frame anterior)
+        renderer = self.renderer
+        self.hud.update(self.player, "Montañas Sombrías - Nivel 2", self.score, self.wave_number)
+        camera = self.camera
+        camera.begin_draw()
+        renderer.begin_frame(full=self.paused, invalid=self.hud.invalid_rects(), scroll=camera.scroll)
         
         # Dibujar sprites
-        self.enemies.draw(self.screen)
-        self.screen.blit(self.player.image, self.player.rect.topleft)
+        for enemy in self.enemies:
+            renderer.blit_sprite(enemy.image, camera.position(enemy))
+        renderer.blit(self.player.image, camera.position(self.player))
+        renderer.add(self.player.particles.draw(self.screen, camera.offset))
         
         # Dibujar textos flotantes
-        current_time = pygame.time.get_ticks()
+        current_time = get_ticks()
         for text in self.floating_texts:
-            if current_time < text['end_time']:
-                show_floating_text(
-                    self.screen,
-                    text['text'],
-                    text['position'],
-                    text['color']
-                )
+            if current_time < text.end_time:
+                position = text.position if text.screen_space else camera.to_screen(text.position)
+                renderer.add(draw_text(self.screen, text.text, position, 24, text.color))
         
-        # UI
-        draw_game_ui(
-            self.screen,
-            self.player,
-            "Montañas Sombrías - Nivel 2",
-            self.score,
-            self.wave_number
-        )
+        # UI (solo se recompone si cambió algún valor)
+        self.hud.draw(renderer)
         
         # Menú de pausa
         if self.paused:
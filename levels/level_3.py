@@ -2,23 +2,49 @@ import pygame
 import random
 from src.player import Player
 from src.enemies import Dragon, Ghost1, Ghost2
-from src.utils import load_background, draw_text, load_sound
+from src.collision import SpatialHash
+from src.ai_scheduler import AIScheduler
+from src.renderer import DirtyRenderer
+from src.camera import Camera, load_world_background
+from src.game_clock import GameClock
+from src.hud import HUD, TextElement, BarElement
+from src.profiler import profiler
+from src.audio import audio
+from src.pools import enemy_pool
+from src.snapshot import save_checkpoint
 
 class Level3:
+    # Assets que el precargador puede preparar antes de construir el nivel
+    BACKGROUND = "dungeon/back.png"
+    ENEMY_TYPES = (Dragon, Ghost1, Ghost2)
+    MUSIC = "level3_theme.mp3"
+    MUSIC_VOLUME = 0.6
+    # Tamaño del mundo en px; si supera la pantalla, la cámara sigue al jugador
+    WORLD_SIZE = (800, 600)
+
     def __init__(self, screen):
         self.screen = screen
-        self.background = load_background("assets/images/backgrounds/dungeon.png")
+        self.background = load_world_background(self.BACKGROUND, self.WORLD_SIZE)
+        self.renderer = DirtyRenderer(screen, self.background)
+        self.clock = GameClock()
+        self.camera = Camera(self.clock, self.WORLD_SIZE)
+        self.hud = HUD([
+            ('title', TextElement((20, 20), "Mazmorras Oscuras - Oleada {}/{}")),
+            ('score', TextElement((20, 50), "Puntuación: {}")),
+            ('health', BarElement((10, 80), (200, 20), (255, 0, 0))),
+            ('mana', BarElement((10, 110), (200, 20), (0, 0, 255)))
+        ])
         self.player = Player(50, 300)
         
-        # Música y efectos de sonido
-        self.background_music = load_sound("level3_theme.mp3")
-        if self.background_music:
-            self.background_music.play(-1)
+        # Música en streaming
+        audio.play_music(self.MUSIC, volume=self.MUSIC_VOLUME)
         
         # Grupos de sprites
         self.all_sprites = pygame.sprite.Group()
         self.enemies = pygame.sprite.Group()
+        self.ai = AIScheduler(view=self.camera.view_rect)
         self.projectiles = pygame.sprite.Group()
+        self.enemy_grid = SpatialHash()
         
         # Añadir enemigos
         self.dragon = Dragon(600, 200)
@@ -28,11 +54,15 @@ class Level3:
         # Añadir fantasmas
         ghost_positions = [(400, 100), (200, 400), (700, 300)]
         for x, y in ghost_positions:
-            ghost = Ghost1(x, y) if random.random() < 0.5 else Ghost2(x, y)
+            ghost = enemy_pool.acquire(Ghost1 if random.random() < 0.5 else Ghost2, x, y)
             self.enemies.add(ghost)
             self.all_sprites.add(ghost)
         
         self.running = True
+        self.victory = False
+        self.game_over = False
+        # Instantánea para reintentar tras un Game Over (ver src.snapshot)
+        self.checkpoint = None
         self.score = 0
         self.wave = 1
         self.max_waves = 3
@@ -45,81 +75,127 @@ class Level3:
             for _ in range(num_ghosts):
                 x = random.randint(100, 700)
                 y = random.randint(100, 500)
-                ghost = Ghost1(x, y) if random.random() < 0.5 else Ghost2(x, y)
+                ghost = enemy_pool.acquire(Ghost1 if random.random() < 0.5 else Ghost2, x, y)
                 self.enemies.add(ghost)
                 self.all_sprites.add(ghost)
+            save_checkpoint(self)
 
     def run(self):
-        clock = pygame.time.Clock()
+        # Simulación a paso fijo, render según GAME_RENDER_FPS
+        self.clock.start()
+        if self.checkpoint is None:
+            save_checkpoint(self)
         while self.running:
-            self.handle_events()
-            self.update()
-            self.draw()
-            pygame.display.flip()
-            clock.tick(60)
+            profiler.begin_frame()
+            with profiler.phase('handle_events'):
+                self.handle_events()
+            for _ in range(self.clock.pending_steps()):
+                self.clock.remember([self.player, *self.all_sprites])
+                self.update()
+                self.clock.advance()
+                if not self.running:
+                    break
+            with profiler.phase('draw'):
+                self.draw()
+                self.renderer.add(profiler.draw(self.screen))
+            with profiler.phase('display.flip'):
+                self.renderer.present()
+            profiler.end_frame()
+            self.clock.tick()
+        self.clock.stop()
+        profiler.log_summary()
 
         # Limpiar recursos
-        if self.background_music:
-            self.background_music.stop()
+        audio.stop_music()
+        self.release_enemies()
+        
+        return self.victory
+
+    def release_enemies(self):
+        """Devuelve los fantasmas al pool (el dragón no se reutiliza)."""
+        for enemy in list(self.enemies):
+            if enemy is not self.dragon:
+                enemy_pool.release(enemy)
 
     def handle_events(self):
         for event in pygame.event.get():
+            if profiler.handle_event(event):
+                continue
             if event.type == pygame.QUIT:
                 self.running = False
             self.player.handle_event(event)
 
     def update(self):
         # Actualizar jugador
-        self.player.update()
+        with profiler.phase('player.update'):
+            self.player.update()
+        self.camera.follow(self.player)
         
-        # Actualizar enemigos
-        self.enemies.update()
-        
-        # Colisiones con enemigos
-        for enemy in self.enemies:
-            if self.player.rect.colliderect(enemy.rect):
-                if isinstance(enemy, Dragon):
-                    self.player.take_damage(enemy.damage * 2)  # El dragón hace más daño por contacto
-                else:
-                    self.player.take_damage(enemy.damage)
-            
-            # Lógica de ataque de enemigos
-            if isinstance(enemy, Dragon):
-                if abs(self.player.rect.centerx - enemy.rect.centerx) < 200:
-                    damage = enemy.fire_attack()
-                    if damage > 0:
-                        self.player.take_damage(damage)
+        # Actualizar enemigos y resolver colisiones
+        with profiler.phase('enemies'):
+            self.ai.update(self.enemies, self.player)
+            self.projectiles.update()
+            self.handle_collisions()
         
         # Verificar condiciones de victoria/derrota
         if self.player.health <= 0:
+            self.game_over = True
             self.running = False
         elif len(self.enemies) == 0:
             if self.wave < self.max_waves:
-                self.spawn_wave()
+                with profiler.phase('spawn'):
+                    self.spawn_wave()
             else:
-                self.running = False  # Victoria
+                self.victory = True
+                self.running = False
+
+    def handle_collisions(self):
+        """Resuelve las colisiones y ataques entre el jugador y los enemigos."""
+        self.enemy_grid.sync(self.enemies)
+        for enemy in self.enemy_grid.query_sprite(self.player):
+            if isinstance(enemy, Dragon):
+                self.player.take_damage(enemy.attack_damage * 2)  # El dragón hace más daño por contacto
+            else:
+                self.player.take_damage(enemy.attack_damage)
+        
+        # Proyectiles contra enemigos: cada proyectil solo revisa sus celdas
+        for projectile, enemy in self.enemy_grid.collide(self.projectiles, pixels=True):
+            if projectile.alive():
+                enemy.health -= projectile.damage
+                projectile.kill()
+        
+        # Lógica de ataque de enemigos
+        if self.dragon.alive() and abs(self.player.rect.centerx - self.dragon.rect.centerx) < 200:
+            damage = self.dragon.fire_attack()
+            if damage > 0:
+                self.player.take_damage(damage)
 
     def draw(self):
-        # Dibujar fondo
-        self.screen.blit(self.background, (0, 0))
+        # Dibujar fondo (solo lo que ensució el frame anterior)
+        renderer = self.renderer
+        self.hud.set('title', self.wave, self.max_waves)
+        self.hud.set('score', self.score)
+        self.hud.set('health', self.player.health, self.player.max_health)
+        self.hud.set('mana', self.player.mana, self.player.max_mana)
+        camera = self.camera
+        camera.begin_draw()
+        renderer.begin_frame(invalid=self.hud.invalid_rects(), scroll=camera.scroll)
         
         # Dibujar sprites
-        self.all_sprites.draw(self.screen)
-        self.screen.blit(self.player.image, self.player.rect)
-        
-        # Dibujar UI
-        draw_text(self.screen, f"Mazmorras Oscuras - Oleada {self.wave}/{self.max_waves}", (20, 20))
-        draw_text(self.screen, f"Puntuación: {self.score}", (20, 50))
+        for sprite in self.all_sprites:
+            renderer.blit_sprite(sprite.image, camera.position(sprite))
+        renderer.blit(self.player.image, camera.position(self.player))
+        renderer.add(self.player.particles.draw(self.screen, camera.offset))
         
-        # Barras de vida y maná del jugador
-        pygame.draw.rect(self.screen, (255, 0, 0), (10, 80, 200 * (self.player.health/self.player.max_health), 20))
-        pygame.draw.rect(self.screen, (0, 0, 255), (10, 110, 200 * (self.player.mana/self.player.max_mana), 20))
+        # UI: textos y barras de vida y maná del jugador
+        self.hud.draw(renderer)
         
         # Barras de vida de enemigos
         for enemy in self.enemies:
             health_percentage = enemy.health / enemy.max_health
             bar_width = 50
             bar_height = 5
-            bar_x = enemy.rect.centerx - bar_width // 2
-            bar_y = enemy.rect.top - 10
-            pygame.draw.rect(self.screen, (255, 0, 0), (bar_x, bar_y, bar_width * health_percentage, bar_height))
\ No newline at end of file
+            bar = camera.to_screen(enemy.rect)
+            bar_x = bar.centerx - bar_width // 2
+            bar_y = bar.top - 10
+            renderer.add(pygame.draw.rect(self.screen, (255, 0, 0), (bar_x, bar_y, bar_width * health_percentage, bar_height)))
\ No newline at end of file
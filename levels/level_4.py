@@ -2,21 +2,45 @@ import pygame
 import random
 from src.player import Player
 from src.enemies import BlackMage
+from src.collision import sprites_collide
+from src.ai_scheduler import AIScheduler
+from src.renderer import DirtyRenderer
+from src.camera import Camera, load_world_background
+from src.game_clock import GameClock
+from src.hud import HUD, GameHUD, BossBarElement
+from src.profiler import profiler
+from src.audio import audio
+from src.preloader import preloader
+from src.snapshot import save_checkpoint
+from src.pools import FloatingTexts
 from src.utils import (
-    load_background, 
     draw_text, 
-    draw_game_ui, 
-    play_music, 
-    show_floating_text,
-    create_placeholder_image
+    create_placeholder_image,
+    get_ticks
 )
 
 class Level4:
+    # Assets que el precargador puede preparar antes de construir el nivel
+    BACKGROUND = "shadow_castle.png"
+    ENEMY_TYPES = (BlackMage,)
+    MUSIC = "boss_theme.mp3"
+    MUSIC_VOLUME = 0.7
+    # Tamaño del mundo en px; si supera la pantalla, la cámara sigue al jugador
+    WORLD_SIZE = (800, 600)
+
     def __init__(self, screen):
         self.screen = screen
-        self.background = load_background("shadow_castle.png")
+        self.background = load_world_background(self.BACKGROUND, self.WORLD_SIZE)
+        self.renderer = DirtyRenderer(screen, self.background)
+        self.clock = GameClock()
+        self.camera = Camera(self.clock, self.WORLD_SIZE)
+        self.hud = GameHUD()
+        self.boss_hud = HUD([
+            ('boss', BossBarElement(((800 - 400) // 2, 550), (400, 30), "El Señor Oscuro"))
+        ])
         self.player = Player(50, 300)
         self.enemies = pygame.sprite.Group()
+        self.ai = AIScheduler(view=self.camera.view_rect)
         
         # Configuración del jefe final
         self.boss = BlackMage(600, 250)
@@ -34,17 +58,22 @@ class Level4:
         self.running = True
         self.victory = False
         self.game_over = False
+        # Instantánea para reintentar tras un Game Over (ver src.snapshot)
+        self.checkpoint = None
         self.paused = False
         self.game_started = False
         
         # Efectos visuales
-        self.floating_texts = []
+        self.floating_texts = FloatingTexts()
         self.screen_shake = 0
         self.flash_screen = False
         self.flash_duration = 0
+        # RNG propio del temblor de pantalla: dibujar no debe alterar la secuencia
+        # de `random` que usa la simulación (grabaciones de src.replay)
+        self.effects_rng = random.Random()
         
         # Música y sonidos
-        play_music("boss_theme.mp3", volume=0.7)
+        audio.play_music(self.MUSIC, volume=self.MUSIC_VOLUME)
 
     def handle_boss_phases(self):
         """Maneja las fases del jefe final."""
@@ -55,17 +84,9 @@ class Level4:
             self.screen_shake = 20
             self.flash_screen = True
             self.flash_duration = 30
-            self.floating_texts.append({
-                'text': "¡El poder oscuro se intensifica!",
-                'position': (300, 200),
-                'color': (255, 0, 0),
-                'end_time': show_floating_text(
-                    self.screen,
-                    "¡El poder oscuro se intensifica!",
-                    (300, 200),
-                    (255, 0, 0)
-                )
-            })
+            self.floating_texts.add("¡El poder oscuro se intensifica!", (300, 200), (255, 0, 0),
+                                    get_ticks() + 1000, screen_space=True)
+            save_checkpoint(self)
         elif self.boss.health <= self.phase_health_thresholds[0] and self.current_phase == 2:
             self.current_phase = 3
             self.boss.attack_damage *= 2
@@ -73,17 +94,9 @@ class Level4:
             self.screen_shake = 30
             self.flash_screen = True
             self.flash_duration = 45
-            self.floating_texts.append({
-                'text': "¡FASE FINAL!",
-                'position': (350, 200),
-                'color': (255, 0, 0),
-                'end_time': show_floating_text(
-                    self.screen,
-                    "¡FASE FINAL!",
-                    (350, 200),
-                    (255, 0, 0)
-                )
-            })
+            self.floating_texts.add("¡FASE FINAL!", (350, 200), (255, 0, 0),
+                                    get_ticks() + 1000, screen_space=True)
+            save_checkpoint(self)
 
     def run(self):
         """Loop principal del nivel."""
@@ -94,14 +107,33 @@ class Level4:
             self.handle_start_screen()
             clock.tick(60)
         
-        # Loop principal del juego
+        # Loop principal del juego: simulación a paso fijo, render según GAME_RENDER_FPS
+        self.clock.start()
+        if self.checkpoint is None:
+            save_checkpoint(self)
         while self.running:
+            profiler.begin_frame()
             if not self.paused:
-                self.handle_events()
-                self.update()
-            self.draw()
-            pygame.display.flip()
-            clock.tick(60)
+                with profiler.phase('handle_events'):
+                    self.handle_events()
+                for _ in range(self.clock.pending_steps()):
+                    self.clock.remember([self.player, *self.enemies])
+                    self.update()
+                    self.clock.advance()
+                    if not self.running:
+                        break
+            else:
+                self.clock.hold()
+            with profiler.phase('draw'):
+                self.draw()
+                self.renderer.add(profiler.draw(self.screen))
+            with profiler.phase('display.flip'):
+                self.renderer.present()
+            profiler.end_frame()
+            self.clock.tick()
+        self.clock.stop()
+        profiler.log_summary()
+        self.floating_texts.clear()
         
         return self.victory
 
@@ -116,6 +148,9 @@ class Level4:
                 elif event.key == pygame.K_ESCAPE:
                     self.running = False
         
+        # Integrar los assets del siguiente nivel mientras se espera
+        preloader.poll()
+        
         # Dibujar pantalla de inicio
         self.screen.fill((0, 0, 0))
         draw_text(
@@ -147,6 +182,8 @@ class Level4:
     def handle_events(self):
         """Maneja los eventos del nivel."""
         for event in pygame.event.get():
+            if profiler.handle_event(event):
+                continue
             if event.type == pygame.QUIT:
                 self.running = False
             elif event.type == pygame.KEYDOWN:
@@ -160,11 +197,14 @@ class Level4:
 
     def update(self):
         """Actualiza el estado del nivel."""
-        current_time = pygame.time.get_ticks()
+        current_time = get_ticks()
         
         # Actualizar jugador y jefe
-        self.player.update()
-        self.enemies.update()
+        with profiler.phase('player.update'):
+            self.player.update()
+        self.camera.follow(self.player)
+        with profiler.phase('enemies'):
+            self.ai.update(self.enemies, self.player)
         
         # Actualizar efectos visuales
         if self.screen_shake > 0:
@@ -175,20 +215,19 @@ class Level4:
             self.flash_screen = False
 
         # Manejar fases del jefe
-        self.handle_boss_phases()
+        with profiler.phase('spawn'):
+            self.handle_boss_phases()
 
         # Actualizar textos flotantes
-        self.floating_texts = [
-            text for text in self.floating_texts 
-            if current_time < text['end_time']
-        ]
+        self.floating_texts.expire(current_time)
 
         # Colisiones y combate
-        if self.player.rect.colliderect(self.boss.rect):
-            self.player.take_damage(self.boss.attack_damage)
-            if self.player.health <= 0:
-                self.game_over = True
-                self.running = False
+        with profiler.phase('enemies'):
+            if sprites_collide(self.player, self.boss):
+                self.player.take_damage(self.boss.attack_damage)
+                if self.player.health <= 0:
+                    self.game_over = True
+                    self.running = False
 
         # Verificar si el jefe fue derrotado
         if self.boss.health <= 0 and not self.boss_defeated:
@@ -198,26 +237,26 @@ class Level4:
             self.running = False
             
             # Efecto de victoria
-            self.floating_texts.append({
-                'text': "¡Victoria!",
-                'position': (350, 200),
-                'color': (255, 215, 0),
-                'end_time': show_floating_text(
-                    self.screen,
-                    "¡Victoria!",
-                    (350, 200),
-                    (255, 215, 0)
-                )
-            })
+            self.floating_texts.add("¡Victoria!", (350, 200), (255, 215, 0),
+                                    get_ticks() + 1000, screen_space=True)
 
     def draw(self):
         """Dibuja todos los elementos del nivel."""
         # Aplicar screen shake
-        offset_x = random.randint(-self.screen_shake, self.screen_shake)
-        offset_y = random.randint(-self.screen_shake, self.screen_shake)
+        offset_x = self.effects_rng.randint(-self.screen_shake, self.screen_shake)
+        offset_y = self.effects_rng.randint(-self.screen_shake, self.screen_shake)
         
-        # Dibujar fondo
-        self.screen.blit(self.background, (offset_x, offset_y))
+        # Dibujar fondo: con shake, flash o pausa se redibuja la pantalla completa
+        renderer = self.renderer
+        self.hud.update(self.player, f"Castillo del Señor Oscuro - Fase {self.current_phase}",
+                        self.score, self.current_phase)
+        self.boss_hud.set('boss', self.boss.health, 300)  # 300 es la vida máxima del jefe
+        camera = self.camera
+        camera.begin_draw()
+        renderer.begin_frame(full=self.screen_shake > 0 or self.flash_screen or self.paused,
+                             background_offset=(offset_x, offset_y),
+                             invalid=self.hud.invalid_rects() + self.boss_hud.invalid_rects(),
+                             scroll=camera.scroll)
         
         # Flash screen effect
         if self.flash_screen:
@@ -227,57 +266,22 @@ class Level4:
             self.screen.blit(s, (0, 0))
         
         # Dibujar sprites
-        self.enemies.draw(self.screen)
-        self.screen.blit(self.player.image, 
-                        (self.player.rect.x + offset_x, 
-                         self.player.rect.y + offset_y))
+        for enemy in self.enemies:
+            renderer.blit_sprite(enemy.image, camera.position(enemy))
+        renderer.blit(self.player.image, camera.position(self.player, (offset_x, offset_y)))
+        renderer.add(self.player.particles.draw(self.screen, (offset_x + camera.offset[0],
+                                                              offset_y + camera.offset[1])))
         
         # Dibujar textos flotantes
-        current_time = pygame.time.get_ticks()
+        current_time = get_ticks()
         for text in self.floating_texts:
-            if current_time < text['end_time']:
-                show_floating_text(
-                    self.screen,
-                    text['text'],
-                    text['position'],
-                    text['color']
-                )
-        
-        # UI
-        draw_game_ui(
-            self.screen,
-            self.player,
-            f"Castillo del Señor Oscuro - Fase {self.current_phase}",
-            self.score,
-            self.current_phase
-        )
+            if current_time < text.end_time:
+                position = text.position if text.screen_space else camera.to_screen(text.position)
+                renderer.add(draw_text(self.screen, text.text, position, 24, text.color))
         
-        # Barra de vida del jefe
-        boss_health_width = 400
-        boss_health_height = 30
-        boss_health_x = (800 - boss_health_width) // 2
-        boss_health_y = 550
-        
-        # Fondo de la barra
-        pygame.draw.rect(self.screen, (100, 0, 0), 
-                        (boss_health_x, boss_health_y, 
-                         boss_health_width, boss_health_height))
-        
-        # Barra de vida actual
-        health_percentage = self.boss.health / 300  # 300 es la vida máxima del jefe
-        current_width = int(boss_health_width * health_percentage)
-        pygame.draw.rect(self.screen, (200, 0, 0), 
-                        (boss_health_x, boss_health_y, 
-                         current_width, boss_health_height))
-        
-        # Nombre del jefe
-        draw_text(
-            self.screen,
-            "El Señor Oscuro",
-            (boss_health_x, boss_health_y - 25),
-            font_size=20,
-            color=(255, 0, 0)
-        )
+        # UI y barra de vida del jefe (solo se recomponen si cambió algún valor)
+        self.hud.draw(renderer)
+        self.boss_hud.draw(renderer)
         
         # Menú de pausa
         if self.paused:
@@ -5,7 +5,20 @@ from levels.level_1 import Level1
 from levels.level_2 import Level2
 from levels.level_3 import Level3
 from levels.level_4 import Level4
-from src.utils import draw_text, play_music, stop_music
+from src.utils import draw_text, get_animation_cache_stats
+from src.pools import log_pool_stats
+from src.audio import audio
+from src.asset_pack import load_asset_pack
+from src.preloader import preloader
+from src.replay import InputRecorder, default_recording_path
+from src.snapshot import retry_from_checkpoint
+
+LEVELS = {
+    1: Level1,
+    2: Level2,
+    3: Level3,
+    4: Level4
+}
 
 class Game:
     def __init__(self):
@@ -19,15 +32,24 @@ class Game:
         self.screen = pygame.display.set_mode((self.WINDOW_WIDTH, self.WINDOW_HEIGHT))
         pygame.display.set_caption("Geralt: La Sombra del Abismo")
         
+        # Sprites y fondos precocinados (python -m src.asset_pack bake)
+        if load_asset_pack() is None:
+            print("ℹ️ Sin paquete de assets, se cargarán los PNG originales")
+        
         # Estados del juego
         self.current_level = 1
         self.game_state = "MENU"
         self.clock = pygame.time.Clock()
+        # Nivel perdido que se puede reintentar desde su punto de control
+        self.retry_level = None
+        
+        # Empezar a cargar el primer nivel mientras se muestra el menú
+        preloader.preload_level(LEVELS[self.current_level])
         
         # Intentar reproducir música del menú
         try:
             if os.path.exists(os.path.join("assets/sounds", "menu_theme.mp3")):
-                play_music("menu_theme.mp3", volume=0.5)
+                audio.play_music("menu_theme.mp3", volume=0.5)
             else:
                 print("⚠️ Música del menú no encontrada, continuando sin música")
         except Exception as e:
@@ -42,11 +64,13 @@ class Game:
                 if event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_RETURN:
                         self.game_state = "PLAYING"
-                        stop_music()
+                        audio.stop_music()
                         return True
                     elif event.key == pygame.K_ESCAPE:
                         return False
 
+            preloader.poll()
+            
             # Dibujar menú
             self.screen.fill((0, 0, 0))
             
@@ -85,7 +109,8 @@ class Game:
 
     def game_over_screen(self):
         """Pantalla de Game Over."""
-        play_music("game_over.mp3", loop=False, volume=0.7)
+        preloader.preload_level(LEVELS[1])
+        audio.play_music("game_over.mp3", loop=False, volume=0.7)
         
         while self.game_state == "GAME_OVER":
             for event in pygame.event.get():
@@ -93,13 +118,19 @@ class Game:
                     return False
                 if event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_r:
-                        self.current_level = 1
+                        # Reintento instantáneo: el mismo nivel vuelve a su punto de control
+                        if self.retry_level is None or not retry_from_checkpoint(self.retry_level):
+                            self.retry_level = None
+                            self.current_level = 1
                         self.game_state = "PLAYING"
                         return True
                     elif event.key == pygame.K_ESCAPE:
+                        self.retry_level = None
                         self.game_state = "MENU"
                         return True
 
+            preloader.poll()
+
             # Dibujar pantalla de game over
             self.screen.fill((0, 0, 0))
             draw_text(
@@ -111,8 +142,9 @@ class Game:
             )
             draw_text(
                 self.screen,
-                "Presiona R para reintentar",
-                (250, 300)
+                "Presiona R para reintentar" if self.retry_level is None
+                else "Presiona R para reintentar desde el punto de control",
+                (250, 300) if self.retry_level is None else (120, 300)
             )
             draw_text(
                 self.screen,
@@ -125,7 +157,8 @@ class Game:
 
     def victory_screen(self):
         """Pantalla de Victoria."""
-        play_music("victory.mp3", loop=False, volume=0.7)
+        preloader.preload_level(LEVELS[1])
+        audio.play_music("victory.mp3", loop=False, volume=0.7)
         
         while self.game_state == "VICTORY":
             for event in pygame.event.get():
@@ -140,6 +173,8 @@ class Game:
                         self.game_state = "MENU"
                         return True
 
+            preloader.poll()
+
             # Dibujar pantalla de victoria
             self.screen.fill((0, 0, 0))
             draw_text(
@@ -169,18 +204,45 @@ class Game:
             pygame.display.flip()
             self.clock.tick(60)
 
+    def draw_loading_progress(self, progress: float):
+        """Pantalla de carga con barra de progreso (mientras se decodifican los assets)."""
+        pygame.event.pump()
+        self.screen.fill((0, 0, 0))
+        draw_text(self.screen, "Cargando...", (330, 250))
+        bar = pygame.Rect(200, 300, 400, 20)
+        pygame.draw.rect(self.screen, (128, 128, 128), bar, 2)
+        filled = bar.inflate(-6, -6)
+        filled.width = int(filled.width * progress)
+        pygame.draw.rect(self.screen, (255, 215, 0), filled)
+        pygame.display.flip()
+
     def run_level(self):
         """Ejecuta el nivel actual."""
-        level_map = {
-            1: Level1,
-            2: Level2,
-            3: Level3,
-            4: Level4
-        }
-        
-        if self.current_level in level_map:
-            level = level_map[self.current_level](self.screen)
+        if self.current_level in LEVELS:
+            # Integrar lo que quede pendiente de la precarga de este nivel
+            preloader.preload_level(LEVELS[self.current_level])
+            preloader.wait(self.draw_loading_progress)
+            # GAME_RECORD=<carpeta>: grabar el input de cada nivel (ver src.replay)
+            recorder = None
+            level = self.retry_level
+            self.retry_level = None
+            if level is not None:
+                # Reintento: ya restaurado a su punto de control (las grabaciones
+                # empiezan siempre en el inicio del nivel, así que no se graba)
+                audio.play_music(level.MUSIC, volume=level.MUSIC_VOLUME)
+            elif os.environ.get('GAME_RECORD'):
+                recorder = InputRecorder(self.current_level)
+                level = recorder.create_level(LEVELS[self.current_level], self.screen)
+            else:
+                level = LEVELS[self.current_level](self.screen)
+            
+            # El siguiente nivel se decodifica en segundo plano mientras se juega
+            if self.current_level + 1 in LEVELS:
+                preloader.preload_level(LEVELS[self.current_level + 1])
             victory = level.run()
+            if recorder is not None:
+                path = recorder.save(default_recording_path(os.environ['GAME_RECORD'], self.current_level))
+                print(f"📦 Partida grabada en {path}")
             
             if victory:
                 if self.current_level < 4:
@@ -188,6 +250,11 @@ class Game:
                     return True
                 else:
                     self.game_state = "VICTORY"
+            elif getattr(level, 'game_over', False):
+                # El jugador murió: la pantalla de Game Over ofrece el reintento
+                self.retry_level = level
+                self.game_state = "GAME_OVER"
+                return True
             else:
                 self.game_state = "GAME_OVER"
         
@@ -212,6 +279,11 @@ class Game:
             self.clock.tick(60)
 
         # Limpieza final
+        stats = get_animation_cache_stats()
+        print(f"📦 Caché de animaciones: {stats['hits']} aciertos, {stats['misses']} fallos, "
+              f"{stats['frames']} frames, {stats['bytes'] / (1024 * 1024):.1f} MB")
+        log_pool_stats()
+        preloader.shutdown()
         pygame.quit()
         sys.exit()
 
@@ -0,0 +1,122 @@
+"""
+Planificador de IA por franjas de tiempo.
+
+En lugar de ejecutar la lógica de decisión de todos los enemigos en cada
+tick, AIScheduler le da a cada uno una frecuencia de "pensar" según su
+estado y su distancia al jugador:
+
+    combatientes (atacando, muriendo, con cooldown o dentro de
+    detection_range)                                   cada tick
+    en reposo, en pantalla y a menos de 2x detection_range   cada IDLE_INTERVAL ticks
+    lejanos o fuera de pantalla                        cada FAR_INTERVAL ticks
+
+Los ticks en que un enemigo no piensa solo avanza su animación. Además hay
+un presupuesto de tiempo por frame para la IA: los combatientes siempre
+piensan, pero los demás enemigos pendientes que no caben en el presupuesto
+se pasan al frame siguiente. Un enemigo que ya esperó un intervalo completo
+de más piensa aunque no quede presupuesto, así ninguno se queda sin turno.
+
+El próximo turno de cada enemigo se guarda en el propio enemigo
+(`ai_next_think`, en ms de get_ticks), así las instantáneas de src.snapshot
+lo capturan y los enemigos reciclados por src.pools lo reinician.
+
+`view` es la zona visible en coordenadas de mundo; los niveles pasan el
+view_rect de su Camera, que se mueve con el jugador.
+
+El presupuesto depende del reloj real, así que HeadlessRunner y las
+grabaciones de src.replay lo desactivan (budget_ms=None) para que la
+simulación siga siendo determinista.
+
+GAME_AI_BUDGET_MS=<ms> cambia el presupuesto por defecto (0 = sin límite).
+"""
+import os
+import time
+from typing import Callable, Iterable, Optional
+
+import pygame
+
+from src.utils import get_ticks
+from src.profiler import profiler
+from src.lod import VIEW_RECT, animation_lod
+from src.game_clock import FIXED_STEP_MS
+
+IDLE_INTERVAL = 4
+FAR_INTERVAL = 12
+DEFAULT_BUDGET_MS = float(os.environ.get('GAME_AI_BUDGET_MS', 2.0)) or None
+
+def _think(enemy):
+    enemy.update()
+
+def _coast(enemy):
+    enemy.update_animation()
+
+def has_ai(enemy) -> bool:
+    """True si la clase del enemigo tiene lógica propia en update()."""
+    return type(enemy).update is not pygame.sprite.Sprite.update
+
+class AIScheduler:
+    """
+    Reparte la lógica de los enemigos entre frames.
+    `think(enemy)` ejecuta la decisión completa (por defecto enemy.update());
+    `coast(enemy)` lo que debe seguir pasando cada tick (por defecto la animación).
+    """
+    def __init__(self, budget_ms: Optional[float] = DEFAULT_BUDGET_MS,
+                 idle_interval: int = IDLE_INTERVAL, far_interval: int = FAR_INTERVAL,
+                 think: Callable = _think, coast: Callable = _coast, view: pygame.Rect = VIEW_RECT):
+        self.budget_ms = budget_ms
+        self.idle_interval = idle_interval
+        self.far_interval = far_interval
+        self.think = think
+        self.coast = coast
+        self.view = view
+        # Contadores acumulados (los del último frame van al profiler)
+        self.thinks = 0
+        self.coasts = 0
+        self.spilled = 0
+
+    def interval(self, enemy, player) -> int:
+        """Cada cuántos ticks debe pensar `enemy` en su estado actual."""
+        if enemy.is_attacking or enemy.is_dying or enemy.attack_cooldown > 0:
+            return 1
+        distance = abs(player.rect.centerx - enemy.rect.centerx)
+        if distance < enemy.detection_range:
+            return 1
+        if distance < enemy.detection_range * 2 and self.view.colliderect(enemy.rect):
+            return self.idle_interval
+        return self.far_interval
+
+    def update(self, enemies: Iterable, player):
+        """Ejecuta la IA de un tick para `enemies` (en su orden, como Group.update)."""
+        now = get_ticks()
+        start = time.perf_counter()
+        budget = self.budget_ms
+        thinks = coasts = spilled = 0
+        animation_lod.set_view(self.view)
+        for enemy in enemies:
+            if not has_ai(enemy):
+                continue
+            interval = self.interval(enemy, player)
+            overdue = now - enemy.ai_next_think
+            # Un enemigo que pasa a combatir piensa ya, aunque su turno fuera más tarde
+            if overdue < 0 and interval > 1:
+                self.coast(enemy)
+                coasts += 1
+                continue
+            # Los opcionales solo piensan si queda presupuesto (o si ya esperaron de más)
+            if (interval > 1 and budget is not None and overdue < interval * FIXED_STEP_MS
+                    and (time.perf_counter() - start) * 1000 >= budget):
+                self.coast(enemy)
+                coasts += 1
+                spilled += 1
+                continue
+            self.think(enemy)
+            thinks += 1
+            # Medio paso de margen para que el redondeo de get_ticks no retrase el turno
+            enemy.ai_next_think = now + (self.interval(enemy, player) - 0.5) * FIXED_STEP_MS
+        self.thinks += thinks
+        self.coasts += coasts
+        self.spilled += spilled
+        profiler.count('ai.think', thinks)
+        profiler.count('ai.coast', coasts)
+        profiler.count('ai.spill', spilled)
+        animation_lod.report()
@@ -0,0 +1,210 @@
+"""
+Paquete de assets precocinado.
+
+`bake` recorre las tablas de animaciones (ANIMATIONS/SIZE de Player y de los
+enemigos) y los fondos, y escribe todos los frames ya escalados a su tamaño
+final como píxeles RGBA crudos en un único archivo con índice. En ejecución,
+AssetPack mapea el archivo en memoria y crea las Surfaces directamente desde
+esos buffers, sin decodificar PNG ni escalar.
+
+Formato:
+    'SCPK' | versión (u32) | largo del índice (u32) | índice JSON | datos
+El índice guarda [desplazamiento, ancho, alto] relativos al inicio de los
+datos; la sección de datos y cada bloque de píxeles están alineados a 16 bytes.
+
+Uso:
+    python -m src.asset_pack bake [--out assets/pack/assets.pack]
+    python -m src.asset_pack info
+"""
+import io
+import sys
+import json
+import mmap
+import time
+import struct
+import argparse
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import pygame
+
+from src import utils
+
+PACK_MAGIC = b'SCPK'
+PACK_VERSION = 1
+PACK_HEADER = struct.Struct('<4sII')
+PACK_ALIGNMENT = 16
+DEFAULT_PACK_PATH = utils.ASSETS_DIR / "pack" / "assets.pack"
+
+def data_offset(index_length: int) -> int:
+    """Posición (alineada) donde empieza la sección de datos del paquete."""
+    end = PACK_HEADER.size + index_length
+    return end + (-end % PACK_ALIGNMENT)
+
+def animation_key(folder: str, prefix: str, frame_count: int,
+                  size: Optional[Tuple[int, int]]) -> str:
+    size_text = f"{size[0]}x{size[1]}" if size else "original"
+    return f"{folder}|{prefix}|{frame_count}|{size_text}"
+
+def background_key(image_name: str, size: Tuple[int, int]) -> str:
+    return f"{image_name}|{size[0]}x{size[1]}"
+
+class AssetPack:
+    """Paquete de assets mapeado en memoria."""
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._file = open(self.path, 'rb')
+        self.data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, index_length = PACK_HEADER.unpack_from(self.data, 0)
+        if magic != PACK_MAGIC or version != PACK_VERSION:
+            self.close()
+            raise ValueError(f"Paquete de assets no válido o de otra versión: {self.path}")
+        index = json.loads(bytes(self.data[PACK_HEADER.size:PACK_HEADER.size + index_length]))
+        self.animations: Dict[str, List[list]] = index['animations']
+        self.backgrounds: Dict[str, list] = index['backgrounds']
+        self.data_start = data_offset(index_length)
+        self._view = memoryview(self.data)
+
+    def get_frames(self, folder: str, prefix: str, frame_count: int,
+                   size: Optional[Tuple[int, int]]) -> Optional[List[pygame.Surface]]:
+        entries = self.animations.get(animation_key(folder, prefix, frame_count, size))
+        if entries is None:
+            return None
+        return [self._surface(entry, alpha=True) for entry in entries]
+
+    def get_background(self, image_name: str, size: Tuple[int, int]) -> Optional[pygame.Surface]:
+        entry = self.backgrounds.get(background_key(image_name, size))
+        if entry is None:
+            return None
+        return self._surface(entry, alpha=False)
+
+    def _surface(self, entry: list, alpha: bool) -> pygame.Surface:
+        offset, width, height = entry
+        offset += self.data_start
+        length = width * height * 4
+        surface = pygame.image.frombuffer(self._view[offset:offset + length], (width, height), 'RGBA')
+        if pygame.display.get_surface() is None:
+            # Sin pantalla no se puede convertir: copiar para no depender del mmap
+            return surface.copy()
+        return surface.convert_alpha() if alpha else surface.convert()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'animations': len(self.animations),
+            'frames': sum(len(entries) for entries in self.animations.values()),
+            'backgrounds': len(self.backgrounds),
+            'bytes': len(self.data)
+        }
+
+    def close(self):
+        if getattr(self, '_view', None) is not None:
+            self._view.release()
+            self._view = None
+        self.data.close()
+        self._file.close()
+
+def load_asset_pack(path: Optional[Path] = None) -> Optional[AssetPack]:
+    """Abre el paquete y lo registra en src.utils. Retorna None si no existe."""
+    path = Path(path) if path else DEFAULT_PACK_PATH
+    if not path.exists():
+        return None
+    try:
+        pack = AssetPack(path)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"⚠️ No se pudo abrir el paquete de assets {path}: {e}")
+        return None
+    utils.set_asset_pack(pack)
+    return pack
+
+def animated_classes() -> list:
+    """Clases con tablas de animaciones que se incluyen en el paquete."""
+    from src.player import Player
+    from src.enemies import BlackMage, Dragon, Ghost1, Ghost2, Golem1, Golem2
+    return [Player, BlackMage, Dragon, Ghost1, Ghost2, Golem1, Golem2]
+
+def bake(path: Optional[Path] = None) -> Dict[str, int]:
+    """Genera el paquete de assets a partir de los PNG originales."""
+    path = Path(path) if path else DEFAULT_PACK_PATH
+    # Leer siempre desde disco, nunca desde un paquete anterior
+    utils.set_asset_pack(None)
+
+    blobs = io.BytesIO()
+    animations: Dict[str, List[list]] = {}
+    backgrounds: Dict[str, list] = {}
+    skipped = []
+
+    def add_blob(surface: pygame.Surface) -> list:
+        offset = blobs.tell()
+        blobs.write(pygame.image.tobytes(surface, 'RGBA'))
+        padding = -blobs.tell() % PACK_ALIGNMENT
+        blobs.write(b'\0' * padding)
+        return [offset, surface.get_width(), surface.get_height()]
+
+    for cls in animated_classes():
+        for anim_name, (prefix, frame_count) in cls.ANIMATIONS.items():
+            folder = utils.animation_folder(cls.CHARACTER, anim_name)
+            key = animation_key(folder, prefix, frame_count, cls.SIZE)
+            if key in animations:
+                continue
+            # Solo se empaquetan animaciones completas; las incompletas siguen
+            # cargándose desde disco (con placeholders) para que se noten.
+            if any(utils.find_frame_path(folder, prefix, i) is None for i in range(frame_count)):
+                skipped.append(key)
+                continue
+            frames = utils.load_animation(folder, prefix, frame_count, cls.SIZE)
+            animations[key] = [add_blob(frame) for frame in frames]
+
+    backgrounds_dir = utils.ASSETS_DIR / "images" / "backgrounds"
+    for image_path in sorted(backgrounds_dir.rglob("*.png")):
+        image_name = image_path.relative_to(backgrounds_dir).as_posix()
+        backgrounds[background_key(image_name, utils.BACKGROUND_SIZE)] = add_blob(
+            utils.read_background(image_name))
+
+    index = json.dumps({'animations': animations, 'backgrounds': backgrounds}).encode('utf-8')
+    data_start = data_offset(len(index))
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(PACK_HEADER.pack(PACK_MAGIC, PACK_VERSION, len(index)))
+        f.write(index)
+        f.write(b'\0' * (data_start - PACK_HEADER.size - len(index)))
+        f.write(blobs.getbuffer())
+
+    for key in skipped:
+        print(f"⚠️ Animación incompleta, no empaquetada: {key}")
+    return {
+        'animations': len(animations),
+        'frames': sum(len(entries) for entries in animations.values()),
+        'backgrounds': len(backgrounds),
+        'skipped': len(skipped),
+        'bytes': data_start + blobs.tell()
+    }
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Paquete de assets precocinado")
+    parser.add_argument('command', choices=['bake', 'info'])
+    parser.add_argument('--out', type=Path, default=DEFAULT_PACK_PATH, help="Ruta del paquete")
+    args = parser.parse_args(argv)
+
+    from src.headless import init_headless
+    init_headless()
+
+    if args.command == 'bake':
+        start = time.perf_counter()
+        stats = bake(args.out)
+        print(f"📦 {args.out}: {stats['animations']} animaciones, {stats['frames']} frames, "
+              f"{stats['backgrounds']} fondos, {stats['bytes'] / (1024 * 1024):.1f} MB "
+              f"en {time.perf_counter() - start:.1f} s")
+    else:
+        pack = load_asset_pack(args.out)
+        if pack is None:
+            print(f"⚠️ No existe el paquete {args.out}")
+            return 1
+        stats = pack.stats()
+        print(f"📦 {args.out}: {stats['animations']} animaciones, {stats['frames']} frames, "
+              f"{stats['backgrounds']} fondos, {stats['bytes'] / (1024 * 1024):.1f} MB")
+        pack.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,135 @@
+"""
+Gestor de audio.
+
+- La música siempre se reproduce en streaming con pygame.mixer.music (nunca
+  se decodifica entera en memoria como un Sound).
+- Los efectos se decodifican una sola vez por proceso en un banco compartido.
+- Los efectos suenan en un grupo fijo de canales reservados, con límite de
+  voces por efecto y prioridades: si no hay canal libre, un efecto solo
+  reemplaza a otro de prioridad menor o igual (el más antiguo).
+"""
+from typing import Dict, List, Optional, Tuple
+
+import pygame
+
+from src.utils import ASSETS_DIR, get_ticks, load_sound, play_music, stop_music
+
+SFX_CHANNELS = 12
+# nombre -> (prioridad, voces simultáneas máximas)
+SFX_RULES: Dict[str, Tuple[int, int]] = {
+    'die.wav': (3, 1),
+    'hurt.wav': (2, 2),
+    'spell.wav': (2, 2),
+    'attack.wav': (1, 3),
+    'jump.wav': (1, 2)
+}
+DEFAULT_RULE = (1, 2)
+
+class AudioManager:
+    """Música en streaming, banco de efectos y grupo de canales con prioridades."""
+    def __init__(self, channels: int = SFX_CHANNELS):
+        self.channel_count = channels
+        self._bank: Dict[str, Optional[pygame.mixer.Sound]] = {}
+        self._channels: List[pygame.mixer.Channel] = []
+        # Voz de cada canal: (efecto, prioridad, inicio en ms) o None
+        self._voices: List[Optional[Tuple[str, int, int]]] = []
+        self.current_music: Optional[str] = None
+        self.stats = {'loads': 0, 'played': 0, 'stolen': 0, 'dropped': 0}
+
+    @property
+    def available(self) -> bool:
+        return bool(pygame.mixer.get_init())
+
+    def _ensure_channels(self) -> bool:
+        if not self.available:
+            return False
+        if not self._channels:
+            # Los canales del grupo se reservan para que Sound.play() no los use
+            if pygame.mixer.get_num_channels() < self.channel_count:
+                pygame.mixer.set_num_channels(self.channel_count)
+            pygame.mixer.set_reserved(self.channel_count)
+            self._channels = [pygame.mixer.Channel(i) for i in range(self.channel_count)]
+            self._voices = [None] * self.channel_count
+        return True
+
+    # --- Efectos ----------------------------------------------------------
+
+    def load_sfx(self, filename: str, volume: float = 1.0) -> Optional[pygame.mixer.Sound]:
+        """Retorna el efecto del banco, decodificándolo solo la primera vez."""
+        if filename not in self._bank:
+            if not self.available:
+                return None
+            self._bank[filename] = load_sound(filename, volume)
+            self.stats['loads'] += 1
+        return self._bank[filename]
+
+    def preload(self, filenames, volume: float = 1.0):
+        for filename in filenames:
+            self.load_sfx(filename, volume)
+
+    def play_sfx(self, filename: str, priority: Optional[int] = None) -> Optional[pygame.mixer.Channel]:
+        """Reproduce un efecto del banco en un canal del grupo. Retorna el canal o None."""
+        sound = self._bank.get(filename)
+        if sound is None or not self._ensure_channels():
+            return None
+        rule_priority, max_voices = SFX_RULES.get(filename, DEFAULT_RULE)
+        priority = rule_priority if priority is None else priority
+
+        index = self._pick_channel(filename, priority, max_voices)
+        if index is None:
+            self.stats['dropped'] += 1
+            return None
+        channel = self._channels[index]
+        if channel.get_busy():
+            self.stats['stolen'] += 1
+        channel.play(sound)
+        self._voices[index] = (filename, priority, get_ticks())
+        self.stats['played'] += 1
+        return channel
+
+    def _pick_channel(self, filename: str, priority: int, max_voices: int) -> Optional[int]:
+        free = None
+        same = []
+        for i, channel in enumerate(self._channels):
+            if not channel.get_busy():
+                self._voices[i] = None
+                if free is None:
+                    free = i
+            elif self._voices[i] is not None and self._voices[i][0] == filename:
+                same.append(i)
+
+        # Límite de voces: la nueva reemplaza a la más antigua del mismo efecto
+        if len(same) >= max_voices:
+            return min(same, key=lambda i: self._voices[i][2])
+        if free is not None:
+            return free
+
+        # Sin canales libres: robar el de menor prioridad (y más antiguo) si no supera la nueva
+        candidates = [i for i, voice in enumerate(self._voices) if voice is None or voice[1] <= priority]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda i: (self._voices[i][1], self._voices[i][2]) if self._voices[i] else (-1, 0))
+
+    def stop_sfx(self):
+        for channel in self._channels:
+            channel.stop()
+
+    # --- Música -----------------------------------------------------------
+
+    def play_music(self, filename: str, loop: bool = True, volume: float = 0.7, fade_ms: int = 1000):
+        """Reproduce música en streaming (no reinicia la pista si ya está sonando)."""
+        if not self.available:
+            return
+        if filename == self.current_music and pygame.mixer.music.get_busy():
+            pygame.mixer.music.set_volume(volume)
+            return
+        if (ASSETS_DIR / "sounds" / filename).exists():
+            self.current_music = filename
+        play_music(filename, loop, volume, fade_ms)
+
+    def stop_music(self, fade_ms: int = 1000):
+        self.current_music = None
+        stop_music(fade_ms)
+
+# Gestor compartido por el menú, los niveles y el jugador
+audio = AudioManager()
@@ -0,0 +1,180 @@
+"""
+Cámara y fondos por teselas para niveles más grandes que la pantalla.
+
+Las posiciones de sprites, partículas y textos están en coordenadas de
+mundo; Camera es el único punto que las pasa a coordenadas de pantalla
+(position, to_screen y offset). La cámara sigue al jugador en cada tick de
+simulación, limitada a los bordes del mundo, y al dibujar interpola su
+desplazamiento con el mismo alpha que GameClock usa para los sprites.
+Su view_rect (la zona visible en coordenadas de mundo) es el que usan
+AIScheduler y el LOD de animaciones.
+
+Los fondos de mundo se cortan una sola vez en teselas de TILE_SIZE px que
+quedan en caché; al dibujar solo se copian las teselas (o las partes de
+ellas) que caen en la vista o en las zonas que DirtyRenderer restaura.
+Cada capa puede tener un factor de parallax: 1.0 se mueve con el mundo y
+valores menores se desplazan más despacio (capas lejanas). Una capa solo
+se escala al tamaño que realmente recorre, no al del mundo completo.
+
+Un nivel cuyo mundo mide lo mismo que la pantalla sigue usando la
+Surface de load_background, así que los niveles actuales (WORLD_SIZE por
+defecto) se dibujan exactamente igual que antes.
+"""
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import pygame
+
+from src.game_clock import MAX_INTERPOLATION_DISTANCE
+from src.utils import BACKGROUND_SIZE, load_background, read_background
+
+TILE_SIZE = 256
+
+# (imagen, tamaño de capa, tamaño de tesela, alpha) -> filas de teselas
+_tile_cache: Dict[tuple, List[List[pygame.Surface]]] = {}
+
+class Camera:
+    """
+    Vista de `view_size` px sobre un mundo de `world_size` px.
+
+    Uso en el nivel:
+        update():  camera.follow(player)        # tras mover al jugador
+        draw():    camera.begin_draw()
+                   renderer.begin_frame(scroll=camera.scroll)
+                   renderer.blit(sprite.image, camera.position(sprite))
+    """
+    def __init__(self, clock, world_size: Tuple[int, int] = BACKGROUND_SIZE,
+                 view_size: Tuple[int, int] = BACKGROUND_SIZE):
+        self.clock = clock
+        self.world_rect = pygame.Rect((0, 0), world_size).union(pygame.Rect((0, 0), view_size))
+        # Zona visible en coordenadas de mundo (estado del último tick)
+        self.view_rect = pygame.Rect((0, 0), view_size)
+        self._previous = self.view_rect.topleft
+        # Desplazamiento del frame en curso (lo calcula begin_draw)
+        self.scroll: Tuple[int, int] = (0, 0)
+        self.offset: Tuple[int, int] = (0, 0)
+
+    def follow(self, target):
+        """Centra la vista en `target` sin salirse del mundo (una vez por tick)."""
+        self._previous = self.view_rect.topleft
+        self.view_rect.center = target.rect.center
+        self.view_rect.clamp_ip(self.world_rect)
+
+    def snap(self, target):
+        """Como follow() pero sin interpolar desde la posición anterior (ej: al restaurar)."""
+        self.follow(target)
+        self._previous = self.view_rect.topleft
+
+    def begin_draw(self):
+        """Fija el desplazamiento interpolado del frame que se va a dibujar."""
+        x, y = self.view_rect.topleft
+        px, py = self._previous
+        alpha = self.clock.alpha
+        if (alpha < 1.0 and abs(x - px) <= MAX_INTERPOLATION_DISTANCE
+                and abs(y - py) <= MAX_INTERPOLATION_DISTANCE):
+            x = round(px + (x - px) * alpha)
+            y = round(py + (y - py) * alpha)
+        self.scroll = (x, y)
+        self.offset = (-x, -y)
+
+    def position(self, sprite, offset: Tuple[int, int] = (0, 0)) -> Tuple[int, int]:
+        """Posición de pantalla de `sprite` (interpolada por el GameClock)."""
+        return self.clock.position(sprite, (offset[0] - self.scroll[0], offset[1] - self.scroll[1]))
+
+    def to_screen(self, target: Union[pygame.Rect, Tuple[int, int]]):
+        """Pasa un punto o un rect de coordenadas de mundo a coordenadas de pantalla."""
+        if isinstance(target, pygame.Rect):
+            return target.move(self.offset)
+        return target[0] - self.scroll[0], target[1] - self.scroll[1]
+
+def load_background_tiles(image_name: str, size: Tuple[int, int], tile_size: int = TILE_SIZE,
+                          alpha: bool = False) -> List[List[pygame.Surface]]:
+    """
+    Teselas (por filas) de `image_name` escalado a `size`. La imagen completa
+    solo existe mientras se corta; después quedan en caché las teselas.
+    """
+    key = (image_name, tuple(size), tile_size, alpha)
+    tiles = _tile_cache.get(key)
+    if tiles is not None:
+        return tiles
+    if tuple(size) == BACKGROUND_SIZE and not alpha:
+        image = load_background(image_name)
+    else:
+        image = read_background(image_name, size, alpha)
+    bounds = image.get_rect()
+    tiles = [[image.subsurface(pygame.Rect(x, y, tile_size, tile_size).clip(bounds)).copy()
+              for x in range(0, bounds.w, tile_size)]
+             for y in range(0, bounds.h, tile_size)]
+    _tile_cache[key] = tiles
+    return tiles
+
+def clear_tile_cache():
+    _tile_cache.clear()
+
+class TiledBackground:
+    """Capa de fondo cortada en teselas con su factor de parallax."""
+    def __init__(self, image_name: str, world_size: Tuple[int, int],
+                 view_size: Tuple[int, int] = BACKGROUND_SIZE, parallax: float = 1.0,
+                 tile_size: int = TILE_SIZE, alpha: bool = False):
+        self.parallax = parallax
+        self.tile_size = tile_size
+        # La capa solo necesita cubrir la vista más lo que se desplaza con su factor
+        self.size = tuple(view + round(max(world - view, 0) * parallax)
+                          for world, view in zip(world_size, view_size))
+        self.tiles = load_background_tiles(image_name, self.size, tile_size, alpha)
+
+    def draw(self, screen: pygame.Surface, scroll: Tuple[int, int],
+             areas: Optional[Sequence[pygame.Rect]] = None, offset: Tuple[int, int] = (0, 0)) -> int:
+        """
+        Dibuja las teselas visibles con el desplazamiento de cámara `scroll`,
+        recortadas a `areas` (rects de pantalla; None = pantalla completa).
+        Retorna cuántos trozos de tesela se copiaron.
+        """
+        # Esquina de la pantalla en coordenadas de la capa
+        left = round(scroll[0] * self.parallax) - offset[0]
+        top = round(scroll[1] * self.parallax) - offset[1]
+        if areas is None:
+            areas = (screen.get_rect(),)
+        size = self.tile_size
+        tiles = self.tiles
+        rows, columns = len(tiles), len(tiles[0])
+        blits = []
+        for area in areas:
+            layer_area = pygame.Rect(area).move(left, top)
+            first_row, last_row = max(layer_area.top // size, 0), min((layer_area.bottom - 1) // size, rows - 1)
+            first_col, last_col = max(layer_area.left // size, 0), min((layer_area.right - 1) // size, columns - 1)
+            for row in range(first_row, last_row + 1):
+                for column in range(first_col, last_col + 1):
+                    tile = tiles[row][column]
+                    tile_x, tile_y = column * size, row * size
+                    part = tile.get_rect(topleft=(tile_x, tile_y)).clip(layer_area)
+                    if part.w and part.h:
+                        blits.append((tile, (part.x - left, part.y - top), part.move(-tile_x, -tile_y)))
+        screen.blits(blits, doreturn=False)
+        return len(blits)
+
+class ParallaxBackground:
+    """Varias capas de TiledBackground dibujadas de la más lejana a la más cercana."""
+    def __init__(self, layers: Sequence[TiledBackground]):
+        self.layers = list(layers)
+
+    def draw(self, screen: pygame.Surface, scroll: Tuple[int, int],
+             areas: Optional[Sequence[pygame.Rect]] = None, offset: Tuple[int, int] = (0, 0)) -> int:
+        return sum(layer.draw(screen, scroll, areas, offset) for layer in self.layers)
+
+WorldBackground = Union[pygame.Surface, TiledBackground, ParallaxBackground]
+
+def load_world_background(image_name: str, world_size: Tuple[int, int] = BACKGROUND_SIZE,
+                          parallax: float = 1.0,
+                          layers: Sequence[Tuple[str, float]] = ()) -> WorldBackground:
+    """
+    Fondo para un mundo de `world_size`. Si el mundo mide lo mismo que la
+    pantalla y no hay capas, es la Surface de siempre (load_background).
+    `layers` son capas transparentes (imagen, parallax) que van encima.
+    """
+    if tuple(world_size) == BACKGROUND_SIZE and not layers:
+        return load_background(image_name)
+    background = TiledBackground(image_name, world_size, parallax=parallax)
+    if not layers:
+        return background
+    return ParallaxBackground([background] + [TiledBackground(name, world_size, parallax=factor, alpha=True)
+                                              for name, factor in layers])
@@ -0,0 +1,177 @@
+"""
+Colisiones en dos fases.
+
+Fase amplia: una rejilla uniforme (spatial hash). Cada objeto se guarda en
+las celdas que cubre su rect. Las consultas solo revisan los objetos de las
+celdas que toca el rect consultado, así que el coste depende de cuántos
+objetos hay cerca y no del total del nivel.
+
+Fase precisa: solo para los pares cuyos rects se solapan se comparan las
+máscaras de píxeles de sus frames (src.utils.get_mask, precalculadas junto
+a la caché de animaciones), así el relleno transparente de los sprites no
+cuenta como golpe.
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import pygame
+
+from src.utils import get_mask, get_mask_bounds
+
+# Tamaño de celda por defecto: del orden de un sprite grande (96-150 px)
+DEFAULT_CELL_SIZE = 128
+
+CellRange = Tuple[int, int, int, int]
+
+# Máscaras llenas por tamaño, para comparar un área rectangular (ej: un ataque) con un sprite
+_rect_masks: Dict[Tuple[int, int], pygame.mask.Mask] = {}
+
+def _rect_mask(size: Tuple[int, int]) -> pygame.mask.Mask:
+    mask = _rect_masks.get(size)
+    if mask is None:
+        mask = _rect_masks[size] = pygame.mask.Mask(size, fill=True)
+    return mask
+
+def body_rect(sprite) -> pygame.Rect:
+    """Rect en pantalla de los píxeles opacos del frame actual del sprite."""
+    return get_mask_bounds(sprite.image).move(sprite.rect.topleft)
+
+def reach_rect(sprite, reach: int, to_right: bool) -> pygame.Rect:
+    """Área de ataque de `reach` píxeles desde el borde visible del sprite, a la altura de su rect."""
+    body = body_rect(sprite)
+    left = body.right if to_right else body.left - reach
+    return pygame.Rect(left, sprite.rect.top, reach, sprite.rect.height)
+
+def sprites_collide(a, b) -> bool:
+    """True si los píxeles opacos de los sprites `a` y `b` (image + rect) se tocan."""
+    if not a.rect.colliderect(b.rect):
+        return False
+    offset = (b.rect.x - a.rect.x, b.rect.y - a.rect.y)
+    return get_mask(a.image).overlap(get_mask(b.image), offset) is not None
+
+def rect_hits_sprite(rect: Optional[pygame.Rect], sprite) -> bool:
+    """True si el área `rect` cubre algún píxel opaco del sprite."""
+    if rect is None:
+        return False
+    area = rect.clip(sprite.rect)
+    if not area:
+        return False
+    offset = (area.x - sprite.rect.x, area.y - sprite.rect.y)
+    return get_mask(sprite.image).overlap(_rect_mask(area.size), offset) is not None
+
+class SpatialHash:
+    """
+    Rejilla uniforme para consultas de solapamiento entre rects.
+
+    Los objetos deben tener un atributo `rect` (como pygame.sprite.Sprite).
+    sync() actualiza la rejilla de forma incremental: solo mueve de celda los
+    objetos cuyo rango de celdas cambió desde el tick anterior.
+    """
+    def __init__(self, cell_size: int = DEFAULT_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells: Dict[Tuple[int, int], List[object]] = {}
+        self._ranges: Dict[object, CellRange] = {}
+
+    def __len__(self) -> int:
+        return len(self._ranges)
+
+    def __contains__(self, item) -> bool:
+        return item in self._ranges
+
+    def _cell_range(self, rect: pygame.Rect) -> CellRange:
+        size = self.cell_size
+        return (rect.left // size, rect.top // size,
+                (rect.right - 1) // size, (rect.bottom - 1) // size)
+
+    def insert(self, item):
+        cell_range = self._cell_range(item.rect)
+        self._ranges[item] = cell_range
+        x0, y0, x1, y1 = cell_range
+        cells = self.cells
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is None:
+                    cells[(cx, cy)] = [item]
+                else:
+                    bucket.append(item)
+
+    def remove(self, item):
+        cell_range = self._ranges.pop(item, None)
+        if cell_range is None:
+            return
+        x0, y0, x1, y1 = cell_range
+        cells = self.cells
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = cells[(cx, cy)]
+                bucket.remove(item)
+                if not bucket:
+                    del cells[(cx, cy)]
+
+    def move(self, item):
+        """Actualiza las celdas de un objeto que ya está en la rejilla."""
+        if self._ranges.get(item) != self._cell_range(item.rect):
+            self.remove(item)
+            self.insert(item)
+
+    def sync(self, items: Iterable[object]):
+        """
+        Deja la rejilla con exactamente los objetos de `items` (p. ej. un
+        pygame.sprite.Group): inserta los nuevos, quita los que ya no están
+        y reubica los que cambiaron de celda.
+        """
+        current = set()
+        for item in items:
+            current.add(item)
+            if item in self._ranges:
+                self.move(item)
+            else:
+                self.insert(item)
+        if len(current) != len(self._ranges):
+            for item in [item for item in self._ranges if item not in current]:
+                self.remove(item)
+
+    def clear(self):
+        self.cells.clear()
+        self._ranges.clear()
+
+    def query(self, rect: Optional[pygame.Rect]) -> List[object]:
+        """Objetos cuyo rect se solapa con `rect`, en orden de inserción por celda."""
+        if rect is None:
+            return []
+        x0, y0, x1, y1 = self._cell_range(rect)
+        cells = self.cells
+        found = []
+        seen = set()
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = cells.get((cx, cy))
+                if not bucket:
+                    continue
+                for item in bucket:
+                    if item not in seen:
+                        seen.add(item)
+                        if rect.colliderect(item.rect):
+                            found.append(item)
+        return found
+
+    def query_rect_pixels(self, rect: Optional[pygame.Rect]) -> List[object]:
+        """Como query(), pero solo los objetos con algún píxel opaco dentro de `rect`."""
+        return [item for item in self.query(rect) if rect_hits_sprite(rect, item)]
+
+    def query_sprite(self, sprite) -> List[object]:
+        """Objetos cuyos píxeles opacos tocan los del sprite (rects primero, máscaras después)."""
+        return [item for item in self.query(sprite.rect) if sprites_collide(sprite, item)]
+
+    def collide(self, others: Iterable[object], pixels: bool = False) -> List[Tuple[object, object]]:
+        """
+        Pares (otro, objeto de la rejilla) que se solapan. Sirve para resolver,
+        por ejemplo, qué proyectiles golpean a qué enemigos. Con pixels=True
+        los pares candidatos se confirman con sus máscaras.
+        """
+        pairs = []
+        for other in others:
+            for item in self.query(other.rect):
+                if not pixels or sprites_collide(other, item):
+                    pairs.append((other, item))
+        return pairs
@@ -1,7 +1,9 @@
 import pygame
 import random
-from src.utils import load_character_animations
-from typing import Tuple
+from src.utils import load_character_animations, get_ticks
+from src.collision import reach_rect, rect_hits_sprite, sprites_collide
+from src.lod import FROZEN, animation_lod
+from typing import Optional, Tuple
 
 class Enemy(pygame.sprite.Sprite):
     def __init__(self, x: int, y: int, size: Tuple[int, int] = (64, 64)):
@@ -17,13 +19,38 @@ class Enemy(pygame.sprite.Sprite):
         self.attack_cooldown = 0
         self.attack_range = 100
         self.detection_range = 300
+        self.ai_next_think = 0  # Próximo turno de IA (ms), ver src.ai_scheduler
+
+    def reset(self, x: int, y: int):
+        """
+        Devuelve el enemigo a su estado inicial en (x, y) para reutilizarlo
+        desde src.pools sin volver a construirlo.
+        """
+        self.rect.topleft = (x, y)
+        self.velocity_x = 0
+        self.velocity_y = 0
+        self.facing_right = False
+        self.current_animation = 'idle'
+        self.is_attacking = False
+        self.is_dying = False
+        self.attack_cooldown = 0
+        self.ai_next_think = 0
+        self.health = self.max_health
+        now = get_ticks()
+        for animation in self.animations.values():
+            animation.reset()
+            animation.last_update = now
+        self.image = self.animations['idle'].get_current_frame()
         
     def update_animation(self):
-        self.animations[self.current_animation].update()
-        new_image = self.animations[self.current_animation].get_current_frame()
-        if not self.facing_right:
-            new_image = pygame.transform.flip(new_image, True, False)
-        self.image = new_image
+        # Fuera de la vista la animación se congela (ver src.lod)
+        lod = animation_lod.level(self)
+        if lod == FROZEN:
+            return
+        self.animations[self.current_animation].update(animation_lod.frame_scale(lod))
+        self.image = self.animations[self.current_animation].get_current_frame(
+            flipped=not self.facing_right
+        )
         
     def move_towards_player(self, player_pos: Tuple[int, int], speed: float):
         if not self.is_dying and not self.is_attacking:
@@ -38,86 +65,138 @@ class Enemy(pygame.sprite.Sprite):
                 self.current_animation = 'idle'
 
 class BlackMage(Enemy):
+    CHARACTER = "Black_Mage"
+    SIZE = (100, 100)
+    ANIMATIONS = {
+        'idle': ('Walk', 6),  # Usar walk como idle
+        'walk': ('Walk', 6),
+        'attack': ('Attack', 4),
+        'death': ('Death', 6)
+    }
+
     def __init__(self, x: int, y: int):
-        super().__init__(x, y, "assets/images/characters/dark_mage/idle/DarkMage_01.png", health=50, speed=2)
+        super().__init__(x, y, self.SIZE)
+        self.animations = load_character_animations(self.CHARACTER, self.ANIMATIONS, self.size)
+        self.max_health = 300
+        self.health = self.max_health
+        self.attack_damage = 25
+        self.speed = 2
+        self.image = self.animations['idle'].get_current_frame()
         self.spell_damage = 15
         self.spell_cooldown = 1500  # 1.5 segundos
         self.last_spell = 0
 
     def cast_spell(self):
-        current_time = pygame.time.get_ticks()
+        current_time = get_ticks()
         if current_time - self.last_spell >= self.spell_cooldown:
             self.last_spell = current_time
             return self.spell_damage
         return 0
 
+    def reset(self, x: int, y: int):
+        super().reset(x, y)
+        self.last_spell = 0
+
 class Dragon(Enemy):
+    CHARACTER = "Dragon"
+    SIZE = (120, 120)
+    ANIMATIONS = {
+        'idle': ('Walk', 5),  # Usar walk como idle
+        'walk': ('Walk', 5),
+        'attack': ('Attack', 4),
+        'fire_attack': ('Fire_Attack', 6),
+        'death': ('Death', 5)
+    }
+
     def __init__(self, x: int, y: int):
-        super().__init__(x, y, (120, 120))
-        self.animations = load_character_animations("Dragon", {
-            'idle': ('Walk', 5),  # Usar walk como idle
-            'walk': ('Walk', 5),
-            'attack': ('Attack', 4),
-            'fire_attack': ('Fire_Attack', 6),
-            'death': ('Death', 5)
-        }, self.size)
-        self.health = 300
+        super().__init__(x, y, self.SIZE)
+        self.animations = load_character_animations(self.CHARACTER, self.ANIMATIONS, self.size)
+        self.max_health = 300
+        self.health = self.max_health
         self.attack_damage = 40
         self.speed = 3
         self.attack_cooldown_max = 150
         self.image = self.animations['idle'].get_current_frame()
         self.can_fly = True
         self.flying_height = random.randint(50, 150)
+        self.fire_damage = 20
+        self.fire_cooldown = 2000  # 2 segundos
+        self.last_fire = 0
+
+    def fire_attack(self):
+        current_time = get_ticks()
+        if current_time - self.last_fire >= self.fire_cooldown:
+            self.last_fire = current_time
+            return self.fire_damage
+        return 0
+
+    def reset(self, x: int, y: int):
+        super().reset(x, y)
+        self.last_fire = 0
 
 class Ghost1(Enemy):
+    CHARACTER = "Ghost1"
+    SIZE = (70, 70)
+    ANIMATIONS = {
+        'idle': ('Wraith_01_Idle', 11),
+        'idle_blink': ('Wraith_01_Idle Blinking', 11),
+        'walk': ('Wraith_01_Moving Forward', 11),
+        'attack': ('Wraith_01_Attack', 11),
+        'cast': ('Wraith_01_Casting Spells', 17),
+        'taunt': ('Wraith_01_Taunt', 17),
+        'death': ('Wraith_01_Dying', 14)
+    }
+
     def __init__(self, x: int, y: int):
-        super().__init__(x, y, (70, 70))
-        self.animations = load_character_animations("Ghost1", {
-            'idle': ('Wraith_01_Idle', 11),
-            'idle_blink': ('Wraith_01_Idle Blinking', 11),
-            'walk': ('Wraith_01_Moving Forward', 11),
-            'attack': ('Wraith_01_Attack', 11),
-            'cast': ('Wraith_01_Casting Spells', 17),
-            'taunt': ('Wraith_01_Taunt', 17),
-            'death': ('Wraith_01_Dying', 14)
-        }, self.size)
-        self.health = 100
+        super().__init__(x, y, self.SIZE)
+        self.animations = load_character_animations(self.CHARACTER, self.ANIMATIONS, self.size)
+        self.max_health = 100
+        self.health = self.max_health
         self.attack_damage = 15
         self.speed = 4
         self.attack_cooldown_max = 90
         self.image = self.animations['idle'].get_current_frame()
 
 class Ghost2(Enemy):
+    CHARACTER = "Ghost2"
+    SIZE = (70, 70)
+    ANIMATIONS = {
+        'idle': ('Wraith_02_Idle', 11),
+        'idle_blink': ('Wraith_02_Idle Blinking', 11),
+        'walk': ('Wraith_02_Moving Forward', 11),
+        'attack': ('Wraith_02_Attack', 11),
+        'cast': ('Wraith_02_Casting Spells', 17),
+        'taunt': ('Wraith_02_Taunt', 17),
+        'death': ('Wraith_02_Dying', 14)
+    }
+
     def __init__(self, x: int, y: int):
-        super().__init__(x, y, (70, 70))
-        self.animations = load_character_animations("Ghost2", {
-            'idle': ('Wraith_02_Idle', 11),
-            'idle_blink': ('Wraith_02_Idle Blinking', 11),
-            'walk': ('Wraith_02_Moving Forward', 11),
-            'attack': ('Wraith_02_Attack', 11),
-            'cast': ('Wraith_02_Casting Spells', 17),
-            'taunt': ('Wraith_02_Taunt', 17),
-            'death': ('Wraith_02_Dying', 14)
-        }, self.size)
-        self.health = 120
+        super().__init__(x, y, self.SIZE)
+        self.animations = load_character_animations(self.CHARACTER, self.ANIMATIONS, self.size)
+        self.max_health = 120
+        self.health = self.max_health
         self.attack_damage = 20
         self.speed = 3.5
         self.attack_cooldown_max = 100
         self.image = self.animations['idle'].get_current_frame()
 
 class Golem1(Enemy):
+    CHARACTER = "Golem1"
+    SIZE = (90, 90)
+    ANIMATIONS = {
+        'idle': ('Golem_03_Idle', 12),
+        'idle_blink': ('Golem_03_Idle_Blink', 12),
+        'walking': ('Golem_03_Walking', 18),
+        'attacking': ('Golem_03_Attacking', 12),
+        'jump_start': ('Golem_03_Jump_Start', 6),
+        'jump_loop': ('Golem_03_Jump_Loop', 6),
+        'taunt': ('Golem_03_Taunt', 18),
+        'dying': ('Golem_03_Dying', 15)
+    }
+
     def __init__(self, x: int, y: int):
-        super().__init__(x, y, (90, 90))
-        self.animations = load_character_animations("Golem1", {
-            'idle': ('Golem_03_Idle', 12),
-            'idle_blink': ('Golem_03_Idle_Blink', 12),
-            'walking': ('Golem_03_Walking', 18),
-            'attacking': ('Golem_03_Attacking', 12),
-            'jump_start': ('Golem_03_Jump_Start', 6),
-            'jump_loop': ('Golem_03_Jump_Loop', 6),
-            'taunt': ('Golem_03_Taunt', 18),
-            'dying': ('Golem_03_Dying', 15)
-        }, self.size)
+        super().__init__(x, y, self.SIZE)
+        self.animations = load_character_animations(self.CHARACTER, self.ANIMATIONS, self.size)
 
         # Atributos base
         self.max_health = 200
@@ -150,6 +229,11 @@ class Golem1(Enemy):
         """Establece el jugador como objetivo."""
         self.player = player
 
+    def reset(self, x: int, y: int):
+        super().reset(x, y)
+        self.attack_rect = None
+        self.hitbox = self.rect.inflate(-20, -10)
+
     def update(self):
         """Actualiza el estado del Golem."""
         if not self.player:
@@ -188,13 +272,8 @@ class Golem1(Enemy):
 
         # Actualizar el rectángulo de ataque si está atacando
         if self.is_attacking:
-            self.attack_rect = self.rect.copy()
-            if self.facing_right:
-                self.attack_rect.right = self.rect.left
-                self.attack_rect.width = self.attack_range
-            else:
-                self.attack_rect.left = self.rect.right
-                self.attack_rect.width = self.attack_range
+            # facing_right indica que el jugador está a la izquierda (el sprite mira a la izquierda)
+            self.attack_rect = reach_rect(self, self.attack_range, not self.facing_right)
         else:
             self.attack_rect = None
 
@@ -238,11 +317,11 @@ class Golem1(Enemy):
             return False
             
         # Si el enemigo está atacando y el jugador está en el área de ataque
-        if self.is_attacking and self.attack_rect and self.attack_rect.colliderect(self.player.rect):
+        if self.is_attacking and rect_hits_sprite(self.attack_rect, self.player):
             return True
             
-        # Si hay colisión lateral
-        if self.hitbox.colliderect(self.player.rect):
+        # Si hay colisión lateral (píxeles opacos, no solo los rects)
+        if sprites_collide(self, self.player):
             player_center_y = self.player.rect.centery
             enemy_center_y = self.hitbox.centery
             # Si la colisión es más horizontal que vertical
@@ -261,11 +340,14 @@ class Golem1(Enemy):
 
     def update_animation(self):
         """Actualiza la animación actual."""
-        self.animations[self.current_animation].update()
-        self.image = self.animations[self.current_animation].get_current_frame()
-        
-        if self.facing_right:
-            self.image = pygame.transform.flip(self.image, True, False)
+        # Fuera de la vista no se avanza ni se cambia el frame (el ataque siempre se anima)
+        lod = animation_lod.level(self)
+        if lod != FROZEN:
+            self.animations[self.current_animation].update(animation_lod.frame_scale(lod))
+            # Los sprites del Golem miran a la izquierda: se usa el frame espejado al mirar a la derecha
+            self.image = self.animations[self.current_animation].get_current_frame(
+                flipped=self.facing_right
+            )
         
         if self.is_attacking:
             current_frame = self.animations['attacking'].current_frame
@@ -301,18 +383,22 @@ class Golem1(Enemy):
             self.kill()
 
 class Golem2(Enemy):
+    CHARACTER = "Golem2"
+    SIZE = (90, 90)
+    ANIMATIONS = {
+        'idle': ('Golem_01_Idle', 11),
+        'idle_blink': ('Golem_01_Idle_Blink', 12),
+        'walking': ('Golem_01_Walking', 17),
+        'attacking': ('Golem_01_Attacking', 11),
+        'jump_start': ('Golem_01_Jump_Start', 6),
+        'jump_loop': ('Golem_01_Jump_Loop', 5),
+        'taunt': ('Golem_01_Taunt', 17),
+        'dying': ('Golem_01_Dying', 14)
+    }
+
     def __init__(self, x: int, y: int):
-        super().__init__(x, y, (90, 90))
-        self.animations = load_character_animations("Golem2", {
-            'idle': ('Golem_01_Idle', 11),
-            'idle_blink': ('Golem_01_Idle_Blink', 12),
-            'walking': ('Golem_01_Walking', 17),
-            'attacking': ('Golem_01_Attacking', 11),
-            'jump_start': ('Golem_01_Jump_Start', 6),
-            'jump_loop': ('Golem_01_Jump_Loop', 5),
-            'taunt': ('Golem_01_Taunt', 17),
-            'dying': ('Golem_01_Dying', 14)
-        }, self.size)
+        super().__init__(x, y, self.SIZE)
+        self.animations = load_character_animations(self.CHARACTER, self.ANIMATIONS, self.size)
 
         # Atributos base (más fuertes que Golem1)
         self.max_health = 250
@@ -332,6 +418,7 @@ class Golem2(Enemy):
         self.current_animation = 'idle'
         self.animation_timer = 0
         self.attack_frame = 0
+        self.attack_rect = None
         
         # Física
         self.velocity_y = 0
@@ -353,6 +440,17 @@ class Golem2(Enemy):
         self.last_attack_time = 0
         self.attack_delay = 1000  # milisegundos
 
+    def reset(self, x: int, y: int):
+        super().reset(x, y)
+        self.jump_cooldown = 0
+        self.is_jumping = False
+        self.animation_timer = 0
+        self.attack_frame = 0
+        self.attack_rect = None
+        self.direction = -1
+        self.state = 'idle'
+        self.last_attack_time = 0
+
     def update(self):
         """Actualiza el estado del Golem."""
         if not self.player:
@@ -417,11 +515,18 @@ class Golem2(Enemy):
                 self.current_animation = 'idle'
                 self.animations['attacking'].reset()
         
-        # Actualizar la animación actual
-        self.animations[self.current_animation].update()
-
-    def move_towards_player(self):
-        """Mueve el Golem hacia el jugador."""
+        # Actualizar la animación actual (congelada fuera de la vista, ver src.lod)
+        lod = animation_lod.level(self)
+        if lod != FROZEN:
+            self.animations[self.current_animation].update(animation_lod.frame_scale(lod))
+            self.image = self.animations[self.current_animation].get_current_frame(
+                flipped=self.facing_right
+            )
+
+    def move_towards_player(self, to_player: Optional[int] = None):
+        """Mueve el Golem hacia el jugador (`to_player`: distancia en x, si se conoce)."""
+        if to_player is not None:
+            self.direction = 1 if to_player > 0 else -1
         if not self.is_attacking:
             self.rect.x += self.speed * self.direction
             if self.current_animation != 'walking':
@@ -0,0 +1,316 @@
+"""
+Motor de enemigos por lotes (orientado a datos).
+
+EnemyBatch guarda posición, vida, cooldowns, rangos y estado de todos los
+enemigos en arrays NumPy y resuelve las decisiones de persecución, ataque y
+reposo de todos ellos en un solo paso vectorizado por tick. Para dibujar se
+usa draw() (una llamada a blits) o las vistas EnemyView, compatibles con
+pygame.sprite.Group.
+
+Uso (oleada de estrés sin ventana):
+    python -m src.enemy_batch --enemies 500 --ticks 600
+"""
+import sys
+import time
+import argparse
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pygame
+
+from src import utils
+
+# Estados de la máquina de estados (índices de la tabla de frames)
+IDLE, WALK, ATTACK, DYING = range(4)
+STATE_NAMES = ('idle', 'walk', 'attack', 'dying')
+# Nombres de animación aceptados para cada estado, en orden de preferencia
+STATE_ANIMATIONS = (
+    ('idle',),
+    ('walking', 'walk'),
+    ('attacking', 'attack'),
+    ('dying', 'death')
+)
+# Los estados que no se repiten se quedan en su último frame
+LOOPING = np.array([True, True, False, False])
+FRAME_DURATION = 100  # ms por frame, igual que utils.Animation
+
+class EnemyKind:
+    """Estadísticas y tabla de frames de un tipo de enemigo dentro del lote."""
+    def __init__(self, enemy_class: type):
+        # Un prototipo aporta las estadísticas que cada clase fija en su __init__
+        prototype = enemy_class(0, 0)
+        self.enemy_class = enemy_class
+        self.name = enemy_class.__name__
+        self.size = prototype.rect.size
+        self.max_health = getattr(prototype, 'max_health', prototype.health)
+        self.speed = prototype.speed
+        self.attack_damage = prototype.attack_damage
+        self.attack_range = prototype.attack_range
+        self.detection_range = prototype.detection_range
+        self.attack_cooldown_max = getattr(prototype, 'attack_cooldown_max', 60)
+
+        animations = utils.load_animation_frames(enemy_class.CHARACTER, enemy_class.ANIMATIONS,
+                                                 enemy_class.SIZE)
+        self.frames: List[Tuple[List[pygame.Surface], List[pygame.Surface]]] = []
+        for names in STATE_ANIMATIONS:
+            anim_name = next((name for name in names if name in animations), 'idle')
+            self.frames.append(animations[anim_name])
+        self.frame_counts = [len(frames) for frames, _ in self.frames]
+
+class EnemyBatch:
+    """
+    Lote de enemigos con estructura de arrays.
+
+    Cada enemigo ocupa un índice fijo; los índices libres se reutilizan con
+    una pila, como en ParticleSystem. Todos los enemigos comparten las reglas
+    de los Golems: miran hacia el jugador, lo persiguen dentro del rango de
+    detección, atacan dentro del rango de ataque cuando el cooldown lo permite
+    y vuelven al reposo al terminar la animación de ataque.
+    """
+    def __init__(self, enemy_classes: Sequence[type], capacity: int = 1024):
+        self.capacity = capacity
+        self.kinds = [EnemyKind(cls) for cls in enemy_classes]
+        self._kind_index: Dict[type, int] = {kind.enemy_class: i for i, kind in enumerate(self.kinds)}
+
+        self.pos = np.zeros((capacity, 2), dtype=np.float32)
+        self.size = np.zeros((capacity, 2), dtype=np.int32)
+        self.health = np.zeros(capacity, dtype=np.float32)
+        self.cooldown = np.zeros(capacity, dtype=np.int32)
+        self.state = np.zeros(capacity, dtype=np.int8)
+        self.kind = np.zeros(capacity, dtype=np.int8)
+        self.facing = np.ones(capacity, dtype=np.int8)  # 1 derecha, -1 izquierda
+        self.state_start = np.zeros(capacity, dtype=np.int64)
+        self.alive = np.zeros(capacity, dtype=bool)
+
+        # Estadísticas por tipo, indexadas con self.kind
+        self._speed = np.array([k.speed for k in self.kinds], dtype=np.float32)
+        self._max_health = np.array([k.max_health for k in self.kinds], dtype=np.float32)
+        self._damage = np.array([k.attack_damage for k in self.kinds], dtype=np.float32)
+        self._attack_range = np.array([k.attack_range for k in self.kinds], dtype=np.float32)
+        self._detection_range = np.array([k.detection_range for k in self.kinds], dtype=np.float32)
+        self._cooldown_max = np.array([k.attack_cooldown_max for k in self.kinds], dtype=np.int32)
+        self._frame_counts = np.array([k.frame_counts for k in self.kinds], dtype=np.int64)
+
+        # Tabla de Surfaces [tipo, estado, frame, espejado] para indexar en bloque
+        max_frames = int(self._frame_counts.max())
+        self._frame_table = np.empty((len(self.kinds), len(STATE_NAMES), max_frames, 2), dtype=object)
+        for k, kind in enumerate(self.kinds):
+            for s, (frames, flipped) in enumerate(kind.frames):
+                for f in range(max_frames):
+                    self._frame_table[k, s, f, 0] = frames[f % len(frames)]
+                    self._frame_table[k, s, f, 1] = flipped[f % len(flipped)]
+
+        self._free = np.arange(capacity - 1, -1, -1, dtype=np.int32)
+        self.free_count = capacity
+        self._views: Dict[int, 'EnemyView'] = {}
+
+    def __len__(self) -> int:
+        return self.capacity - self.free_count
+
+    # --- Altas y bajas ----------------------------------------------------
+
+    def spawn(self, enemy_class: type, x: float, y: float) -> Optional[int]:
+        """Añade un enemigo. Retorna su índice o None si el lote está lleno."""
+        if self.free_count == 0:
+            return None
+        self.free_count -= 1
+        index = int(self._free[self.free_count])
+        kind = self._kind_index[enemy_class]
+        self.pos[index] = (x, y)
+        self.size[index] = self.kinds[kind].size
+        self.health[index] = self._max_health[kind]
+        self.cooldown[index] = 0
+        self.state[index] = IDLE
+        self.kind[index] = kind
+        self.facing[index] = -1
+        self.state_start[index] = utils.get_ticks()
+        self.alive[index] = True
+        return index
+
+    def _release(self, indices: np.ndarray):
+        self.alive[indices] = False
+        self._free[self.free_count:self.free_count + len(indices)] = indices
+        self.free_count += len(indices)
+        for index in indices.tolist():
+            view = self._views.pop(index, None)
+            if view is not None:
+                view.kill()
+
+    def clear(self):
+        self._release(np.flatnonzero(self.alive).astype(np.int32))
+
+    # --- Simulación -------------------------------------------------------
+
+    def update(self, target_rect: pygame.Rect):
+        """Avanza un tick de IA de todos los enemigos hacia `target_rect`."""
+        if self.free_count == self.capacity:
+            return
+        now = utils.get_ticks()
+        kind = self.kind
+        state = self.state
+        alive = self.alive
+        elapsed = now - self.state_start
+
+        # Fin de las animaciones que no se repiten
+        done = elapsed >= self._frame_counts[kind, state] * FRAME_DURATION
+        finished_attack = alive & (state == ATTACK) & done
+        finished_death = np.flatnonzero(alive & (state == DYING) & done)
+        if len(finished_death):
+            self._release(finished_death.astype(np.int32))
+
+        active = alive & (state != DYING)
+        np.subtract(self.cooldown, 1, out=self.cooldown, where=active & (self.cooldown > 0))
+
+        to_target = target_rect.centerx - (self.pos[:, 0] + self.size[:, 0] / 2)
+        distance = np.abs(to_target)
+        self.facing[active] = np.where(to_target[active] > 0, 1, -1)
+
+        free = active & ((state != ATTACK) | finished_attack)
+        attack = free & (distance < self._attack_range[kind]) & (self.cooldown <= 0)
+        walk = free & ~attack & (distance < self._detection_range[kind])
+        idle = free & ~attack & ~walk
+
+        self.pos[walk, 0] += self._speed[kind[walk]] * self.facing[walk]
+        self.cooldown[attack] = self._cooldown_max[kind[attack]]
+
+        new_state = state.copy()
+        new_state[attack] = ATTACK
+        new_state[walk] = WALK
+        new_state[idle] = IDLE
+        changed = (new_state != state) | attack
+        self.state_start[changed] = now
+        self.state = new_state
+
+    def attack_damage(self, target_rect: pygame.Rect) -> float:
+        """Daño total de los enemigos que atacan y alcanzan a `target_rect` este tick."""
+        attacking = np.flatnonzero(self.alive & (self.state == ATTACK))
+        if not len(attacking):
+            return 0.0
+        pos = self.pos[attacking]
+        size = self.size[attacking]
+        reach = self._attack_range[self.kind[attacking]]
+        facing = self.facing[attacking]
+        # La zona de ataque se extiende `reach` píxeles hacia donde mira el enemigo
+        left = np.where(facing > 0, pos[:, 0] + size[:, 0], pos[:, 0] - reach)
+        hit = ((left < target_rect.right) & (left + reach > target_rect.left) &
+               (pos[:, 1] < target_rect.bottom) & (pos[:, 1] + size[:, 1] > target_rect.top))
+        # Solo golpea al inicio del ataque (como el cooldown de los Golems)
+        hit &= self.state_start[attacking] == utils.get_ticks()
+        return float(self._damage[self.kind[attacking[hit]]].sum())
+
+    def apply_damage(self, rect: pygame.Rect, amount: float) -> np.ndarray:
+        """Daña a los enemigos que se solapan con `rect`. Retorna los índices que murieron."""
+        hit = self.overlapping(rect)
+        hit = hit[self.state[hit] != DYING]
+        self.health[hit] -= amount
+        killed = hit[self.health[hit] <= 0]
+        self.state[killed] = DYING
+        self.state_start[killed] = utils.get_ticks()
+        return killed
+
+    def overlapping(self, rect: pygame.Rect) -> np.ndarray:
+        """Índices de los enemigos vivos cuyo rect se solapa con `rect`."""
+        pos = self.pos
+        size = self.size
+        mask = (self.alive & (pos[:, 0] < rect.right) & (pos[:, 0] + size[:, 0] > rect.left) &
+                (pos[:, 1] < rect.bottom) & (pos[:, 1] + size[:, 1] > rect.top))
+        return np.flatnonzero(mask)
+
+    # --- Dibujado ---------------------------------------------------------
+
+    def current_images(self, indices: np.ndarray) -> np.ndarray:
+        """Surfaces del frame actual de cada índice (mismo espejado que los Golems)."""
+        kind = self.kind[indices]
+        state = self.state[indices]
+        counts = self._frame_counts[kind, state]
+        frame = (utils.get_ticks() - self.state_start[indices]) // FRAME_DURATION
+        frame = np.where(LOOPING[state], frame % counts, np.minimum(frame, counts - 1))
+        flipped = (self.facing[indices] < 0).astype(np.int64)
+        return self._frame_table[kind, state, frame, flipped]
+
+    def draw(self, screen: pygame.Surface, offset: Tuple[int, int] = (0, 0)):
+        """Dibuja todos los enemigos vivos con una sola llamada a blits."""
+        indices = np.flatnonzero(self.alive)
+        if not len(indices):
+            return
+        images = self.current_images(indices)
+        positions = (self.pos[indices] + offset).astype(np.int32).tolist()
+        screen.blits(list(zip(images.tolist(), positions)), False)
+
+    def view(self, index: int) -> 'EnemyView':
+        """Vista tipo Sprite del enemigo `index` (se reutiliza mientras viva)."""
+        view = self._views.get(index)
+        if view is None:
+            view = self._views[index] = EnemyView(self, index)
+        return view
+
+    def sprites(self) -> List['EnemyView']:
+        return [self.view(index) for index in np.flatnonzero(self.alive).tolist()]
+
+class EnemyView(pygame.sprite.Sprite):
+    """Sprite que lee imagen y rect de un enemigo del lote (para Groups y colisiones)."""
+    def __init__(self, batch: EnemyBatch, index: int):
+        super().__init__()
+        self.batch = batch
+        self.index = index
+
+    @property
+    def rect(self) -> pygame.Rect:
+        x, y = self.batch.pos[self.index]
+        width, height = self.batch.size[self.index]
+        return pygame.Rect(int(x), int(y), int(width), int(height))
+
+    @property
+    def image(self) -> pygame.Surface:
+        return self.batch.current_images(np.array([self.index]))[0]
+
+    @property
+    def health(self) -> float:
+        return float(self.batch.health[self.index])
+
+    @property
+    def max_health(self) -> float:
+        return float(self.batch._max_health[self.batch.kind[self.index]])
+
+    @property
+    def state(self) -> str:
+        return STATE_NAMES[self.batch.state[self.index]]
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Oleada de estrés con el motor de enemigos por lotes")
+    parser.add_argument('--enemies', type=int, default=500)
+    parser.add_argument('--ticks', type=int, default=600)
+    parser.add_argument('--no-draw', action='store_true', help="Medir solo la IA")
+    args = parser.parse_args(argv)
+
+    from src.headless import init_headless, SimulationClock
+    from src.enemies import Golem1, Golem2, Ghost1, Ghost2
+    screen = init_headless()
+    clock = SimulationClock()
+    utils.set_time_source(clock.get_ticks)
+
+    batch = EnemyBatch([Golem1, Golem2, Ghost1, Ghost2], capacity=args.enemies)
+    classes = [Golem1, Golem2, Ghost1, Ghost2]
+    rng = np.random.default_rng(0)
+    for i in range(args.enemies):
+        batch.spawn(classes[i % len(classes)], rng.uniform(0, 760), rng.uniform(300, 500))
+    target = pygame.Rect(352, 450, 96, 96)
+
+    start = time.perf_counter()
+    for tick in range(args.ticks):
+        target.x = 352 + int(200 * np.sin(tick / 60))
+        batch.update(target)
+        batch.attack_damage(target)
+        if not args.no_draw:
+            screen.fill((0, 0, 0))
+            batch.draw(screen)
+        clock.advance()
+    elapsed = time.perf_counter() - start
+    utils.set_time_source(None)
+
+    print(f"{args.enemies} enemigos, {args.ticks} ticks: {elapsed * 1000 / args.ticks:.3f} ms/tick "
+          f"({len(batch)} vivos)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+"""
+Reloj de juego con paso fijo.
+
+La simulación (movimiento, gravedad, cooldowns y animaciones, que cuentan
+ticks) avanza siempre en pasos de FIXED_STEP_MS, independientemente de la
+tasa de render. Cada frame se acumula el tiempo real transcurrido y se
+ejecutan tantos pasos como quepan; el resto (alpha) se usa para interpolar
+las posiciones al dibujar.
+
+GAME_RENDER_FPS fija el límite de frames de render (0 = sin límite).
+"""
+import os
+from typing import Dict, Iterable, Tuple
+
+import pygame
+
+from src.utils import set_time_source
+
+# Paso fijo de simulación: 60 ticks por segundo
+FIXED_STEP_MS = 1000 / 60
+# Máximo de pasos por frame: si el render se atrasa más, se descarta tiempo
+MAX_STEPS_PER_FRAME = 5
+# Desplazamientos mayores se consideran teletransportes y no se interpolan
+MAX_INTERPOLATION_DISTANCE = 64
+
+def default_render_fps() -> int:
+    return int(os.environ.get('GAME_RENDER_FPS', 60))
+
+class GameClock:
+    """
+    Reloj de paso fijo con acumulador.
+
+    Uso en el loop del nivel:
+        clock.start()
+        while running:
+            for _ in range(clock.pending_steps()):
+                clock.remember(sprites)
+                level.update()
+                clock.advance()
+            level.draw()          # usa clock.position(sprite)
+            clock.tick()
+        clock.stop()
+
+    Mientras está activo, src.utils.get_ticks() devuelve el tiempo simulado,
+    así que los temporizadores en milisegundos avanzan al mismo ritmo que
+    los que cuentan ticks.
+    """
+    def __init__(self, step_ms: float = FIXED_STEP_MS, render_fps: int = None,
+                 max_steps: int = MAX_STEPS_PER_FRAME):
+        self.step_ms = step_ms
+        self.render_fps = default_render_fps() if render_fps is None else render_fps
+        self.max_steps = max_steps
+        self.sim_ms = 0.0
+        self.accumulator = 0.0
+        # Fracción del paso siguiente ya transcurrida; 1.0 = dibujar el estado actual
+        self.alpha = 1.0
+        self.steps = 0
+        self.dropped_ms = 0.0
+        # Si no es None, start() arranca el tiempo simulado aquí y no en el reloj
+        # real (las grabaciones de src.replay empiezan en 0, como el modo headless)
+        self.origin_ms = None
+        self._clock = pygame.time.Clock()
+        self._previous: Dict[object, Tuple[int, int]] = {}
+
+    def get_ticks(self) -> int:
+        return int(self.sim_ms)
+
+    def start(self, start_ms: float = None):
+        """Activa el reloj como fuente de tiempo de src.utils."""
+        if start_ms is None:
+            start_ms = self.origin_ms
+        if start_ms is not None:
+            self.sim_ms = float(start_ms)
+        else:
+            self.sim_ms = float(pygame.time.get_ticks())
+        self.accumulator = 0.0
+        self._clock.tick()
+        set_time_source(self.get_ticks)
+
+    def stop(self):
+        """Restaura el reloj real."""
+        set_time_source(None)
+
+    def tick(self) -> float:
+        """Espera según el límite de render y acumula el tiempo real transcurrido."""
+        elapsed = self._clock.tick(self.render_fps) if self.render_fps else self._clock.tick()
+        limit = self.step_ms * self.max_steps
+        if elapsed > limit:
+            self.dropped_ms += elapsed - limit
+            elapsed = limit
+        self.accumulator += elapsed
+        return elapsed
+
+    def hold(self):
+        """Descarta el tiempo acumulado (pausa): la simulación no avanza."""
+        self.accumulator = 0.0
+        self.alpha = 1.0
+
+    def pending_steps(self) -> int:
+        """Pasos de simulación a ejecutar en este frame (consume el acumulador)."""
+        steps = int(self.accumulator // self.step_ms)
+        self.accumulator -= steps * self.step_ms
+        self.alpha = self.accumulator / self.step_ms
+        return steps
+
+    def advance(self):
+        self.sim_ms += self.step_ms
+        self.steps += 1
+
+    def get_fps(self) -> float:
+        return self._clock.get_fps()
+
+    # --- Interpolación ----------------------------------------------------
+
+    def remember(self, sprites: Iterable[object]):
+        """Guarda la posición de los sprites antes de un paso de simulación."""
+        self._previous = {sprite: sprite.rect.topleft for sprite in sprites}
+
+    def position(self, sprite, offset: Tuple[int, int] = (0, 0)) -> Tuple[int, int]:
+        """Posición de dibujo de `sprite` interpolada entre el paso anterior y el actual."""
+        x, y = sprite.rect.topleft
+        previous = self._previous.get(sprite)
+        if previous is not None and self.alpha < 1.0:
+            px, py = previous
+            if abs(x - px) <= MAX_INTERPOLATION_DISTANCE and abs(y - py) <= MAX_INTERPOLATION_DISTANCE:
+                x = round(px + (x - px) * self.alpha)
+                y = round(py + (y - py) * self.alpha)
+        return x + offset[0], y + offset[1]
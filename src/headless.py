@@ -0,0 +1,289 @@
+"""
+Modo headless: ejecuta los niveles sin ventana, sin audio y con paso fijo.
+
+El nivel se avanza tan rápido como permita la CPU usando un reloj simulado
+(src.utils.get_ticks) y un input guionizado que reemplaza al teclado real.
+
+Uso:
+    python -m src.headless --level 1 --runs 100 --ticks 3600 --policy aggressive
+"""
+import os
+import sys
+import time
+import random
+import argparse
+from typing import Callable, Dict, FrozenSet, NamedTuple, Optional, Sequence, Tuple, Union
+
+import pygame
+
+from src.utils import set_time_source
+from src.profiler import profiler
+from src.game_clock import FIXED_STEP_MS
+from src.snapshot import capture_level, restore_level
+SCREEN_SIZE = (800, 600)
+
+def init_headless(size: Tuple[int, int] = SCREEN_SIZE) -> pygame.Surface:
+    """Inicializa pygame con el driver de video dummy y sin audio."""
+    os.environ['SDL_VIDEODRIVER'] = 'dummy'
+    os.environ['SDL_AUDIODRIVER'] = 'dummy'
+    if pygame.mixer.get_init():
+        pygame.mixer.quit()
+    if pygame.display.get_init() and pygame.display.get_driver() != 'dummy':
+        pygame.display.quit()
+    pygame.display.init()
+    pygame.font.init()
+    screen = pygame.display.get_surface()
+    if screen is None or screen.get_size() != tuple(size):
+        screen = pygame.display.set_mode(size)
+    return screen
+
+def get_levels() -> Dict[int, type]:
+    """Retorna el mapa número -> clase de nivel (importado bajo demanda)."""
+    from levels.level_1 import Level1
+    from levels.level_2 import Level2
+    from levels.level_3 import Level3
+    from levels.level_4 import Level4
+    return {1: Level1, 2: Level2, 3: Level3, 4: Level4}
+
+class SimulationClock:
+    """Reloj simulado que avanza un paso fijo por tick."""
+    def __init__(self, step_ms: float = FIXED_STEP_MS, start_ms: float = 0):
+        self.step_ms = step_ms
+        self.now = float(start_ms)
+
+    def get_ticks(self) -> int:
+        return int(self.now)
+
+    def advance(self, steps: int = 1):
+        self.now += self.step_ms * steps
+
+class InputFrame(NamedTuple):
+    """Input de un tick: teclas mantenidas y teclas pulsadas (KEYDOWN)."""
+    held: FrozenSet[int] = frozenset()
+    pressed: Tuple[int, ...] = ()
+
+IDLE_FRAME = InputFrame()
+
+class KeyState:
+    """Sustituto de pygame.key.get_pressed() para el input guionizado."""
+    __slots__ = ('held',)
+
+    def __init__(self):
+        self.held = frozenset()
+
+    def __getitem__(self, key: int) -> bool:
+        return key in self.held
+
+    def get_pressed(self) -> 'KeyState':
+        return self
+
+Policy = Callable[[object, int], InputFrame]
+
+class ScriptedInput:
+    """
+    Fuente de input para el modo headless.
+    Reproduce una lista de InputFrame (grabada o escrita a mano) o consulta
+    una política policy(nivel, tick) -> InputFrame en cada tick.
+    """
+    def __init__(self, frames: Sequence[InputFrame] = (), policy: Optional[Policy] = None,
+                 loop: bool = False):
+        self.frames = frames
+        self.policy = policy
+        self.loop = loop
+
+    def next_frame(self, level, tick: int) -> InputFrame:
+        if self.policy is not None:
+            return self.policy(level, tick)
+        if tick < len(self.frames):
+            return self.frames[tick]
+        if self.loop and self.frames:
+            return self.frames[tick % len(self.frames)]
+        return IDLE_FRAME
+
+def idle_policy(seed: Optional[int] = None) -> Policy:
+    """Política que no pulsa nada."""
+    return lambda level, tick: IDLE_FRAME
+
+def random_policy(seed: Optional[int] = None) -> Policy:
+    """Política que mantiene direcciones al azar y pulsa acciones al azar."""
+    rng = random.Random(seed)
+    directions = [frozenset(), frozenset([pygame.K_LEFT]), frozenset([pygame.K_RIGHT])]
+    actions = [pygame.K_UP, pygame.K_SPACE, pygame.K_1, pygame.K_2, pygame.K_3]
+    state = {'held': frozenset()}
+
+    def policy(level, tick: int) -> InputFrame:
+        if tick % 30 == 0:
+            state['held'] = rng.choice(directions)
+        pressed = (rng.choice(actions),) if rng.random() < 0.05 else ()
+        return InputFrame(state['held'], pressed)
+    return policy
+
+def aggressive_policy(seed: Optional[int] = None) -> Policy:
+    """Política que persigue al enemigo más cercano y ataca al alcanzarlo."""
+    rng = random.Random(seed)
+
+    def policy(level, tick: int) -> InputFrame:
+        player = level.player
+        if not level.enemies:
+            return IDLE_FRAME
+        target = min(level.enemies, key=lambda e: abs(e.rect.centerx - player.rect.centerx))
+        dx = target.rect.centerx - player.rect.centerx
+        if abs(dx) > player.attack_range:
+            held = frozenset([pygame.K_RIGHT if dx > 0 else pygame.K_LEFT])
+            pressed = (pygame.K_UP,) if rng.random() < 0.01 else ()
+            return InputFrame(held, pressed)
+        # En rango: mirar al enemigo y atacar
+        facing = frozenset([pygame.K_RIGHT if dx > 0 else pygame.K_LEFT])
+        if player.mana >= 50 and rng.random() < 0.05:
+            return InputFrame(facing, (pygame.K_3,))
+        return InputFrame(facing, (pygame.K_SPACE,) if tick % 10 == 0 else ())
+    return policy
+
+POLICIES: Dict[str, Callable[[Optional[int]], Policy]] = {
+    'idle': idle_policy,
+    'random': random_policy,
+    'aggressive': aggressive_policy
+}
+
+class HeadlessRunner:
+    """
+    Ejecuta un nivel en modo headless con paso de tiempo fijo.
+    No usa el loop bloqueante de Level.run(): en cada tick inyecta el input,
+    llama a level.update() (y a level.draw() solo si render=True) y avanza
+    el reloj simulado.
+    """
+    def __init__(self, level: Union[int, type], input_source: Optional[ScriptedInput] = None,
+                 seed: Optional[int] = None, step_ms: float = FIXED_STEP_MS, render: bool = False,
+                 screen: Optional[pygame.Surface] = None):
+        self.screen = screen or init_headless()
+        self.clock = SimulationClock(step_ms)
+        self.render = render
+        self.seed = seed
+        self.tick = 0
+
+        # El reloj simulado debe estar activo antes de construir el nivel
+        set_time_source(self.clock.get_ticks)
+        if seed is not None:
+            random.seed(seed)
+
+        level_class = get_levels()[level] if isinstance(level, int) else level
+        self.level = level_class(self.screen)
+        self.level.game_started = True
+        # El presupuesto de IA depende del reloj real: sin él la simulación es determinista
+        ai = getattr(self.level, 'ai', None)
+        if ai is not None:
+            ai.budget_ms = None
+
+        self.input = input_source or ScriptedInput()
+        self.keys = KeyState()
+        self.level.player.key_state = self.keys.get_pressed
+
+    def step(self) -> bool:
+        """Avanza un tick. Retorna False cuando el nivel terminó."""
+        profiler.begin_frame()
+        frame = self.input.next_frame(self.level, self.tick)
+        self.keys.held = frame.held
+        for key in frame.pressed:
+            self.level.player.handle_event(pygame.event.Event(pygame.KEYDOWN, key=key))
+
+        self.level.update()
+        if self.render:
+            with profiler.phase('draw'):
+                self.level.draw()
+                renderer = getattr(self.level, 'renderer', None)
+                if renderer is not None:
+                    renderer.end_frame()
+        profiler.end_frame()
+
+        self.clock.advance()
+        self.tick += 1
+        return self.level.running
+
+    def snapshot(self) -> Dict[str, object]:
+        """Instantánea del nivel (src.snapshot) con el tick y el reloj simulado."""
+        snapshot = capture_level(self.level)
+        snapshot['time_ms'] = self.clock.now
+        snapshot['tick'] = self.tick
+        return snapshot
+
+    def restore(self, snapshot: Dict[str, object]):
+        """Vuelve al estado de `snapshot` sin reconstruir el nivel."""
+        restore_level(self.level, snapshot)
+        self.clock.now = float(snapshot['time_ms'])
+        self.tick = snapshot.get('tick', self.tick)
+
+    def run(self, max_ticks: int) -> Dict[str, object]:
+        """Ejecuta hasta que el nivel termine o se alcance max_ticks."""
+        start = time.perf_counter()
+        try:
+            while self.tick < max_ticks and self.step():
+                pass
+        finally:
+            self.close()
+        return self.result(time.perf_counter() - start)
+
+    def result(self, wall_seconds: float = 0.0) -> Dict[str, object]:
+        level = self.level
+        return {
+            'level': type(level).__name__,
+            'seed': self.seed,
+            'ticks': self.tick,
+            'sim_ms': self.clock.get_ticks(),
+            'wall_ms': wall_seconds * 1000,
+            'victory': bool(getattr(level, 'victory', False)),
+            'game_over': bool(getattr(level, 'game_over', False)),
+            'score': level.score,
+            'player_health': level.player.health,
+            'enemies': len(level.enemies)
+        }
+
+    def close(self):
+        """Restaura el reloj real."""
+        set_time_source(None)
+
+def run_simulations(level: int, runs: int, max_ticks: int, seed: int = 0,
+                    policy: str = 'aggressive', render: bool = False) -> list:
+    """Ejecuta `runs` partidas headless con semillas consecutivas."""
+    screen = init_headless()
+    results = []
+    for run in range(runs):
+        run_seed = seed + run
+        runner = HeadlessRunner(level, ScriptedInput(policy=POLICIES[policy](run_seed)),
+                                seed=run_seed, render=render, screen=screen)
+        results.append(runner.run(max_ticks))
+    return results
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Simulación headless de niveles")
+    parser.add_argument('--level', type=int, default=1, choices=[1, 2, 3, 4])
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--ticks', type=int, default=60 * 60, help="Ticks máximos por partida")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--policy', default='aggressive', choices=sorted(POLICIES))
+    parser.add_argument('--render', action='store_true', help="Llamar a level.draw() en cada tick")
+    parser.add_argument('--trace', help="Activar el profiler y volcar la traza por frame a este CSV")
+    args = parser.parse_args(argv)
+
+    if args.trace and not profiler.enabled:
+        profiler.toggle()
+
+    start = time.perf_counter()
+    results = run_simulations(args.level, args.runs, args.ticks, args.seed, args.policy, args.render)
+    elapsed = time.perf_counter() - start
+
+    for result in results:
+        outcome = "victoria" if result['victory'] else ("derrota" if result['game_over'] else "sin terminar")
+        print(f"semilla {result['seed']:>5}: {outcome:<12} {result['ticks']:>6} ticks  "
+              f"puntuación {result['score']:>5}  vida {result['player_health']:>5.0f}  "
+              f"({result['wall_ms']:.0f} ms)")
+    victories = sum(1 for r in results if r['victory'])
+    total_ticks = sum(r['ticks'] for r in results)
+    print(f"{len(results)} partidas, {victories} victorias, {total_ticks} ticks en {elapsed:.2f} s "
+          f"({total_ticks / max(elapsed, 1e-9):.0f} ticks/s, {len(results) / max(elapsed, 1e-9) * 60:.0f} partidas/min)")
+    if args.trace:
+        profiler.log_summary()
+        print(f"📊 Traza de frames guardada en {profiler.dump_csv(args.trace)}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,179 @@
+"""
+HUD con capa precompuesta.
+
+Cada elemento (barra, texto, barra de jefe) guarda su Surface renderizada y
+solo la vuelve a generar cuando cambia su clave (el valor que se ve en
+pantalla: ancho en píxeles de la barra, número del texto...). El HUD compone
+sus elementos en una única Surface que se blitea una vez por frame, y solo
+la recompone cuando algún elemento cambió.
+"""
+from typing import Optional, Sequence, Tuple
+
+import pygame
+
+from src.utils import render_text
+
+Color = Tuple[int, int, int]
+
+class HUDElement:
+    """Elemento del HUD con su Surface cacheada, en coordenadas de pantalla."""
+    def __init__(self, position: Tuple[int, int]):
+        self.position = position
+        self.surface: Optional[pygame.Surface] = None
+        self._key = None
+
+    def key(self, *values):
+        """Lo que se ve en pantalla para estos valores; por defecto, los valores tal cual."""
+        return values
+
+    def set(self, *values) -> bool:
+        """Actualiza los valores. Retorna True si el elemento se volvió a renderizar."""
+        key = self.key(*values)
+        if key == self._key:
+            return False
+        self._key = key
+        self.surface = self.render(*key)
+        return True
+
+    def render(self, *key) -> pygame.Surface:
+        raise NotImplementedError
+
+    @property
+    def rect(self) -> pygame.Rect:
+        if self.surface is None:
+            return pygame.Rect(self.position, (0, 0))
+        return self.surface.get_rect(topleft=self.position)
+
+class TextElement(HUDElement):
+    """Texto con sombra; `template` se formatea con los valores (ej: "Puntuación: {}")."""
+    def __init__(self, position: Tuple[int, int], template: str = "{}", font_size: int = 30,
+                 color: Color = (255, 255, 255)):
+        super().__init__(position)
+        self.template = template
+        self.font_size = font_size
+        self.color = color
+
+    def key(self, *values):
+        return (self.template.format(*values),)
+
+    def render(self, text: str) -> pygame.Surface:
+        return render_text(text, self.font_size, self.color)
+
+class BarElement(HUDElement):
+    """
+    Barra de valor/máximo con fondo y etiqueta opcionales.
+    La etiqueta se formatea con el valor entero (ej: "HP: {}%").
+    """
+    def __init__(self, position: Tuple[int, int], size: Tuple[int, int], color: Color,
+                 background: Optional[Color] = None, label: Optional[str] = None, label_size: int = 16):
+        super().__init__(position)
+        self.size = size
+        self.color = color
+        self.background = background
+        self.label = label
+        self.label_size = label_size
+
+    def key(self, value: float, maximum: float):
+        width = int(self.size[0] * (value / maximum)) if maximum else 0
+        return (max(0, min(width, self.size[0])), int(value) if self.label else None)
+
+    def render(self, width: int, label_value: Optional[int]) -> pygame.Surface:
+        label = None
+        if self.label:
+            label = render_text(self.label.format(label_value), self.label_size, (255, 255, 255))
+        # La etiqueta (con sombra) puede sobresalir por debajo de la barra
+        height = max(self.size[1], label.get_height() if label else 0)
+        surface = pygame.Surface((self.size[0], height), pygame.SRCALPHA)
+        if self.background:
+            surface.fill(self.background, (0, 0, *self.size))
+        if width:
+            surface.fill(self.color, (0, 0, width, self.size[1]))
+        if label:
+            surface.blit(label, (5, 0))
+        return surface
+
+class BossBarElement(BarElement):
+    """Barra de vida del jefe con su nombre encima."""
+    NAME_HEIGHT = 25
+
+    def __init__(self, position: Tuple[int, int], size: Tuple[int, int], name: str,
+                 color: Color = (200, 0, 0), background: Color = (100, 0, 0),
+                 name_color: Color = (255, 0, 0), name_size: int = 20):
+        # La posición es la de la barra; el nombre queda NAME_HEIGHT px por encima
+        super().__init__((position[0], position[1] - self.NAME_HEIGHT), size, color, background)
+        self.name = name
+        self.name_color = name_color
+        self.name_size = name_size
+
+    def render(self, width: int, label_value: Optional[int]) -> pygame.Surface:
+        name = render_text(self.name, self.name_size, self.name_color)
+        bar = super().render(width, label_value)
+        surface = pygame.Surface((max(self.size[0], name.get_width()), self.NAME_HEIGHT + self.size[1]),
+                                 pygame.SRCALPHA)
+        surface.blit(bar, (0, self.NAME_HEIGHT))
+        surface.blit(name, (0, 0))
+        return surface
+
+class HUD:
+    """
+    Capa de HUD: compone sus elementos en una Surface con transparencia y la
+    dibuja con un solo blit. Los valores se pasan con set(nombre, *valores).
+    """
+    def __init__(self, elements: Sequence[Tuple[str, HUDElement]]):
+        self.elements = dict(elements)
+        self.surface: Optional[pygame.Surface] = None
+        self.rect = pygame.Rect(0, 0, 0, 0)
+        self.changed = True
+        self.rebuilds = 0
+
+    def set(self, name: str, *values):
+        if self.elements[name].set(*values):
+            self.changed = True
+
+    def compose(self) -> pygame.Surface:
+        """Recompone la capa si algún elemento cambió."""
+        if self.changed or self.surface is None:
+            rects = [element.rect for element in self.elements.values()]
+            rect = rects[0].unionall(rects[1:])
+            if self.surface is None or rect.size != self.surface.get_size():
+                self.surface = pygame.Surface(rect.size, pygame.SRCALPHA)
+            else:
+                self.surface.fill((0, 0, 0, 0))
+            for element in self.elements.values():
+                if element.surface is not None:
+                    self.surface.blit(element.surface, (element.position[0] - rect.x,
+                                                        element.position[1] - rect.y))
+            self.rect = rect
+            self.rebuilds += 1
+        return self.surface
+
+    def invalid_rects(self) -> list:
+        """Zona que ocupaba la capa si hay que recomponerla (para DirtyRenderer.begin_frame)."""
+        return [self.rect] if self.changed and self.surface is not None else []
+
+    def draw(self, renderer) -> Optional[pygame.Rect]:
+        """Dibuja la capa con el DirtyRenderer del nivel (solo si hace falta)."""
+        changed = self.changed
+        surface = self.compose()
+        self.changed = False
+        return renderer.blit_static(surface, self.rect, changed)
+
+class GameHUD(HUD):
+    """HUD estándar de los niveles (mismo diseño que utils.draw_game_ui)."""
+    def __init__(self, bar_width: int = 200, bar_height: int = 20, padding: int = 10):
+        super().__init__([
+            ('health', BarElement((padding, padding), (bar_width, bar_height), (255, 0, 0),
+                                  (100, 0, 0), label="HP: {}%")),
+            ('mana', BarElement((padding, padding * 2 + bar_height), (bar_width, bar_height), (0, 0, 255),
+                                (0, 0, 100), label="MP: {}%")),
+            ('level_name', TextElement((padding, padding * 4 + bar_height * 2), font_size=24)),
+            ('score', TextElement((padding, padding * 6 + bar_height * 2), "Puntuación: {}", 20)),
+            ('wave', TextElement((padding, padding * 8 + bar_height * 2), "Oleada: {}", 20))
+        ])
+
+    def update(self, player, level_name: str, score: int, wave: int):
+        self.set('health', player.health, player.max_health)
+        self.set('mana', player.mana, player.max_mana)
+        self.set('level_name', level_name)
+        self.set('score', score)
+        self.set('wave', wave)
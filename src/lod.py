@@ -0,0 +1,69 @@
+"""
+Nivel de detalle (LOD) de las animaciones de los enemigos.
+
+Los enemigos fuera de la vista (con un margen, para que no "salten" al
+entrar) congelan su animación, y los sprites diminutos la avanzan a menor
+ritmo. Las animaciones ligadas a la lógica (ataque y muerte, que terminan
+estados al llegar al último frame) siempre van a ritmo completo, así el
+LOD solo cambia lo que se ve y no el resultado de la partida.
+
+La vista es la de la cámara del nivel: AIScheduler la actualiza con
+set_view() en cada tick antes de mover a los enemigos.
+
+Los contadores por tick (anim.full, anim.coarse, anim.frozen) se envían al
+profiler con report(); AIScheduler lo llama tras actualizar a los enemigos.
+"""
+from typing import Dict
+
+import pygame
+
+from src.profiler import profiler
+
+FULL, COARSE, FROZEN = 'full', 'coarse', 'frozen'
+
+VIEW_RECT = pygame.Rect(0, 0, 800, 600)
+VIEW_MARGIN = 64       # px alrededor de la vista que siguen animándose
+TINY_SIZE = 24         # sprites con lado menor que esto se animan más lento
+COARSE_FACTOR = 3      # duración de frame multiplicada en el nivel COARSE
+
+class AnimationLOD:
+    """Decide el nivel de detalle de la animación de cada sprite y lo cuenta."""
+    def __init__(self, view: pygame.Rect = VIEW_RECT, margin: int = VIEW_MARGIN,
+                 tiny_size: int = TINY_SIZE, coarse_factor: int = COARSE_FACTOR):
+        self.enabled = True
+        self.margin = margin
+        self.area = view.inflate(margin * 2, margin * 2)
+        self.tiny_size = tiny_size
+        self.coarse_factor = coarse_factor
+        self.counts: Dict[str, int] = {FULL: 0, COARSE: 0, FROZEN: 0}
+
+    def set_view(self, view: pygame.Rect):
+        """Mueve la zona visible (coordenadas de mundo, ej: Camera.view_rect)."""
+        self.area = view.inflate(self.margin * 2, self.margin * 2)
+
+    def level(self, sprite) -> str:
+        """FULL, COARSE o FROZEN para el estado actual de `sprite`."""
+        if not self.enabled or sprite.is_attacking or sprite.is_dying:
+            lod = FULL
+        elif not self.area.colliderect(sprite.rect):
+            lod = FROZEN
+        elif min(sprite.rect.size) < self.tiny_size:
+            lod = COARSE
+        else:
+            lod = FULL
+        self.counts[lod] += 1
+        return lod
+
+    def frame_scale(self, lod: str) -> int:
+        """Multiplicador de la duración de frame para `lod` (COARSE avanza más lento)."""
+        return self.coarse_factor if lod == COARSE else 1
+
+    def report(self):
+        """Envía los contadores del tick al profiler y los reinicia."""
+        counts = self.counts
+        for lod, value in counts.items():
+            profiler.count(f'anim.{lod}', value)
+            counts[lod] = 0
+
+# LOD compartido por todos los enemigos
+animation_lod = AnimationLOD()
@@ -0,0 +1,127 @@
+import pygame
+import numpy as np
+from typing import Dict, Optional, Tuple
+
+# Vida inicial de una partícula (también es su alfa inicial)
+PARTICLE_TTL = 255
+# Cantidad de niveles de transparencia precalculados por color
+ALPHA_LEVELS = 16
+DOT_SIZE = 4
+
+class ParticleSystem:
+    """
+    Sistema de partículas con buffers NumPy (estructura de arrays).
+
+    Cada partícula ocupa un índice fijo en los arrays de posición, velocidad,
+    vida y color. Los índices libres se guardan en una pila para reutilizarlos
+    sin reservar memoria nueva; si el sistema está lleno las partículas nuevas
+    se descartan. El color se guarda como índice a una paleta, y cada par
+    (color, nivel de alfa) tiene su sprite de punto construido una sola vez.
+    """
+    def __init__(self, capacity: int = 4096, decay: float = 5.0, spread: float = 2.0):
+        self.capacity = capacity
+        self.decay = decay
+        self.spread = spread
+
+        self.pos = np.zeros((capacity, 2), dtype=np.float32)
+        self.vel = np.zeros((capacity, 2), dtype=np.float32)
+        self.ttl = np.zeros(capacity, dtype=np.float32)
+        self.color = np.zeros(capacity, dtype=np.int32)
+        self.alive = np.zeros(capacity, dtype=bool)
+
+        # Pila de índices libres: los primeros free_count elementos están disponibles
+        self._free = np.arange(capacity - 1, -1, -1, dtype=np.int32)
+        self.free_count = capacity
+
+        # Paleta de colores y sprites precalculados [color, nivel de alfa]
+        self._palette: Dict[Tuple[int, int, int], int] = {}
+        self._sprites = np.empty((0, ALPHA_LEVELS), dtype=object)
+
+        self._rng = np.random.default_rng()
+        # Contadores de uso de los índices: emitidas, descartadas por falta de sitio y máximo vivas
+        self.emitted = 0
+        self.dropped = 0
+        self.high_water = 0
+
+    def __len__(self) -> int:
+        return self.capacity - self.free_count
+
+    def stats(self) -> Dict[str, int]:
+        return {'emitted': self.emitted, 'dropped': self.dropped, 'high_water': self.high_water,
+                'alive': len(self), 'capacity': self.capacity}
+
+    def emit(self, position: Tuple[float, float], color: Tuple[int, int, int], count: int = 10) -> int:
+        """Crea `count` partículas en `position`. Retorna cuántas se crearon."""
+        created = min(count, self.free_count)
+        self.dropped += count - created
+        if created <= 0:
+            return 0
+
+        self.free_count -= created
+        self.emitted += created
+        self.high_water = max(self.high_water, self.capacity - self.free_count)
+        indices = self._free[self.free_count:self.free_count + created]
+
+        self.pos[indices] = position
+        self.vel[indices] = self._rng.uniform(-self.spread, self.spread, (created, 2))
+        self.ttl[indices] = PARTICLE_TTL
+        self.color[indices] = self._color_index(color)
+        self.alive[indices] = True
+        return created
+
+    def update(self):
+        """Avanza todas las partículas en un solo paso vectorizado."""
+        if self.free_count == self.capacity:
+            return
+        self.pos += self.vel
+        self.ttl[self.alive] -= self.decay
+
+        dead = np.flatnonzero(self.alive & (self.ttl <= 0))
+        if len(dead):
+            self.alive[dead] = False
+            self._free[self.free_count:self.free_count + len(dead)] = dead
+            self.free_count += len(dead)
+
+    def draw(self, screen: pygame.Surface, offset: Tuple[int, int] = (0, 0)) -> Optional[pygame.Rect]:
+        """
+        Dibuja las partículas vivas con una sola llamada a blits.
+        Retorna el rectángulo que las contiene (None si no hay ninguna).
+        """
+        indices = np.flatnonzero(self.alive)
+        if not len(indices):
+            return None
+        levels = np.minimum(self.ttl[indices] * ALPHA_LEVELS // (PARTICLE_TTL + 1),
+                            ALPHA_LEVELS - 1).astype(np.int32)
+        sprites = self._sprites[self.color[indices], levels]
+        positions = (self.pos[indices] + offset).astype(np.int32)
+        screen.blits(zip(sprites, positions.tolist()), doreturn=False)
+        left, top = positions.min(axis=0)
+        right, bottom = positions.max(axis=0) + DOT_SIZE
+        return pygame.Rect(int(left), int(top), int(right - left), int(bottom - top))
+
+    def clear(self):
+        """Elimina todas las partículas."""
+        self.alive[:] = False
+        self._free[:] = np.arange(self.capacity - 1, -1, -1, dtype=np.int32)
+        self.free_count = self.capacity
+
+    def _color_index(self, color: Tuple[int, int, int]) -> int:
+        color = tuple(color[:3])
+        index = self._palette.get(color)
+        if index is None:
+            index = len(self._palette)
+            self._palette[color] = index
+            row = np.empty((1, ALPHA_LEVELS), dtype=object)
+            for level in range(ALPHA_LEVELS):
+                alpha = (level + 1) * (PARTICLE_TTL + 1) // ALPHA_LEVELS - 1
+                row[0, level] = create_dot_sprite(color, alpha)
+            self._sprites = np.concatenate([self._sprites, row])
+        return index
+
+def create_dot_sprite(color: Tuple[int, int, int], alpha: int) -> pygame.Surface:
+    """Crea el sprite de un punto de partícula con la transparencia indicada."""
+    surface = pygame.Surface((DOT_SIZE, DOT_SIZE), pygame.SRCALPHA)
+    pygame.draw.circle(surface, (*color, alpha), (DOT_SIZE // 2, DOT_SIZE // 2), DOT_SIZE // 2)
+    if pygame.display.get_surface() is not None:
+        surface = surface.convert_alpha()
+    return surface
@@ -1,14 +1,19 @@
 import pygame
 from typing import Dict, Optional, List, Tuple
 from src.utils import (
-    load_animation,
-    load_sound,
-    create_particle_effect
+    load_animation_frames,
+    flip_frames,
+    get_ticks
 )
+from src.particles import ParticleSystem
+from src.collision import reach_rect
+from src.audio import audio
 
 class Animation:
-    def __init__(self, frames: List[pygame.Surface], frame_duration: int = 5):
+    def __init__(self, frames: List[pygame.Surface], frame_duration: int = 5,
+                 flipped_frames: Optional[List[pygame.Surface]] = None):
         self.frames = frames
+        self.flipped_frames = flipped_frames if flipped_frames is not None else flip_frames(frames)
         self.frame_duration = frame_duration
         self.current_frame_index = 0
         self.frame_timer = 0
@@ -20,8 +25,10 @@ class Animation:
             self.frame_timer = 0
             self.current_frame_index = (self.current_frame_index + 1) % len(self.frames)
     
-    def get_current_frame(self) -> pygame.Surface:
-        """Retorna el frame actual de la animación."""
+    def get_current_frame(self, flipped: bool = False) -> pygame.Surface:
+        """Retorna el frame actual de la animación (espejado si se pide)."""
+        if flipped:
+            return self.flipped_frames[self.current_frame_index]
         return self.frames[self.current_frame_index]
     
     def reset(self):
@@ -30,19 +37,32 @@ class Animation:
         self.frame_timer = 0
 
 class Player(pygame.sprite.Sprite):
+    CHARACTER = "Geralt"
+    SIZE = (96, 96)
+    # Cargar SOLO las animaciones que existen en tu estructura
+    ANIMATIONS = {
+        'idle': ('geralt_idle', 10),
+        'walk': ('geralt_walk', 10),
+        'run': ('geralt_run', 10),
+        'jump': ('geralt_jump', 10),
+        'die': ('geralt_die', 10),
+        'fight': ('geralt_fight', 10)
+    }
+    # Efectos de sonido (se decodifican una sola vez en el banco de src.audio)
+    SOUNDS = {
+        'jump': 'jump.wav',
+        'attack': 'attack.wav',
+        'hurt': 'hurt.wav',
+        'die': 'die.wav',
+        'spell': 'spell.wav'
+    }
+    SOUND_VOLUME = 0.3
+
     def __init__(self, x: int, y: int):
         super().__init__()
         
-        self.size = (96, 96)
-        # Cargar SOLO las animaciones que existen en tu estructura
-        self.animations = self.load_character_animations("Geralt", {
-            'idle': ('geralt_idle', 10),
-            'walk': ('geralt_walk', 10),
-            'run': ('geralt_run', 10),
-            'jump': ('geralt_jump', 10),
-            'die': ('geralt_die', 10),
-            'fight': ('geralt_fight', 10)
-        }, size=self.size)
+        self.size = self.SIZE
+        self.animations = self.load_character_animations(self.CHARACTER, self.ANIMATIONS, size=self.size)
         
         # Estado inicial
         self.current_animation = 'idle'
@@ -51,6 +71,9 @@ class Player(pygame.sprite.Sprite):
         self.rect.x = x
         self.rect.y = y
         
+        # Fuente del estado del teclado (el modo headless la reemplaza por input guionizado)
+        self.key_state = pygame.key.get_pressed
+        
         # Atributos de movimiento
         self.speed = 5
         self.jump_speed = -15
@@ -94,18 +117,12 @@ class Player(pygame.sprite.Sprite):
         }
         
         # Efectos visuales
-        self.particles = []
+        self.particles = ParticleSystem(capacity=2048)
         self.flash_timer = 0
         self.flash_duration = 100
         
-        # Cargar sonidos
-        self.sounds = {
-            'jump': load_sound('jump.wav', 0.3),
-            'attack': load_sound('attack.wav', 0.3),
-            'hurt': load_sound('hurt.wav', 0.3),
-            'die': load_sound('die.wav', 0.3),
-            'spell': load_sound('spell.wav', 0.3)
-        }
+        # Sonidos: solo se decodifican la primera vez que se crea un jugador
+        audio.preload(self.SOUNDS.values(), self.SOUND_VOLUME)
 
     def load_character_animations(self, character_name: str, animation_data: Dict[str, Tuple[str, int]], 
                             size: Optional[Tuple[int, int]] = None) -> Dict[str, Animation]:
@@ -116,18 +133,14 @@ class Player(pygame.sprite.Sprite):
             animation_data: Diccionario con los datos de animación
             size: Tamaño opcional para escalar los sprites
         """
-        animations = {}
-        for anim_name, (prefix, frame_count) in animation_data.items():
-            # Usar el formato correcto de carpeta (ej: 'Geralt/Idle' para animación 'idle')
-            folder = f"{character_name}/{anim_name.capitalize()}"
-            frames = load_animation(folder, prefix, frame_count, size)
-            animations[anim_name] = Animation(frames)
-        return animations
+        frames = load_animation_frames(character_name, animation_data, size)
+        return {anim_name: Animation(anim_frames, flipped_frames=flipped)
+                for anim_name, (anim_frames, flipped) in frames.items()}
 
     def update(self):
         """Actualiza el estado del jugador."""
         # Obtener teclas presionadas
-        keys = pygame.key.get_pressed()
+        keys = self.key_state()
         
         # Movimiento horizontal con aceleración
         if keys[pygame.K_LEFT] or keys[pygame.K_a]:
@@ -172,14 +185,14 @@ class Player(pygame.sprite.Sprite):
         
         # Actualizar invulnerabilidad
         if self.invulnerable:
-            current_time = pygame.time.get_ticks()
+            current_time = get_ticks()
             if current_time - self.invulnerable_timer > self.invulnerable_duration:
                 self.invulnerable = False
         
         # Actualizar efectos visuales
         if self.flash_timer > 0:
             self.flash_timer -= 1
-        self.particles = self.update_particles()
+        self.update_particles()
         
         # Determinar animación actual
         self.update_animation()
@@ -204,15 +217,11 @@ class Player(pygame.sprite.Sprite):
         else:
             self.current_animation = 'idle'
         
-        # Actualizar frame de animación
+        # Actualizar frame de animación (los frames espejados ya están precalculados)
         self.animations[self.current_animation].update()
-        new_image = self.animations[self.current_animation].get_current_frame()
-        
-        # Voltear imagen si es necesario
-        if not self.facing_right:
-            new_image = pygame.transform.flip(new_image, True, False)
-        
-        self.image = new_image
+        self.image = self.animations[self.current_animation].get_current_frame(
+            flipped=not self.facing_right
+        )
 
     def handle_event(self, event):
         """Maneja eventos de input del jugador."""
@@ -252,7 +261,7 @@ class Player(pygame.sprite.Sprite):
 
     def attack(self):
         """Realiza un ataque melee."""
-        current_time = pygame.time.get_ticks()
+        current_time = get_ticks()
         if not self.is_attacking and self.attack_cooldown == 0:
             self.is_attacking = True
             self.attack_cooldown = 20
@@ -266,14 +275,9 @@ class Player(pygame.sprite.Sprite):
                 self.combo_count = 0
                 self.attack_damage = 20
             
-            # Crear rectángulo de ataque
-            self.attack_rect = self.rect.copy()
-            if self.facing_right:
-                self.attack_rect.left = self.rect.right
-                self.attack_rect.width = self.attack_range
-            else:
-                self.attack_rect.right = self.rect.left
-                self.attack_rect.width = self.attack_range
+            # Crear rectángulo de ataque desde el borde visible del personaje
+            # (el frame tiene mucho relleno transparente alrededor)
+            self.attack_rect = reach_rect(self, self.attack_range, self.facing_right)
             
             self.combo_timer = self.combo_window
             self.animations['fight'].reset()
@@ -296,7 +300,7 @@ class Player(pygame.sprite.Sprite):
         if not self.invulnerable:
             self.health = max(0, self.health - amount)
             self.invulnerable = True
-            self.invulnerable_timer = pygame.time.get_ticks()
+            self.invulnerable_timer = get_ticks()
             self.flash_timer = self.flash_duration
             self.play_sound('hurt')
             self.create_damage_particles()
@@ -330,17 +334,17 @@ class Player(pygame.sprite.Sprite):
 
     def play_sound(self, sound_name: str):
         """Reproduce un sonido si está disponible."""
-        if sound_name in self.sounds and self.sounds[sound_name]:
-            self.sounds[sound_name].play()
+        if sound_name in self.SOUNDS:
+            audio.play_sfx(self.SOUNDS[sound_name])
 
     def create_particles(self, position: Tuple[int, int], color: Tuple[int, int, int], 
                         count: int = 10) -> None:
         """Crea partículas en una posición específica."""
-        self.particles.extend(create_particle_effect(position, color, count))
+        self.particles.emit(position, color, count)
 
-    def update_particles(self) -> List[Dict]:
+    def update_particles(self):
         """Actualiza las partículas existentes."""
-        return [p for p in self.particles if p['timer'] > 0]
+        self.particles.update()
 
     def create_jump_particles(self):
         """Crea partículas para el salto."""
@@ -0,0 +1,156 @@
+"""
+Pools de objetos reutilizables.
+
+Los niveles con oleadas crean y destruyen enemigos y textos flotantes sin
+parar. Con estos pools los objetos muertos vuelven a una lista libre y el
+siguiente spawn los reinicia en lugar de construir uno nuevo (que además
+implica crear los objetos Animation de cada personaje). Tras las primeras
+oleadas las partidas largas alcanzan un estado estable sin reservas nuevas.
+
+Cada pool cuenta aciertos (objeto reutilizado), fallos (objeto construido)
+y el máximo de objetos en uso a la vez.
+"""
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+Color = Tuple[int, int, int]
+
+class ObjectPool:
+    """
+    Lista libre de objetos de un tipo.
+    `factory(*args)` construye un objeto nuevo; `reset(obj, *args)` prepara
+    uno reutilizado con los mismos argumentos.
+    """
+    def __init__(self, factory: Callable, reset: Optional[Callable] = None):
+        self.factory = factory
+        self.reset = reset
+        self._free: List[object] = []
+        # id() de los objetos de la lista libre: evita recorrerla en release()
+        self._free_ids: Set[int] = set()
+        self.hits = 0
+        self.misses = 0
+        self.in_use = 0
+        self.high_water = 0
+
+    def acquire(self, *args):
+        if self._free:
+            obj = self._free.pop()
+            self._free_ids.discard(id(obj))
+            if self.reset is not None:
+                self.reset(obj, *args)
+            self.hits += 1
+        else:
+            obj = self.factory(*args)
+            self.misses += 1
+        self.in_use += 1
+        if self.in_use > self.high_water:
+            self.high_water = self.in_use
+        return obj
+
+    def release(self, obj):
+        """Devuelve `obj` a la lista libre (ignora objetos ya devueltos)."""
+        if id(obj) in self._free_ids:
+            return
+        self.in_use -= 1
+        self._free.append(obj)
+        self._free_ids.add(id(obj))
+
+    @property
+    def free(self) -> int:
+        return len(self._free)
+
+    def stats(self) -> Dict[str, int]:
+        return {'hits': self.hits, 'misses': self.misses, 'in_use': self.in_use,
+                'high_water': self.high_water, 'free': len(self._free)}
+
+class EnemyPool:
+    """Un ObjectPool por clase de enemigo; los enemigos se reinician con Enemy.reset."""
+    def __init__(self):
+        self.pools: Dict[type, ObjectPool] = {}
+
+    def _pool(self, enemy_class: type) -> ObjectPool:
+        pool = self.pools.get(enemy_class)
+        if pool is None:
+            pool = self.pools[enemy_class] = ObjectPool(enemy_class, enemy_class.reset)
+        return pool
+
+    def acquire(self, enemy_class: type, x: int, y: int):
+        """Enemigo de `enemy_class` en (x, y), reutilizado si hay alguno libre."""
+        return self._pool(enemy_class).acquire(x, y)
+
+    def release(self, enemy):
+        """Saca al enemigo de sus grupos y lo deja disponible para otro spawn."""
+        enemy.kill()
+        self._pool(type(enemy)).release(enemy)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {enemy_class.__name__: pool.stats() for enemy_class, pool in self.pools.items()}
+
+class FloatingText:
+    """
+    Registro de un texto flotante (reutilizado por FloatingTexts).
+    `position` está en coordenadas de mundo salvo si `screen_space` (avisos fijos en pantalla).
+    """
+    __slots__ = ('text', 'position', 'color', 'end_time', 'screen_space')
+
+    def __init__(self):
+        self.text = ""
+        self.position = (0, 0)
+        self.color: Color = (255, 255, 255)
+        self.end_time = 0
+        self.screen_space = False
+
+class FloatingTexts:
+    """Textos flotantes activos de un nivel; los caducados vuelven al pool."""
+    def __init__(self, pool: Optional[ObjectPool] = None):
+        self.pool = pool if pool is not None else floating_text_pool
+        self.active: List[FloatingText] = []
+
+    def add(self, text: str, position: Tuple[int, int], color: Color, end_time: int,
+            screen_space: bool = False) -> FloatingText:
+        record = self.pool.acquire()
+        record.text = text
+        record.position = position
+        record.color = color
+        record.end_time = end_time
+        record.screen_space = screen_space
+        self.active.append(record)
+        return record
+
+    def expire(self, now: int):
+        """Quita (en el sitio, sin crear una lista nueva) los textos ya caducados."""
+        keep = 0
+        for record in self.active:
+            if now < record.end_time:
+                self.active[keep] = record
+                keep += 1
+            else:
+                self.pool.release(record)
+        del self.active[keep:]
+
+    def clear(self):
+        for record in self.active:
+            self.pool.release(record)
+        self.active.clear()
+
+    def __iter__(self) -> Iterator[FloatingText]:
+        return iter(self.active)
+
+    def __len__(self) -> int:
+        return len(self.active)
+
+# Pools compartidos por todos los niveles
+enemy_pool = EnemyPool()
+floating_text_pool = ObjectPool(FloatingText)
+
+def log_pool_stats(particles=None):
+    """Imprime los contadores de los pools (y de un ParticleSystem, si se pasa)."""
+    for name, stats in enemy_pool.stats().items():
+        print(f"📦 Pool {name}: {stats['hits']} reutilizados, {stats['misses']} creados, "
+              f"máximo en uso {stats['high_water']}")
+    stats = floating_text_pool.stats()
+    print(f"📦 Pool textos flotantes: {stats['hits']} reutilizados, {stats['misses']} creados, "
+          f"máximo en uso {stats['high_water']}")
+    if particles is not None:
+        stats = particles.stats()
+        print(f"📦 Partículas: {stats['emitted']} emitidas, {stats['dropped']} descartadas, "
+              f"máximo vivas {stats['high_water']} de {stats['capacity']}")
@@ -0,0 +1,216 @@
+import os
+import time
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import wait as wait_futures
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import pygame
+
+from src import rgba_decode, utils
+
+# Tiempo máximo por frame dedicado a integrar assets precargados
+POLL_BUDGET_MS = 4.0
+
+def default_loader_mode() -> str:
+    """
+    GAME_LOADER=process|thread. Por defecto se decodifica en procesos si hay
+    Pillow y más de un núcleo; si no, en hilos con pygame.
+    """
+    mode = os.environ.get('GAME_LOADER')
+    if mode in ('process', 'thread'):
+        return mode
+    return 'process' if rgba_decode.available() and (os.cpu_count() or 1) > 1 else 'thread'
+
+def _decode_surfaces(paths: Sequence[str], size: Optional[Tuple[int, int]]) -> List[Optional[pygame.Surface]]:
+    """Decodifica y escala frames con pygame, sin convertirlos (se ejecuta en un hilo de fondo)."""
+    frames = []
+    for path in paths:
+        try:
+            frames.append(utils.decode_frame(path, size))
+        except Exception:
+            frames.append(None)
+    return frames
+
+def _to_surface(frame) -> Optional[pygame.Surface]:
+    """Surface sin convertir a partir del resultado de un trabajo (hilo o proceso)."""
+    if frame is None or isinstance(frame, pygame.Surface):
+        return frame
+    width, height, pixels = frame
+    return pygame.image.frombuffer(pixels, (width, height), 'RGBA')
+
+class AssetPreloader:
+    """
+    Precarga en segundo plano los assets del siguiente nivel.
+
+    La decodificación y el escalado de PNG se reparten, una animación por
+    trabajo, en un pool de procesos (Pillow, devuelve píxeles RGBA) o de hilos
+    (pygame). La conversión al formato de pantalla y el guardado en las cachés
+    de src.utils se hacen en el hilo principal, dentro de poll() (con un
+    presupuesto de tiempo por frame) o de wait().
+    """
+    def __init__(self, workers: Optional[int] = None, mode: Optional[str] = None):
+        self.mode = mode or default_loader_mode()
+        if self.mode == 'process' and not rgba_decode.available():
+            self.mode = 'thread'
+        cpus = os.cpu_count() or 1
+        self.workers = workers or (cpus if self.mode == 'process' else min(4, cpus))
+        self._executor: Optional[Executor] = None
+        # Trabajos en orden: (futures de decodificación, vacío si es solo del hilo principal; finalizador)
+        self._jobs: deque = deque()
+        self._requested = set()
+        self.completed = 0
+        # Progreso del lote actual (se reinicia cuando la cola se vacía)
+        self._tasks_total = 0
+        self._tasks_done = 0
+        self._frames = 0
+        self._batch_start: Optional[float] = None
+
+    @property
+    def pending(self) -> int:
+        return len(self._jobs)
+
+    def progress(self) -> float:
+        """Fracción del lote actual ya decodificada (1.0 si no hay nada pendiente)."""
+        if not self._tasks_total:
+            return 1.0
+        running = sum(1 for futures, _ in self._jobs for future in futures if future.done())
+        return min(1.0, (self._tasks_done + running) / self._tasks_total)
+
+    def preload_level(self, level_class):
+        """Encola el fondo, el jugador y los enemigos de un nivel."""
+        from src.player import Player
+        self.preload_background(level_class.BACKGROUND)
+        for cls in (Player,) + tuple(level_class.ENEMY_TYPES):
+            self.preload_character(cls.CHARACTER, cls.ANIMATIONS, cls.SIZE)
+
+    def preload_character(self, character_name: str, animations_config: Dict[str, Tuple[str, int]],
+                          size: Optional[Tuple[int, int]]):
+        key = ('character', character_name, tuple(animations_config.items()), size)
+        if key in self._requested or utils.is_animation_cached(character_name, animations_config, size):
+            return
+        self._requested.add(key)
+
+        # Solo se decodifican fuera las animaciones completas; el resto se carga
+        # con utils.load_animation (que pone placeholders) al finalizar
+        names = []
+        futures = []
+        if utils.get_asset_pack() is None:
+            for anim_name, (prefix, frame_count) in animations_config.items():
+                paths = utils.find_frame_paths(utils.animation_folder(character_name, anim_name), prefix)
+                if len(paths) >= frame_count:
+                    names.append(anim_name)
+                    futures.append(self._decode([str(path) for path in paths[:frame_count]], size))
+
+        def finalize(results):
+            if utils.is_animation_cached(character_name, animations_config, size):
+                return
+            decoded = dict(zip(names, results))
+            frames = {}
+            for anim_name, (prefix, frame_count) in animations_config.items():
+                anim_frames = decoded.get(anim_name)
+                if anim_frames is None or any(frame is None for frame in anim_frames):
+                    # Con paquete de assets, frames que faltan o si falló el trabajo
+                    folder = utils.animation_folder(character_name, anim_name)
+                    frames[anim_name] = utils.load_animation(folder, prefix, frame_count, size)
+                else:
+                    frames[anim_name] = [_to_surface(frame).convert_alpha() for frame in anim_frames]
+                    self._frames += len(anim_frames)
+            utils.store_animation_frames(character_name, animations_config, size, frames)
+
+        self._add_job(tuple(futures), finalize)
+
+    def preload_background(self, image_name: str):
+        key = ('background', image_name)
+        if key in self._requested:
+            return
+        self._requested.add(key)
+
+        futures = ()
+        path = utils.ASSETS_DIR / "images" / "backgrounds" / image_name
+        if utils.get_asset_pack() is None and path.exists():
+            futures = (self._decode([str(path)], utils.BACKGROUND_SIZE),)
+
+        def finalize(results):
+            background = _to_surface(results[0][0]) if results and results[0] else None
+            if background is None:
+                utils.load_background(image_name)
+            else:
+                utils.store_background(image_name, background.convert())
+
+        self._add_job(futures, finalize)
+
+    def poll(self, budget_ms: float = POLL_BUDGET_MS) -> int:
+        """Integra los trabajos terminados sin pasar de budget_ms. Retorna cuántos integró."""
+        start = time.perf_counter()
+        done = 0
+        while self._jobs:
+            futures, _ = self._jobs[0]
+            if not all(future.done() for future in futures):
+                break
+            self._finalize(self._jobs.popleft())
+            done += 1
+            if (time.perf_counter() - start) * 1000 >= budget_ms:
+                break
+        return done
+
+    def wait(self, on_progress: Optional[Callable[[float], None]] = None):
+        """
+        Integra todos los trabajos pendientes, esperando a los trabajadores si
+        hace falta. `on_progress(fracción)` se llama mientras tanto (ej: barra de carga).
+        """
+        while self._jobs:
+            futures, _ = self._jobs[0]
+            if on_progress is not None:
+                while not all(future.done() for future in futures):
+                    on_progress(self.progress())
+                    wait_futures(futures, timeout=0.05)
+            self._finalize(self._jobs.popleft())
+            if on_progress is not None:
+                on_progress(self.progress())
+
+    def shutdown(self):
+        self.wait()
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def _decode(self, paths: List[str], size: Optional[Tuple[int, int]]) -> Future:
+        if self._executor is None:
+            if self.mode == 'process':
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers,
+                                                    thread_name_prefix="precarga")
+        if self.mode == 'process':
+            return self._executor.submit(rgba_decode.decode_rgba_frames, paths, size)
+        return self._executor.submit(_decode_surfaces, paths, size)
+
+    def _add_job(self, futures: Tuple[Future, ...], finalize: Callable):
+        if self._batch_start is None:
+            self._batch_start = time.perf_counter()
+        self._tasks_total += max(1, len(futures))
+        self._jobs.append((futures, finalize))
+
+    def _finalize(self, job):
+        futures, finalize = job
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                print(f"⚠️ Error en la precarga, se cargará en el hilo principal: {e}")
+                results.append(None)
+        finalize(results)
+        self.completed += 1
+        self._tasks_done += max(1, len(futures))
+        if not self._jobs:
+            if self._frames:
+                elapsed = (time.perf_counter() - self._batch_start) * 1000
+                print(f"📦 Precarga: {self._frames} frames en {elapsed:.0f} ms "
+                      f"({self.workers} {'procesos' if self.mode == 'process' else 'hilos'})")
+            self._tasks_total = self._tasks_done = self._frames = 0
+            self._batch_start = None
+
+# Precargador compartido por el menú, las pantallas de inicio y los niveles
+preloader = AssetPreloader()
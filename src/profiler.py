@@ -0,0 +1,208 @@
+import os
+import csv
+import time
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+import pygame
+
+from src.utils import get_font
+
+PROFILE_WINDOW = 600      # frames en la ventana móvil (10 s a 60 FPS)
+OVERLAY_REFRESH = 15      # frames entre redibujados del overlay
+OVERLAY_POSITION = (560, 10)
+
+class _NullPhase:
+    """Contexto vacío usado cuando el profiler está desactivado."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NULL_PHASE = _NullPhase()
+
+class _Phase:
+    __slots__ = ('profiler', 'name', 'start')
+
+    def __init__(self, profiler: 'FrameProfiler', name: str):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = (time.perf_counter() - self.start) * 1000
+        phases = self.profiler.current_phases
+        phases[self.name] = phases.get(self.name, 0.0) + elapsed
+        return False
+
+class FrameProfiler:
+    """
+    Profiler de frames para el loop de los niveles.
+
+    Mide por separado cada fase del frame (eventos, jugador, enemigos, spawn,
+    dibujado, flip), mantiene una ventana móvil con percentiles p50/p95/p99 y
+    los peores picos, y puede volcar la traza por frame a CSV. Mientras está
+    desactivado, phase() retorna un contexto vacío y no mide nada.
+    """
+    def __init__(self, window: int = PROFILE_WINDOW, spikes: int = 5):
+        self.enabled = False
+        self.show_overlay = False
+        self.window = window
+        self.spike_count = spikes
+        self.frames: deque = deque(maxlen=window)
+        self.phase_names: List[str] = []
+        self.counters: Dict[str, int] = {}
+        self.current_phases: Dict[str, float] = {}
+        self.frame_index = 0
+        self._frame_start = 0.0
+        self._overlay: Optional[pygame.Surface] = None
+        self._overlay_age = OVERLAY_REFRESH
+
+    # --- Medición -------------------------------------------------------
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        self.current_phases = {}
+        self._frame_start = time.perf_counter()
+
+    def end_frame(self):
+        if not self.enabled:
+            return
+        total = (time.perf_counter() - self._frame_start) * 1000
+        for name in self.current_phases:
+            if name not in self.phase_names:
+                self.phase_names.append(name)
+        self.frames.append((self.frame_index, total, self.current_phases))
+        self.frame_index += 1
+        self.current_phases = {}
+
+    def phase(self, name: str):
+        """Contexto que acumula el tiempo de la fase `name` en el frame actual."""
+        if not self.enabled:
+            return _NULL_PHASE
+        return _Phase(self, name)
+
+    def count(self, name: str, value: int = 1):
+        """Registra el valor de un contador del frame (sprites dibujados, descartados, etc.)."""
+        if self.enabled:
+            self.counters[name] = value
+
+    # --- Control --------------------------------------------------------
+
+    def toggle(self):
+        """Activa o desactiva el profiler junto con su overlay."""
+        self.enabled = not self.enabled
+        self.show_overlay = self.enabled
+        self._overlay_age = OVERLAY_REFRESH
+
+    def handle_event(self, event) -> bool:
+        """F3 alterna el overlay, F4 vuelca la traza a CSV. Retorna si consumió el evento."""
+        if event.type != pygame.KEYDOWN:
+            return False
+        if event.key == pygame.K_F3:
+            self.toggle()
+            return True
+        if event.key == pygame.K_F4 and self.frames:
+            path = self.dump_csv()
+            print(f"📊 Traza de frames guardada en {path}")
+            return True
+        return False
+
+    def reset(self):
+        self.frames.clear()
+        self.counters.clear()
+        self.frame_index = 0
+
+    # --- Resultados -----------------------------------------------------
+
+    def stats(self) -> Dict[str, object]:
+        """Percentiles del tiempo de frame y media por fase en la ventana actual."""
+        totals = sorted(frame[1] for frame in self.frames)
+        if not totals:
+            return {'frames': 0}
+
+        def percentile(p: float) -> float:
+            return totals[min(len(totals) - 1, int(len(totals) * p))]
+
+        phase_means = {}
+        for name in self.phase_names:
+            phase_means[name] = sum(frame[2].get(name, 0.0) for frame in self.frames) / len(self.frames)
+        spikes = sorted(self.frames, key=lambda frame: frame[1], reverse=True)[:self.spike_count]
+        return {
+            'frames': len(totals),
+            'p50': percentile(0.50),
+            'p95': percentile(0.95),
+            'p99': percentile(0.99),
+            'max': totals[-1],
+            'phases': phase_means,
+            'spikes': [(index, total) for index, total, _ in spikes],
+            'counters': dict(self.counters)
+        }
+
+    def dump_csv(self, path: Optional[str] = None) -> str:
+        """Escribe una fila por frame con el tiempo total y el de cada fase."""
+        if path is None:
+            path = f"frame_trace_{time.strftime('%Y%m%d_%H%M%S')}.csv"
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['frame', 'total_ms'] + self.phase_names)
+            for index, total, phases in self.frames:
+                writer.writerow([index, f"{total:.3f}"] +
+                                [f"{phases.get(name, 0.0):.3f}" for name in self.phase_names])
+        return os.path.abspath(path)
+
+    def log_summary(self):
+        stats = self.stats()
+        if not stats['frames']:
+            return
+        phases = ", ".join(f"{name} {ms:.2f}" for name, ms in stats['phases'].items())
+        print(f"⏱️ {stats['frames']} frames: p50 {stats['p50']:.2f} ms, p95 {stats['p95']:.2f} ms, "
+              f"p99 {stats['p99']:.2f} ms, máx {stats['max']:.2f} ms | {phases}")
+
+    # --- Overlay --------------------------------------------------------
+
+    def draw(self, screen: pygame.Surface) -> Optional[pygame.Rect]:
+        """Dibuja el overlay (se recompone cada OVERLAY_REFRESH frames). Retorna su área."""
+        if not self.show_overlay:
+            return None
+        self._overlay_age += 1
+        if self._overlay is None or self._overlay_age >= OVERLAY_REFRESH:
+            self._overlay = self._build_overlay()
+            self._overlay_age = 0
+        return screen.blit(self._overlay, OVERLAY_POSITION)
+
+    def _build_overlay(self) -> pygame.Surface:
+        stats = self.stats()
+        lines: List[Tuple[str, Tuple[int, int, int]]] = []
+        if stats['frames']:
+            lines.append((f"p50 {stats['p50']:.2f}  p95 {stats['p95']:.2f}  p99 {stats['p99']:.2f} ms",
+                          (255, 255, 255)))
+            for name, ms in stats['phases'].items():
+                lines.append((f"{name:<14} {ms:6.2f} ms", (180, 220, 255)))
+            for name, value in stats['counters'].items():
+                lines.append((f"{name:<14} {value:6d}", (180, 255, 180)))
+            worst = "  ".join(f"{total:.1f}" for _, total in stats['spikes'])
+            lines.append((f"picos: {worst}", (255, 160, 160)))
+        else:
+            lines.append(("midiendo...", (255, 255, 255)))
+
+        font = get_font(14)
+        line_height = font.get_linesize()
+        surface = pygame.Surface((230, line_height * len(lines) + 8), pygame.SRCALPHA)
+        surface.fill((0, 0, 0, 170))
+        for i, (text, color) in enumerate(lines):
+            surface.blit(font.render(text, True, color), (6, 4 + i * line_height))
+        return surface
+
+# Profiler compartido por todos los niveles
+profiler = FrameProfiler()
+if os.environ.get('GAME_PROFILE'):
+    profiler.toggle()
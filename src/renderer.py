@@ -0,0 +1,216 @@
+"""
+Renderizado por rectángulos sucios.
+
+En lugar de redibujar el fondo completo y hacer display.flip() en cada frame,
+DirtyRenderer recuerda qué rectángulos se dibujaron en el frame anterior,
+restaura el fondo solo en esas zonas y envía a la pantalla únicamente la
+unión de las zonas del frame anterior y del actual. Cuando el frame cubre
+toda la pantalla (pausa, screen shake, flash) o la cámara se desplaza se
+hace un redibujado completo.
+
+El fondo puede ser una Surface del tamaño de la pantalla o un fondo por
+teselas de src.camera (se restauran solo las teselas de las zonas sucias).
+
+GAME_RENDERER=full desactiva el modo y vuelve al redibujado completo.
+"""
+import os
+from typing import List, Optional, Sequence, Tuple
+
+import pygame
+
+from src.profiler import profiler
+from src.camera import WorldBackground
+
+# Si la zona sucia supera esta fracción de la pantalla, se actualiza entera
+FULL_UPDATE_RATIO = 0.6
+
+class DirtyRenderer:
+    """
+    Dibuja sobre `screen` registrando las zonas que cambian en cada frame.
+
+    El nivel llama a begin_frame(), dibuja con blit() o registra con add()
+    lo que dibuja por otros medios (pygame.draw, draw_text, draw_game_ui,
+    partículas) y termina con present(). Los frames completos se piden con
+    begin_frame(full=True); el frame siguiente también es completo para
+    borrar lo que ese frame dibujó sobre toda la pantalla.
+
+    Las capas estáticas (blit_static, ej: el HUD) se guardan aparte: no se
+    restauran en el frame siguiente salvo que algo se dibuje o restaure
+    encima, así una capa que no cambia no se vuelve a copiar ni a enviar.
+    """
+    def __init__(self, screen: pygame.Surface, background: WorldBackground,
+                 enabled: Optional[bool] = None):
+        self.screen = screen
+        self.background = background
+        if enabled is None:
+            enabled = os.environ.get('GAME_RENDERER', 'dirty') != 'full'
+        self.enabled = enabled
+        self.screen_rect = screen.get_rect()
+        self.full = True
+        self._full_next = True
+        self._previous: List[pygame.Rect] = []
+        self._restored: List[pygame.Rect] = []
+        self._current: List[pygame.Rect] = []
+        # Capas estáticas: las del frame anterior aún sin restaurar, las de
+        # este frame y las que este frame volvió a dibujar
+        self._static_pending: List[pygame.Rect] = []
+        self._static: List[pygame.Rect] = []
+        self._static_drawn: List[pygame.Rect] = []
+        self.dirty: List[pygame.Rect] = []
+        # Desplazamiento de cámara del frame actual y trozos de tesela copiados
+        self.scroll: Tuple[int, int] = (0, 0)
+        self.tiles = 0
+        # Sprites dibujados y descartados (fuera de pantalla) en el frame actual
+        self.drawn = 0
+        self.culled = 0
+
+    def invalidate(self):
+        """Fuerza un redibujado completo en el próximo frame."""
+        self._full_next = True
+
+    def begin_frame(self, full: bool = False, background_offset: Tuple[int, int] = (0, 0),
+                    invalid: Sequence[pygame.Rect] = (), scroll: Tuple[int, int] = (0, 0)):
+        """
+        Prepara el frame: fondo completo o solo las zonas sucias del frame
+        anterior más las zonas `invalid` (ej: capas estáticas que cambiaron).
+        `scroll` es el desplazamiento de la cámara; si cambia, todo se mueve.
+        """
+        full = full or background_offset != (0, 0)
+        moved = scroll != self.scroll
+        self.scroll = scroll
+        self.full = full or moved or self._full_next or not self.enabled
+        self._full_next = full
+        self._current = []
+        self.drawn = 0
+        self.culled = 0
+        self.tiles = 0
+        restored = self._previous + [pygame.Rect(rect) for rect in invalid if rect]
+        # Una capa estática bajo una zona restaurada se restaura entera: volver
+        # a dibujarla sobre sí misma acumularía su transparencia
+        pending = []
+        for rect in self._static:
+            if rect.collidelist(restored) != -1:
+                restored.append(rect)
+            else:
+                pending.append(rect)
+        self._restored = restored
+        self._static_pending = pending
+        self._static = []
+        self._static_drawn = []
+        if self.full or self._covers_screen(restored):
+            self._static_pending = []
+            self._draw_background(None, background_offset)
+        elif restored:
+            self._draw_background(restored)
+
+    def _draw_background(self, areas: Optional[List[pygame.Rect]], offset: Tuple[int, int] = (0, 0)):
+        """Restaura el fondo en `areas` (None = pantalla completa)."""
+        background = self.background
+        if not isinstance(background, pygame.Surface):
+            self.tiles = background.draw(self.screen, self.scroll, areas, offset)
+        elif areas is None:
+            self.screen.blit(background, offset)
+        else:
+            self.screen.blits([(background, rect, rect) for rect in areas], doreturn=False)
+
+    def blit(self, surface: pygame.Surface, dest, area=None) -> pygame.Rect:
+        if self._static_pending:
+            size = pygame.Rect(area).size if area else surface.get_size()
+            self._restore_static(pygame.Rect((dest[0], dest[1]), size))
+        rect = self.screen.blit(surface, dest, area)
+        self._current.append(rect)
+        return rect
+
+    def blit_sprite(self, surface: pygame.Surface, dest) -> Optional[pygame.Rect]:
+        """
+        Dibuja un sprite solo si cae dentro de la pantalla (descarte por vista).
+        Retorna None si se descartó, para que el nivel omita también sus extras.
+        """
+        x, y = dest
+        width, height = surface.get_size()
+        if not self.screen_rect.colliderect((x, y, width, height)):
+            self.culled += 1
+            return None
+        self.drawn += 1
+        return self.blit(surface, dest)
+
+    def _restore_static(self, rect: pygame.Rect):
+        """Restaura el fondo de las capas estáticas pendientes que `rect` va a tapar."""
+        pending = self._static_pending
+        index = rect.collidelist(pending)
+        while index != -1:
+            static = pending.pop(index)
+            self._draw_background([static])
+            self._restored.append(static)
+            index = rect.collidelist(pending)
+
+    def blit_static(self, surface: pygame.Surface, dest, changed: bool = True) -> Optional[pygame.Rect]:
+        """
+        Dibuja una capa que suele quedarse igual (HUD). Solo se redibuja si
+        cambió, si el frame es completo o si su zona se restauró (blit() la
+        restaura antes de dibujar encima); si no, lo que ya hay en pantalla
+        sigue siendo válido y no se envía. Lo registrado con add() sobre una
+        capa sin restaurar queda encima durante ese frame: en el siguiente
+        su zona se restaura y la capa se redibuja entera.
+        """
+        rect = surface.get_rect(topleft=pygame.Rect(dest).topleft)
+        self._static.append(rect)
+        if self.full or changed or rect.collidelist(self._restored) != -1:
+            rect = self.screen.blit(surface, rect)
+            self._static_drawn.append(rect)
+            return rect
+        return None
+
+    def add(self, rect: Optional[pygame.Rect]):
+        """Registra una zona dibujada por otros medios (acepta None)."""
+        if rect:
+            self._current.append(pygame.Rect(rect))
+
+    def end_frame(self) -> List[pygame.Rect]:
+        """Calcula las zonas a enviar a la pantalla (vacío si el frame es completo)."""
+        current = merge_rects(self._current, self.screen_rect)
+        if self.full:
+            self.dirty = []
+        else:
+            self.dirty = merge_rects(self._restored + current + self._static_drawn, self.screen_rect)
+            if self._covers_screen(self.dirty):
+                self.full = True
+                self.dirty = []
+        self._previous = current
+        self._current = []
+        profiler.count('sprites_drawn', self.drawn)
+        profiler.count('sprites_culled', self.culled)
+        if not isinstance(self.background, pygame.Surface):
+            profiler.count('bg_tiles', self.tiles)
+        return self.dirty
+
+    def _covers_screen(self, rects: List[pygame.Rect]) -> bool:
+        area = sum(rect.w * rect.h for rect in rects)
+        return area > FULL_UPDATE_RATIO * self.screen_rect.w * self.screen_rect.h
+
+    def present(self):
+        """Termina el frame y envía a la pantalla solo lo que cambió."""
+        self.end_frame()
+        if self.full:
+            pygame.display.flip()
+            profiler.count('dirty_rects', 0)
+            profiler.count('dirty_kpx', self.screen_rect.w * self.screen_rect.h // 1000)
+        else:
+            pygame.display.update(self.dirty)
+            profiler.count('dirty_rects', len(self.dirty))
+            profiler.count('dirty_kpx', sum(rect.w * rect.h for rect in self.dirty) // 1000)
+
+def merge_rects(rects: List[pygame.Rect], bounds: pygame.Rect) -> List[pygame.Rect]:
+    """Recorta los rectángulos a `bounds` y une los que se solapan."""
+    merged: List[pygame.Rect] = []
+    for rect in rects:
+        rect = rect.clip(bounds)
+        if not rect.w or not rect.h:
+            continue
+        # Absorber los ya unidos que se solapen hasta que no quede ninguno
+        index = rect.collidelist(merged)
+        while index != -1:
+            rect.union_ip(merged.pop(index))
+            index = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
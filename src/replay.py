@@ -0,0 +1,301 @@
+"""
+Grabación y reproducción determinista de partidas.
+
+Una grabación guarda, por cada tick de simulación, las teclas mantenidas que
+lee Player.update y los KEYDOWN que recibe Player.handle_event, junto con la
+semilla de `random` y hashes periódicos del estado del nivel. Todo lo demás
+(spawns, IA, daño) se deriva de esos datos, así que reproducir el log en un
+HeadlessRunner a máxima velocidad debe dar exactamente los mismos hashes.
+
+Formato binario (little endian):
+    cabecera   '<4sBBQdIHI'  magic, versión, nivel, semilla, paso en ms,
+                             ticks, intervalo de hash, número de hashes
+    hashes     '<II' * n     (tick, crc32 del estado tras ese tick)
+    cuerpo     zlib de, por tick: máscara de teclas mantenidas (uint16),
+               número de KEYDOWN (uint8) e índice de cada tecla (uint8)
+
+Uso:
+    GAME_RECORD=grabaciones python main.py          # grabar partidas reales
+    python -m src.replay record --level 1 --ticks 3600 -o partida.rpl
+    python -m src.replay play partida.rpl --repeat 5
+"""
+import os
+import sys
+import time
+import zlib
+import struct
+import random
+import argparse
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+import pygame
+
+from src.utils import set_time_source
+from src.game_clock import FIXED_STEP_MS
+
+MAGIC = b'GRPL'
+VERSION = 1
+HEADER = struct.Struct('<4sBBQdIHI')
+HASH_ENTRY = struct.Struct('<II')
+TICK_ENTRY = struct.Struct('<HB')
+# Hash del estado cada segundo de simulación (y siempre en el último tick)
+HASH_INTERVAL = 60
+
+# Teclas que lee el jugador; su posición es el bit de la máscara / el índice grabado
+RECORDED_KEYS: Tuple[int, ...] = (
+    pygame.K_LEFT, pygame.K_a, pygame.K_RIGHT, pygame.K_d,
+    pygame.K_UP, pygame.K_w, pygame.K_SPACE,
+    pygame.K_1, pygame.K_2, pygame.K_3
+)
+KEY_INDEX = {key: i for i, key in enumerate(RECORDED_KEYS)}
+
+def keys_to_mask(keys) -> int:
+    """Máscara de las RECORDED_KEYS pulsadas en `keys` (resultado de get_pressed)."""
+    mask = 0
+    for i, key in enumerate(RECORDED_KEYS):
+        if keys[key]:
+            mask |= 1 << i
+    return mask
+
+def mask_to_keys(mask: int) -> frozenset:
+    return frozenset(key for i, key in enumerate(RECORDED_KEYS) if mask & (1 << i))
+
+def state_hash(level) -> int:
+    """crc32 del estado de simulación del nivel (no incluye nada visual)."""
+    player = level.player
+    data = bytearray(struct.pack(
+        '<iiddddqq', player.rect.x, player.rect.y, float(player.velocity_x), float(player.velocity_y),
+        float(player.health), float(player.mana), int(level.score), len(level.enemies)))
+    for enemy in level.enemies:
+        data += type(enemy).__name__.encode()
+        data += struct.pack('<iid', enemy.rect.x, enemy.rect.y, float(enemy.health))
+        data += enemy.current_animation.encode()
+        data += struct.pack('<i', enemy.animations[enemy.current_animation].current_frame)
+    return zlib.crc32(bytes(data))
+
+class Recording:
+    """Contenido de una grabación: nivel, semilla, input por tick y hashes."""
+    def __init__(self, level: int, seed: int, step_ms: float = FIXED_STEP_MS,
+                 hash_interval: int = HASH_INTERVAL):
+        self.level = level
+        self.seed = seed
+        self.step_ms = step_ms
+        self.hash_interval = hash_interval
+        # Por tick: (máscara de teclas mantenidas, índices de los KEYDOWN en orden)
+        self.ticks: List[Tuple[int, Tuple[int, ...]]] = []
+        self.hashes: List[Tuple[int, int]] = []
+
+    def to_bytes(self) -> bytes:
+        body = bytearray()
+        for held, pressed in self.ticks:
+            body += TICK_ENTRY.pack(held, len(pressed))
+            body += bytes(pressed)
+        header = HEADER.pack(MAGIC, VERSION, self.level, self.seed, self.step_ms,
+                             len(self.ticks), self.hash_interval, len(self.hashes))
+        hashes = b''.join(HASH_ENTRY.pack(tick, value) for tick, value in self.hashes)
+        return header + hashes + zlib.compress(bytes(body), 9)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'Recording':
+        magic, version, level, seed, step_ms, tick_count, interval, hash_count = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("No es una grabación válida (o es de otra versión)")
+        recording = cls(level, seed, step_ms, interval)
+        offset = HEADER.size
+        for _ in range(hash_count):
+            recording.hashes.append(HASH_ENTRY.unpack_from(data, offset))
+            offset += HASH_ENTRY.size
+        body = zlib.decompress(data[offset:])
+        offset = 0
+        for _ in range(tick_count):
+            held, count = TICK_ENTRY.unpack_from(body, offset)
+            offset += TICK_ENTRY.size
+            recording.ticks.append((held, tuple(body[offset:offset + count])))
+            offset += count
+        return recording
+
+    def save(self, path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(self.to_bytes())
+        return path
+
+    @classmethod
+    def load(cls, path) -> 'Recording':
+        return cls.from_bytes(Path(path).read_bytes())
+
+    def input_frames(self) -> list:
+        """El input como lista de headless.InputFrame."""
+        from src.headless import InputFrame
+        return [InputFrame(mask_to_keys(held), tuple(RECORDED_KEYS[i] for i in pressed))
+                for held, pressed in self.ticks]
+
+class InputRecorder:
+    """
+    Graba el input de un nivel tick a tick.
+
+    Se engancha a la instancia del nivel: envuelve player.key_state (teclas
+    mantenidas), player.handle_event (KEYDOWN) y level.update (fin de tick).
+    Funciona igual con el teclado real que con el input del HeadlessRunner.
+    """
+    def __init__(self, level_number: int, seed: Optional[int] = None,
+                 hash_interval: int = HASH_INTERVAL):
+        if seed is None:
+            seed = int.from_bytes(os.urandom(8), 'little')
+        self.recording = Recording(level_number, seed, hash_interval=hash_interval)
+        self.level = None
+        self._held = 0
+        self._pressed: List[int] = []
+        self._last_hash: Optional[Tuple[int, int]] = None
+
+    def create_level(self, level_class: type, screen: pygame.Surface):
+        """
+        Construye el nivel en las mismas condiciones que HeadlessRunner:
+        `random` sembrado y tiempo simulado empezando en 0.
+        """
+        random.seed(self.recording.seed)
+        set_time_source(lambda: 0)
+        try:
+            level = level_class(screen)
+        finally:
+            set_time_source(None)
+        level.clock.origin_ms = 0
+        # Sin presupuesto de IA (depende del reloj real), igual que HeadlessRunner
+        ai = getattr(level, 'ai', None)
+        if ai is not None:
+            ai.budget_ms = None
+        self.attach(level)
+        return level
+
+    def attach(self, level):
+        self.level = level
+        player = level.player
+        read_keys = player.key_state
+        handle_event = player.handle_event
+        update = level.update
+
+        def key_state():
+            keys = read_keys()
+            self._held = keys_to_mask(keys)
+            return keys
+
+        def recorded_handle_event(event):
+            if event.type == pygame.KEYDOWN and event.key in KEY_INDEX:
+                self._pressed.append(KEY_INDEX[event.key])
+            handle_event(event)
+
+        def recorded_update():
+            pressed = tuple(self._pressed)
+            self._pressed.clear()
+            self._held = 0
+            update()
+            self.end_tick(pressed)
+
+        player.key_state = key_state
+        player.handle_event = recorded_handle_event
+        level.update = recorded_update
+
+    def end_tick(self, pressed: Tuple[int, ...]):
+        recording = self.recording
+        recording.ticks.append((self._held, pressed))
+        tick = len(recording.ticks)
+        # El hash de cada tick se guarda para poder cerrar la grabación con el
+        # estado del último tick aunque el nivel ya haya liberado sus enemigos
+        self._last_hash = (tick, state_hash(self.level))
+        if tick % recording.hash_interval == 0:
+            recording.hashes.append(self._last_hash)
+
+    def finish(self) -> Recording:
+        """Cierra la grabación añadiendo el hash del último tick si no estaba."""
+        recording = self.recording
+        if self._last_hash is not None and (not recording.hashes or recording.hashes[-1] != self._last_hash):
+            recording.hashes.append(self._last_hash)
+        return recording
+
+    def save(self, path) -> Path:
+        return self.finish().save(path)
+
+def default_recording_path(directory, level_number: int) -> Path:
+    return Path(directory) / f"nivel{level_number}_{time.strftime('%Y%m%d_%H%M%S')}.rpl"
+
+def replay(recording: Recording, render: bool = False, screen: Optional[pygame.Surface] = None) -> dict:
+    """
+    Reproduce la grabación en un HeadlessRunner a máxima velocidad y compara
+    los hashes. El resultado incluye 'desync' (primer tick que no coincide o None).
+    """
+    from src.headless import HeadlessRunner, ScriptedInput
+    runner = HeadlessRunner(recording.level, ScriptedInput(recording.input_frames()),
+                            seed=recording.seed, step_ms=recording.step_ms, render=render, screen=screen)
+    expected = dict(recording.hashes)
+    desync = None
+    checked = 0
+    start = time.perf_counter()
+    try:
+        for _ in range(len(recording.ticks)):
+            runner.step()
+            value = expected.get(runner.tick)
+            if value is not None:
+                checked += 1
+                if desync is None and state_hash(runner.level) != value:
+                    desync = runner.tick
+    finally:
+        runner.close()
+    result = runner.result(time.perf_counter() - start)
+    result.update({'desync': desync, 'hashes_checked': checked})
+    return result
+
+def record_headless(level: int, ticks: int, seed: int = 0, policy: str = 'aggressive') -> Recording:
+    """Graba una partida headless jugada por una de las políticas de src.headless."""
+    from src.headless import POLICIES, HeadlessRunner, ScriptedInput
+    recorder = InputRecorder(level, seed)
+    runner = HeadlessRunner(level, ScriptedInput(policy=POLICIES[policy](seed)), seed=seed)
+    recorder.attach(runner.level)
+    try:
+        while runner.tick < ticks and runner.step():
+            pass
+    finally:
+        runner.close()
+    return recorder.finish()
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    from src.headless import POLICIES, init_headless
+    parser = argparse.ArgumentParser(description="Grabación y reproducción de partidas")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    record = commands.add_parser('record', help="Grabar una partida headless con una política")
+    record.add_argument('--level', type=int, default=1, choices=[1, 2, 3, 4])
+    record.add_argument('--ticks', type=int, default=60 * 60)
+    record.add_argument('--seed', type=int, default=0)
+    record.add_argument('--policy', default='aggressive', choices=sorted(POLICIES))
+    record.add_argument('-o', '--output', required=True)
+
+    play = commands.add_parser('play', help="Reproducir una grabación y verificar sus hashes")
+    play.add_argument('path')
+    play.add_argument('--repeat', type=int, default=1, help="Reproducir varias veces (carga de rendimiento)")
+    play.add_argument('--render', action='store_true', help="Llamar a level.draw() en cada tick")
+    args = parser.parse_args(argv)
+
+    screen = init_headless()
+    if args.command == 'record':
+        recording = record_headless(args.level, args.ticks, args.seed, args.policy)
+        path = recording.save(args.output)
+        print(f"📦 {len(recording.ticks)} ticks grabados en {path} ({path.stat().st_size} bytes)")
+        return 0
+
+    recording = Recording.load(args.path)
+    failed = False
+    for run in range(args.repeat):
+        result = replay(recording, args.render, screen)
+        ticks_per_second = result['ticks'] / max(result['wall_ms'] / 1000, 1e-9)
+        if result['desync'] is None:
+            status = f"✅ {result['hashes_checked']} hashes coinciden"
+        else:
+            failed = True
+            status = f"❌ desincronizada en el tick {result['desync']}"
+        print(f"⏱️ Reproducción {run + 1}: {result['ticks']} ticks en {result['wall_ms']:.0f} ms "
+              f"({ticks_per_second:.0f} ticks/s) - {status}")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
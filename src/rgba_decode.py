@@ -0,0 +1,50 @@
+"""
+Decodificación de sprites con Pillow para los procesos del precargador.
+
+Este módulo no importa pygame: los procesos del pool solo necesitan Pillow.
+Cada trabajo decodifica y escala los frames de una animación y devuelve sus
+píxeles RGBA en bruto; el hilo principal los envuelve con
+pygame.image.frombuffer y los convierte con convert_alpha().
+"""
+from typing import List, Optional, Sequence, Tuple
+
+try:
+    from PIL import Image
+except ImportError:  # Sin Pillow el precargador usa hilos y pygame
+    Image = None
+
+# (ancho, alto, píxeles RGBA) o None si el frame no se pudo leer
+RGBAFrame = Optional[Tuple[int, int, bytes]]
+
+def available() -> bool:
+    return Image is not None
+
+def scale_like_pygame(image, size: Tuple[int, int]):
+    """
+    Escalado por vecino más cercano con el mismo muestreo que
+    pygame.transform.scale (píxel de origen floor(x * ancho / nuevo_ancho)).
+    Image.resize muestrea en el centro del píxel y daría otros frames.
+    """
+    scale_x = image.width / size[0]
+    scale_y = image.height / size[1]
+    # Pillow evalúa la transformación en el centro de cada píxel de destino
+    return image.transform(tuple(size), Image.AFFINE,
+                           (scale_x, 0, -scale_x / 2 + 1e-7, 0, scale_y, -scale_y / 2 + 1e-7),
+                           resample=Image.NEAREST)
+
+def decode_rgba_frames(paths: Sequence[str], size: Optional[Tuple[int, int]] = None) -> List[RGBAFrame]:
+    """
+    Decodifica `paths` y los escala a `size` (igual que pygame.transform.scale).
+    Se ejecuta en un proceso del pool.
+    """
+    frames: List[RGBAFrame] = []
+    for path in paths:
+        try:
+            with Image.open(path) as image:
+                image = image.convert('RGBA')
+                if size and image.size != tuple(size):
+                    image = scale_like_pygame(image, size)
+                frames.append((image.width, image.height, image.tobytes()))
+        except Exception:
+            frames.append(None)
+    return frames
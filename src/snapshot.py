@@ -0,0 +1,285 @@
+"""
+Instantáneas del estado de un nivel.
+
+capture_level(level) guarda solo datos simples (números, textos, tuplas):
+los atributos del nivel, del jugador y de cada enemigo, los rects como
+tuplas, el cursor de cada animación y la imagen actual como referencia
+(animación, índice de frame, espejado). Las Surfaces, sonidos y grupos no
+se copian: al restaurar se reutilizan los assets ya cargados, los enemigos
+se reciclan con src.pools y el nivel no se reconstruye.
+
+Sirve para reintentos instantáneos desde un punto de control y para que
+las herramientas de simulación ramifiquen partidas desde un estado
+intermedio. to_bytes/from_bytes dan el formato compacto para guardarlas.
+
+Uso:
+    snapshot = capture_level(level)
+    ...
+    restore_level(level, snapshot)
+
+Puntos de control: los niveles llaman a save_checkpoint(self) al empezar y
+al comenzar cada oleada o fase. Tras un Game Over, retry_from_checkpoint()
+devuelve el mismo objeto nivel a ese punto y level.run() sigue desde ahí,
+sin reconstruir el nivel ni recargar sus assets.
+"""
+import sys
+import time
+import zlib
+import pickle
+import random
+import argparse
+from typing import Dict, Optional, Sequence
+
+import pygame
+
+from src.pools import enemy_pool
+from src.utils import get_ticks
+
+SNAPSHOT_VERSION = 2
+_PRIMITIVES = (int, float, bool, str, type(None))
+
+_NOT_PLAIN = object()
+
+def _plain_copy(value):
+    """
+    Copia de `value` si solo contiene datos simples (números, textos, tuplas,
+    listas y dicts de ellos); _NOT_PLAIN si contiene cualquier otra cosa.
+    Las listas y dicts se copian para que la instantánea no comparta estado mutable.
+    """
+    kind = type(value)
+    if kind in _PRIMITIVES:
+        return value
+    if kind is tuple or kind is list:
+        items = [_plain_copy(item) for item in value]
+        if any(item is _NOT_PLAIN for item in items):
+            return _NOT_PLAIN
+        return tuple(items) if kind is tuple else items
+    if kind is dict:
+        copy = {}
+        for key, item in value.items():
+            item = _plain_copy(item)
+            if type(key) not in _PRIMITIVES or item is _NOT_PLAIN:
+                return _NOT_PLAIN
+            copy[key] = item
+        return copy
+    return _NOT_PLAIN
+
+def _restore_attrs(obj, attrs: Dict[str, object]):
+    for name, value in attrs.items():
+        if type(value) is list or type(value) is dict:
+            value = _plain_copy(value)
+        setattr(obj, name, value)
+
+def _capture_object(obj) -> Dict[str, object]:
+    """Estado de un sprite: atributos simples, rects, cursores de animación e imagen."""
+    attrs = {}
+    rects = {}
+    for name, value in vars(obj).items():
+        if type(value) is pygame.Rect:
+            rects[name] = (value.x, value.y, value.width, value.height)
+            continue
+        value = _plain_copy(value)
+        if value is not _NOT_PLAIN:
+            attrs[name] = value
+    animations = getattr(obj, 'animations', None)
+    state = {'attrs': attrs, 'rects': rects}
+    if animations:
+        state['animations'] = {name: {key: value for key, value in vars(animation).items()
+                                      if type(value) in _PRIMITIVES}
+                               for name, animation in animations.items()}
+        state['image'] = _image_ref(obj)
+    return state
+
+def _image_ref(obj) -> Optional[tuple]:
+    """(animación, frame, espejado) de la imagen actual; se busca primero en la animación actual."""
+    image = getattr(obj, 'image', None)
+    current = getattr(obj, 'current_animation', None)
+    names = [current] if current in obj.animations else []
+    names += [name for name in obj.animations if name != current]
+    for name in names:
+        animation = obj.animations[name]
+        for flipped, frames in ((False, animation.frames), (True, animation.flipped_frames)):
+            for index, frame in enumerate(frames):
+                if frame is image:
+                    return (name, index, flipped)
+    return None
+
+def _restore_object(obj, state: Dict[str, object]):
+    _restore_attrs(obj, state['attrs'])
+    for name, rect in state['rects'].items():
+        current = getattr(obj, name, None)
+        if type(current) is pygame.Rect:
+            current.update(rect)
+        else:
+            setattr(obj, name, pygame.Rect(rect))
+    # Los atributos que eran None al capturar (ej: attack_rect) ya vienen en attrs
+    for name, cursor in state.get('animations', {}).items():
+        if name in obj.animations:
+            vars(obj.animations[name]).update(cursor)
+    ref = state.get('image')
+    if ref is not None:
+        name, index, flipped = ref
+        animation = obj.animations[name]
+        obj.image = (animation.flipped_frames if flipped else animation.frames)[index]
+
+# Atributos del nivel con tratamiento propio (o que no son estado de simulación)
+_LEVEL_SKIP = {'player', 'enemies', 'floating_texts', 'checkpoint'}
+
+def capture_level(level) -> Dict[str, object]:
+    """Instantánea del estado de simulación del nivel (solo datos simples)."""
+    enemies = list(level.enemies)
+    index = {id(enemy): i for i, enemy in enumerate(enemies)}
+    attrs = {}
+    refs = {}
+    for name, value in vars(level).items():
+        if name in _LEVEL_SKIP:
+            continue
+        if id(value) in index:
+            # Referencias a enemigos concretos (ej: Level4.boss, Level3.dragon)
+            refs[name] = index[id(value)]
+            continue
+        value = _plain_copy(value)
+        if value is not _NOT_PLAIN:
+            attrs[name] = value
+    # Tiempo simulado exacto si el GameClock del nivel es la fuente de tiempo activa
+    now = get_ticks()
+    clock = getattr(level, 'clock', None)
+    if clock is not None and int(getattr(clock, 'sim_ms', -1)) == now:
+        now = clock.sim_ms
+    floating_texts = getattr(level, 'floating_texts', None)
+    return {
+        'version': SNAPSHOT_VERSION,
+        'level': type(level).__name__,
+        'time_ms': now,
+        'random': random.getstate(),
+        'attrs': attrs,
+        'refs': refs,
+        'player': _capture_object(level.player),
+        'enemies': [(type(enemy).__name__, _capture_object(enemy)) for enemy in enemies],
+        'floating_texts': [(text.text, text.position, text.color, text.end_time, text.screen_space)
+                           for text in floating_texts] if floating_texts is not None else []
+    }
+
+def _enemy_classes(level) -> Dict[str, type]:
+    classes = {enemy_class.__name__: enemy_class for enemy_class in getattr(type(level), 'ENEMY_TYPES', ())}
+    for enemy in level.enemies:
+        classes.setdefault(type(enemy).__name__, type(enemy))
+    return classes
+
+def restore_level(level, snapshot: Dict[str, object]):
+    """
+    Devuelve el nivel al estado de `snapshot`. Reutiliza los enemigos vivos
+    de la misma clase, pide al pool los que falten y libera los que sobren.
+    Si el nivel tiene GameClock, también restaura su tiempo simulado.
+    """
+    if snapshot['version'] != SNAPSHOT_VERSION or snapshot['level'] != type(level).__name__:
+        raise ValueError(f"La instantánea es de {snapshot['level']}, no de {type(level).__name__}")
+    classes = _enemy_classes(level)
+
+    # Enemigos: emparejar por clase con los que ya existen
+    available: Dict[str, list] = {}
+    for enemy in level.enemies:
+        available.setdefault(type(enemy).__name__, []).append(enemy)
+    for existing in available.values():
+        existing.reverse()
+    extra_groups = [group for group in (getattr(level, 'all_sprites', None),) if group is not None]
+    restored = []
+    for class_name, state in snapshot['enemies']:
+        existing = available.get(class_name)
+        if existing:
+            enemy = existing.pop()
+        else:
+            x, y = state['rects']['rect'][:2]
+            enemy = enemy_pool.acquire(classes[class_name], x, y)
+            level.enemies.add(enemy)
+            for group in extra_groups:
+                group.add(enemy)
+        _restore_object(enemy, state)
+        restored.append(enemy)
+    for leftovers in available.values():
+        for enemy in leftovers:
+            enemy_pool.release(enemy)
+    # El orden del grupo es el orden de actualización: dejarlo igual que al capturar
+    level.enemies.empty()
+    level.enemies.add(*restored)
+
+    _restore_attrs(level, snapshot['attrs'])
+    for name, enemy_index in snapshot['refs'].items():
+        setattr(level, name, restored[enemy_index])
+    _restore_object(level.player, snapshot['player'])
+
+    floating_texts = getattr(level, 'floating_texts', None)
+    if floating_texts is not None:
+        floating_texts.clear()
+        for text, position, color, end_time, screen_space in snapshot['floating_texts']:
+            floating_texts.add(text, position, color, end_time, screen_space)
+
+    random.setstate(snapshot['random'])
+    clock = getattr(level, 'clock', None)
+    if clock is not None and hasattr(clock, 'sim_ms'):
+        clock.sim_ms = float(snapshot['time_ms'])
+        clock.remember(())
+    camera = getattr(level, 'camera', None)
+    if camera is not None:
+        camera.snap(level.player)
+    renderer = getattr(level, 'renderer', None)
+    if renderer is not None:
+        renderer.invalidate()
+
+def save_checkpoint(level):
+    """Guarda el estado actual como punto de control del nivel (level.checkpoint)."""
+    level.checkpoint = capture_level(level)
+
+def retry_from_checkpoint(level) -> bool:
+    """
+    Devuelve el nivel a su último punto de control para volver a llamar a
+    level.run(). Retorna False si el nivel no guardó ninguno.
+    """
+    snapshot = getattr(level, 'checkpoint', None)
+    if snapshot is None:
+        return False
+    restore_level(level, snapshot)
+    # run() arranca el GameClock: que siga desde el tiempo del punto de control
+    level.clock.origin_ms = snapshot['time_ms']
+    level.player.particles.clear()
+    return True
+
+def to_bytes(snapshot: Dict[str, object]) -> bytes:
+    """Formato compacto para guardar o enviar la instantánea."""
+    return zlib.compress(pickle.dumps(snapshot, pickle.HIGHEST_PROTOCOL), 1)
+
+def from_bytes(data: bytes) -> Dict[str, object]:
+    return pickle.loads(zlib.decompress(data))
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Mide captura y restauración sobre una partida headless."""
+    from src.headless import POLICIES, HeadlessRunner, ScriptedInput, init_headless
+    parser = argparse.ArgumentParser(description="Tiempo de captura/restauración de instantáneas")
+    parser.add_argument('--level', type=int, default=1, choices=[1, 2, 3, 4])
+    parser.add_argument('--ticks', type=int, default=600, help="Ticks a jugar antes de capturar")
+    parser.add_argument('--repeat', type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    init_headless()
+    runner = HeadlessRunner(args.level, ScriptedInput(policy=POLICIES['aggressive'](0)), seed=0)
+    try:
+        while runner.tick < args.ticks and runner.step():
+            pass
+        snapshot = runner.snapshot()
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            capture_level(runner.level)
+        capture_ms = (time.perf_counter() - start) * 1000 / args.repeat
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            restore_level(runner.level, snapshot)
+        restore_ms = (time.perf_counter() - start) * 1000 / args.repeat
+    finally:
+        runner.close()
+    print(f"⏱️ {type(runner.level).__name__} con {len(snapshot['enemies'])} enemigos: "
+          f"captura {capture_ms:.3f} ms, restauración {restore_ms:.3f} ms, "
+          f"{len(to_bytes(snapshot))} bytes")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,9 @@
 import pygame
 import os
-import random
-from typing import Dict, List, Tuple, Optional, Union
+import re
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Tuple, Optional, Union
 from pathlib import Path
 
 # Inicializar pygame si no está inicializado
@@ -12,27 +14,71 @@ if not pygame.get_init():
 BASE_DIR = Path(os.getcwd())
 ASSETS_DIR = BASE_DIR / "assets"
 DEFAULT_SIZE = (64, 64)
+BACKGROUND_SIZE = (800, 600)
+DEFAULT_FONT = 'arial'
+TEXT_CACHE_MAX_BYTES = 8 * 1024 * 1024  # 8 MB de superficies de texto
+
+# Fuente de tiempo del juego. Por defecto es el reloj real de pygame; el modo
+# headless la reemplaza por un reloj simulado que avanza con paso fijo.
+_time_source: Optional[Callable[[], int]] = None
+
+def get_ticks() -> int:
+    """Milisegundos de juego transcurridos (reales o simulados)."""
+    if _time_source is not None:
+        return _time_source()
+    return pygame.time.get_ticks()
+
+def set_time_source(source: Optional[Callable[[], int]]):
+    """Instala un reloj alternativo para get_ticks (None restaura el reloj real)."""
+    global _time_source
+    _time_source = source
+
+# Paquete de assets precocinado (ver src/asset_pack.py). Si está cargado,
+# load_animation y load_background lo consultan antes de ir a disco.
+_asset_pack = None
+
+def set_asset_pack(pack):
+    """Registra el paquete de assets activo (None lo desactiva)."""
+    global _asset_pack
+    _asset_pack = pack
+
+def get_asset_pack():
+    """Retorna el paquete de assets activo o None."""
+    return _asset_pack
+
+def flip_frames(frames: List[pygame.Surface]) -> List[pygame.Surface]:
+    """Crea la versión espejada (horizontal) de una lista de frames."""
+    return [pygame.transform.flip(frame, True, False) for frame in frames]
 
 class Animation:
-    def __init__(self, frames: List[pygame.Surface], frame_duration: int = 100):
+    def __init__(self, frames: List[pygame.Surface], frame_duration: int = 100,
+                 flipped_frames: Optional[List[pygame.Surface]] = None):
         self.frames = frames
+        # Frames espejados precalculados para no voltear en cada tick
+        self.flipped_frames = flipped_frames if flipped_frames is not None else flip_frames(frames)
         self.frame_duration = frame_duration
         self.current_frame = 0
-        self.last_update = pygame.time.get_ticks()
+        self.last_update = get_ticks()
         self.finished = False
         
-    def update(self) -> pygame.Surface:
-        current_time = pygame.time.get_ticks()
-        if current_time - self.last_update > self.frame_duration:
+    def update(self, frame_scale: int = 1) -> pygame.Surface:
+        """Avanza un frame si pasó su duración (multiplicada por `frame_scale`, ver src.lod)."""
+        current_time = get_ticks()
+        if current_time - self.last_update > self.frame_duration * frame_scale:
             self.current_frame = (self.current_frame + 1) % len(self.frames)
             self.last_update = current_time
             if self.current_frame == 0:
                 self.finished = True
         return self.frames[self.current_frame]
     
-    def get_current_frame(self) -> pygame.Surface:
+    def get_current_frame(self, flipped: bool = False) -> pygame.Surface:
+        if flipped:
+            return self.flipped_frames[self.current_frame]
         return self.frames[self.current_frame]
     
+    def is_complete(self) -> bool:
+        return self.finished
+    
     def reset(self):
         self.current_frame = 0
         self.finished = False
@@ -42,10 +88,21 @@ def create_placeholder_animations(animations_config: Dict[str, Tuple[str, int]],
     """Crea animaciones placeholder cuando no se encuentra el directorio del personaje."""
     animations = {}
     for anim_name, (_, frame_count) in animations_config.items():
-        frames = [create_placeholder_image(size or DEFAULT_SIZE) for _ in range(frame_count)]
+        frames = [get_placeholder_image(size or DEFAULT_SIZE) for _ in range(frame_count)]
         animations[anim_name] = Animation(frames)
     return animations
 
+# Placeholders ya dibujados, uno por tamaño (se comparten entre frames)
+_placeholder_cache: Dict[Tuple[int, int], pygame.Surface] = {}
+
+def get_placeholder_image(size: Tuple[int, int]) -> pygame.Surface:
+    """Placeholder cacheado por tamaño; no debe modificarse (es compartido)."""
+    size = tuple(size)
+    placeholder = _placeholder_cache.get(size)
+    if placeholder is None:
+        placeholder = _placeholder_cache[size] = create_placeholder_image(size)
+    return placeholder
+
 def create_placeholder_image(size: Tuple[int, int]) -> pygame.Surface:
     """Crea una imagen placeholder cuando no se encuentra el archivo."""
     surface = pygame.Surface(size, pygame.SRCALPHA)
@@ -67,7 +124,7 @@ def create_placeholder_image(size: Tuple[int, int]) -> pygame.Surface:
     # Texto informativo
     try:
         font_size = min(size[0]//4, 20)
-        font = pygame.font.SysFont('arial', font_size)
+        font = get_font(font_size)
         text = font.render(f"{size[0]}x{size[1]}", True, (255, 255, 255))
         text_rect = text.get_rect(center=(size[0]/2, size[1]/2))
         surface.blit(text, text_rect)
@@ -94,6 +151,8 @@ def load_image(path: str, size: Optional[Tuple[int, int]] = None) -> pygame.Surf
 
 def load_sound(filename: str, volume: float = 1.0) -> Optional[pygame.mixer.Sound]:
     """Carga un archivo de sonido."""
+    if not pygame.mixer.get_init():
+        return None
     try:
         path = ASSETS_DIR / "sounds" / filename
         if not path.exists():
@@ -109,6 +168,8 @@ def load_sound(filename: str, volume: float = 1.0) -> Optional[pygame.mixer.Soun
 
 def play_music(filename: str, loop: bool = True, volume: float = 0.7, fade_ms: int = 1000):
     """Reproduce música de fondo con fade in/out."""
+    if not pygame.mixer.get_init():
+        return
     try:
         path = ASSETS_DIR / "sounds" / filename
         if not path.exists():
@@ -124,7 +185,8 @@ def play_music(filename: str, loop: bool = True, volume: float = 0.7, fade_ms: i
 
 def stop_music(fade_ms: int = 1000):
     """Detiene la música con fade out."""
-    pygame.mixer.music.fadeout(fade_ms)
+    if pygame.mixer.get_init():
+        pygame.mixer.music.fadeout(fade_ms)
 
 def create_temporary_background(width: int = 800, height: int = 600, 
                               color: Tuple[int, int, int] = (50, 50, 50)) -> pygame.Surface:
@@ -139,42 +201,160 @@ def create_temporary_background(width: int = 800, height: int = 600,
         pygame.draw.line(surface, (70, 70, 70), (0, y), (width, y))
     
     # Agregar texto de placeholder
-    font = pygame.font.Font(None, 36)
+    font = get_font(36, face=None)
     text = font.render("Fondo Temporal", True, (100, 100, 100))
     text_rect = text.get_rect(center=(width/2, height/2))
     surface.blit(text, text_rect)
     
     return surface
 
+# Fondos ya cargados: nombre -> Surface (los niveles solo leen de ellos)
+_background_cache: Dict[str, pygame.Surface] = {}
+
+def store_background(image_name: str, background: pygame.Surface):
+    """Guarda en la caché un fondo cargado por otro medio (ej: el precargador)."""
+    _background_cache[image_name] = background
+
 def load_background(image_name: str) -> pygame.Surface:
     """Carga una imagen de fondo desde 'assets/images/backgrounds/'."""
+    cached = _background_cache.get(image_name)
+    if cached is not None:
+        return cached
+    background = read_background(image_name)
+    _background_cache[image_name] = background
+    return background
+
+def read_background(image_name: str, size: Tuple[int, int] = BACKGROUND_SIZE,
+                    alpha: bool = False) -> pygame.Surface:
+    """
+    Lee un fondo (del paquete de assets o de disco) escalado a `size` sin
+    pasar por la caché. Si la imagen ya mide `size` no se escala; con
+    `alpha` conserva la transparencia (capas de parallax).
+    """
+    if _asset_pack is not None and not alpha:
+        packed = _asset_pack.get_background(image_name, size)
+        if packed is not None:
+            return packed
     try:
         path = ASSETS_DIR / "images" / "backgrounds" / image_name
         if not path.exists():
             print(f"⚠️ Fondo no encontrado: {path}")
-            return create_temporary_background()
+            return create_temporary_background(*size)
             
-        background = pygame.image.load(str(path)).convert()
-        return pygame.transform.scale(background, (800, 600))
+        background = pygame.image.load(str(path))
+        background = background.convert_alpha() if alpha else background.convert()
+        if background.get_size() == tuple(size):
+            return background
+        return pygame.transform.scale(background, size)
     except Exception as e:
         print(f"❌ Error cargando el fondo {image_name}: {e}")
-        return create_temporary_background()
+        return create_temporary_background(*size)
+
+# Registro de fuentes: (familia, tamaño) -> Font. SysFont recorre las fuentes
+# del sistema en cada llamada, así que cada combinación se crea una sola vez.
+_font_registry: Dict[Tuple[Optional[str], int], pygame.font.Font] = {}
+
+def get_font(font_size: int, face: Optional[str] = DEFAULT_FONT) -> pygame.font.Font:
+    """Retorna la fuente (familia, tamaño) creándola solo la primera vez."""
+    key = (face, font_size)
+    font = _font_registry.get(key)
+    if font is None:
+        if face is None:
+            font = pygame.font.Font(None, font_size)
+        else:
+            font = pygame.font.SysFont(face, font_size)
+        _font_registry[key] = font
+    return font
+
+class TextCache:
+    """
+    Caché LRU de textos renderizados.
+    Clave: (texto, tamaño, color, sombra, color de sombra). Cuando la memoria
+    ocupada supera max_bytes se descartan las entradas menos usadas.
+    """
+    def __init__(self, max_bytes: int = TEXT_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.entries: "OrderedDict[tuple, pygame.Surface]" = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, text: str, font_size: int, color: Tuple[int, int, int],
+            shadow: bool, shadow_color: Tuple[int, int, int] = (0, 0, 0)) -> pygame.Surface:
+        key = (text, font_size, tuple(color), shadow, tuple(shadow_color) if shadow else None)
+        surface = self.entries.get(key)
+        if surface is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = self._render(text, font_size, color, shadow, shadow_color)
+        self.entries[key] = surface
+        self.bytes += surface.get_pitch() * surface.get_height()
+        self._evict()
+        return surface
+
+    def set_max_bytes(self, max_bytes: int):
+        """Cambia el límite de memoria y descarta lo que sobre."""
+        self.max_bytes = max_bytes
+        self._evict()
+
+    def clear(self):
+        self.entries.clear()
+        self.bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': len(self.entries),
+            'bytes': self.bytes,
+            'max_bytes': self.max_bytes
+        }
+
+    def _evict(self):
+        # Siempre se conserva la última entrada aunque supere el límite
+        while self.bytes > self.max_bytes and len(self.entries) > 1:
+            _, surface = self.entries.popitem(last=False)
+            self.bytes -= surface.get_pitch() * surface.get_height()
+            self.evictions += 1
+
+    @staticmethod
+    def _render(text: str, font_size: int, color: Tuple[int, int, int],
+                shadow: bool, shadow_color: Tuple[int, int, int]) -> pygame.Surface:
+        font = get_font(font_size)
+        text_surface = font.render(text, True, color)
+        if not shadow:
+            surface = text_surface
+        else:
+            # Sombra desplazada 2px precompuesta en la misma superficie
+            width, height = text_surface.get_size()
+            surface = pygame.Surface((width + 2, height + 2), pygame.SRCALPHA)
+            surface.blit(font.render(text, True, shadow_color), (2, 2))
+            surface.blit(text_surface, (0, 0))
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha()
+        return surface
+
+text_cache = TextCache()
+
+def render_text(text: str, font_size: int = 30, color: Tuple[int, int, int] = (255, 255, 255),
+                shadow: bool = True, shadow_color: Tuple[int, int, int] = (0, 0, 0)) -> pygame.Surface:
+    """Retorna la superficie del texto (con sombra opcional) desde la caché."""
+    return text_cache.get(str(text), font_size, color, shadow, shadow_color)
 
 def draw_text(surface: pygame.Surface, text: str, position: Tuple[int, int], 
               font_size: int = 30, color: Tuple[int, int, int] = (255, 255, 255), 
-              shadow: bool = True, shadow_color: Tuple[int, int, int] = (0, 0, 0)):
-    """Dibuja texto con sombra opcional."""
+              shadow: bool = True, shadow_color: Tuple[int, int, int] = (0, 0, 0)) -> Optional[pygame.Rect]:
+    """Dibuja texto con sombra opcional. Retorna el área dibujada."""
     try:
-        font = pygame.font.SysFont('arial', font_size)
-        
-        if shadow:
-            shadow_surface = font.render(str(text), True, shadow_color)
-            surface.blit(shadow_surface, (position[0] + 2, position[1] + 2))
-        
-        text_surface = font.render(str(text), True, color)
-        surface.blit(text_surface, position)
+        return surface.blit(render_text(text, font_size, color, shadow, shadow_color), position)
     except Exception as e:
         print(f"⚠️ Error dibujando texto: {e}")
+        return None
 
 def show_floating_text(screen: pygame.Surface, 
                       text: str, 
@@ -199,23 +379,16 @@ def show_floating_text(screen: pygame.Surface,
         Tiempo (en ms) cuando el texto debe desaparecer
     """
     try:
-        font = pygame.font.SysFont('arial', font_size)
-        text_surface = font.render(str(text), True, color)
-        
-        # Añadir efecto de sombra
-        shadow_surface = font.render(str(text), True, (0, 0, 0))
-        screen.blit(shadow_surface, (position[0] + 2, position[1] + 2))
-        
-        # Dibujar texto principal
-        screen.blit(text_surface, position)
+        # Texto con sombra, renderizado una vez y reutilizado desde la caché
+        screen.blit(render_text(text, font_size, color), position)
         
-        return pygame.time.get_ticks() + duration
+        return get_ticks() + duration
     except Exception as e:
         print(f"⚠️ Error mostrando texto flotante: {e}")
-        return pygame.time.get_ticks()
+        return get_ticks()
 
-def draw_game_ui(screen: pygame.Surface, player, level_name: str, score: int, wave: int):
-    """Dibuja la interfaz del juego."""
+def draw_game_ui(screen: pygame.Surface, player, level_name: str, score: int, wave: int) -> pygame.Rect:
+    """Dibuja la interfaz del juego. Retorna el área que ocupa."""
     # Barras de estado
     bar_width = 200
     bar_height = 20
@@ -235,99 +408,298 @@ def draw_game_ui(screen: pygame.Surface, player, level_name: str, score: int, wa
                     (padding, padding * 2 + bar_height, mp_width, bar_height))
     
     # Textos
-    draw_text(screen, f"HP: {int(player.health)}%", (padding + 5, padding), 16)
-    draw_text(screen, f"MP: {int(player.mana)}%", (padding + 5, padding * 2 + bar_height), 16)
-    draw_text(screen, level_name, (padding, padding * 4 + bar_height * 2), 24)
-    draw_text(screen, f"Puntuación: {score}", (padding, padding * 6 + bar_height * 2), 20)
-    draw_text(screen, f"Oleada: {wave}", (padding, padding * 8 + bar_height * 2), 20)
-
-def create_particle_effect(position: Tuple[int, int], 
-                         color: Tuple[int, int, int], 
-                         particle_count: int = 10) -> List[Dict]:
-    """Crea un efecto de partículas."""
-    return [{
-        'pos': [position[0], position[1]],
-        'vel': [random.uniform(-2, 2), random.uniform(-2, 2)],
-        'timer': 255,
-        'color': color
-    } for _ in range(particle_count)]
-
-def update_particles(particles: List[Dict]) -> List[Dict]:
-    """Actualiza y filtra las partículas activas."""
-    return [p for p in particles if update_particle(p)]
-
-def update_particle(particle: Dict) -> bool:
-    """Actualiza una partícula individual y retorna si sigue activa."""
-    particle['pos'][0] += particle['vel'][0]
-    particle['pos'][1] += particle['vel'][1]
-    particle['timer'] -= 5
-    return particle['timer'] > 0
-
-def draw_particles(screen: pygame.Surface, particles: List[Dict]):
-    """Dibuja las partículas en la pantalla."""
-    for particle in particles:
-        color = (*particle['color'], particle['timer'])
-        pos = [int(particle['pos'][0]), int(particle['pos'][1])]
-        surface = pygame.Surface((4, 4), pygame.SRCALPHA)
-        pygame.draw.circle(surface, color, (2, 2), 2)
-        screen.blit(surface, pos)
+    area = pygame.Rect(padding, padding, bar_width, bar_height * 2 + padding)
+    for rect in (
+        draw_text(screen, f"HP: {int(player.health)}%", (padding + 5, padding), 16),
+        draw_text(screen, f"MP: {int(player.mana)}%", (padding + 5, padding * 2 + bar_height), 16),
+        draw_text(screen, level_name, (padding, padding * 4 + bar_height * 2), 24),
+        draw_text(screen, f"Puntuación: {score}", (padding, padding * 6 + bar_height * 2), 20),
+        draw_text(screen, f"Oleada: {wave}", (padding, padding * 8 + bar_height * 2), 20)
+    ):
+        if rect:
+            area.union_ip(rect)
+    return area
+
+# Caché de frames compartida por todo el proceso.
+# Clave: (personaje, configuración de animaciones, tamaño) -> {animación: (frames, frames espejados)}
+AnimationFrames = Tuple[List[pygame.Surface], List[pygame.Surface]]
+_animation_cache: Dict[tuple, Dict[str, AnimationFrames]] = {}
+_animation_cache_stats = {'hits': 0, 'misses': 0}
+
+# Máscaras de colisión de los frames cacheados (una por frame y orientación).
+# Clave: id del frame -> (frame, máscara, rect de los píxeles opacos relativo al frame);
+# el frame se guarda para validar el id.
+MaskEntry = Tuple[pygame.Surface, pygame.mask.Mask, pygame.Rect]
+_mask_cache: Dict[int, MaskEntry] = {}
+
+def _build_mask(surface: pygame.Surface) -> MaskEntry:
+    mask = pygame.mask.from_surface(surface)
+    rects = mask.get_bounding_rects()
+    bounds = rects[0].unionall(rects[1:]) if rects else surface.get_rect()
+    entry = _mask_cache[id(surface)] = (surface, mask, bounds)
+    return entry
+
+def _cache_masks(frames: List[pygame.Surface]):
+    for frame in frames:
+        if id(frame) not in _mask_cache:
+            _build_mask(frame)
+
+def _mask_entry(surface: pygame.Surface) -> MaskEntry:
+    entry = _mask_cache.get(id(surface))
+    if entry is None or entry[0] is not surface:
+        entry = _build_mask(surface)
+    return entry
+
+def get_mask(surface: pygame.Surface) -> pygame.mask.Mask:
+    """
+    Máscara de píxeles opacos de un frame. Los frames de la caché de
+    animaciones ya la traen calculada; cualquier otra Surface se calcula una
+    vez y queda guardada (no debe usarse con Surfaces que se modifican).
+    """
+    return _mask_entry(surface)[1]
+
+def get_mask_bounds(surface: pygame.Surface) -> pygame.Rect:
+    """Rect (relativo al frame) que encierra sus píxeles opacos; no debe modificarse."""
+    return _mask_entry(surface)[2]
+
+def _animation_cache_key(character_name: str,
+                         animations_config: Dict[str, Tuple[str, int]],
+                         size: Optional[Tuple[int, int]]) -> tuple:
+    return (character_name, tuple(animations_config.items()), tuple(size) if size else None)
+
+def load_animation_frames(character_name: str,
+                          animations_config: Dict[str, Tuple[str, int]],
+                          size: Optional[Tuple[int, int]] = None) -> Dict[str, AnimationFrames]:
+    """
+    Devuelve los frames de todas las animaciones de un personaje, junto con
+    su versión espejada.
+    Cada combinación (personaje, configuración, tamaño) se decodifica una sola
+    vez por proceso; las llamadas siguientes reutilizan las mismas listas.
+    """
+    key = _animation_cache_key(character_name, animations_config, size)
+    cached = _animation_cache.get(key)
+    if cached is not None:
+        _animation_cache_stats['hits'] += 1
+        return cached
+
+    _animation_cache_stats['misses'] += 1
+    frames = {}
+    for anim_name, (prefix, frame_count) in animations_config.items():
+        folder = animation_folder(character_name, anim_name)
+        anim_frames = load_animation(folder, prefix, frame_count, size)
+        flipped = flip_frames(anim_frames)
+        _cache_masks(anim_frames + flipped)
+        frames[anim_name] = (anim_frames, flipped)
+    _animation_cache[key] = frames
+    return frames
+
+def is_animation_cached(character_name: str,
+                        animations_config: Dict[str, Tuple[str, int]],
+                        size: Optional[Tuple[int, int]] = None) -> bool:
+    return _animation_cache_key(character_name, animations_config, size) in _animation_cache
+
+def store_animation_frames(character_name: str,
+                           animations_config: Dict[str, Tuple[str, int]],
+                           size: Optional[Tuple[int, int]],
+                           frames: Dict[str, List[pygame.Surface]]):
+    """Guarda en la caché frames cargados por otro medio (ej: el precargador)."""
+    key = _animation_cache_key(character_name, animations_config, size)
+    _animation_cache[key] = {anim_name: (anim_frames, flip_frames(anim_frames))
+                             for anim_name, anim_frames in frames.items()}
+    for anim_frames, flipped in _animation_cache[key].values():
+        _cache_masks(anim_frames + flipped)
+
+def get_animation_cache_stats() -> Dict[str, int]:
+    """Retorna aciertos, fallos y memoria residente de la caché de animaciones."""
+    seen = set()
+    frame_count = 0
+    memory = 0
+    for animations in _animation_cache.values():
+        for frames, flipped in animations.values():
+            for frame in frames + flipped:
+                if id(frame) in seen:
+                    continue
+                seen.add(id(frame))
+                frame_count += 1
+                memory += frame.get_pitch() * frame.get_height()
+    return {
+        'hits': _animation_cache_stats['hits'],
+        'misses': _animation_cache_stats['misses'],
+        'entries': len(_animation_cache),
+        'frames': frame_count,
+        'bytes': memory
+    }
+
+def clear_animation_cache():
+    """Vacía la caché de animaciones y reinicia sus contadores."""
+    _animation_cache.clear()
+    _mask_cache.clear()
+    _animation_cache_stats['hits'] = 0
+    _animation_cache_stats['misses'] = 0
 
 def load_character_animations(character_name: str, 
                            animations_config: Dict[str, Tuple[str, int]], 
                            size: Optional[Tuple[int, int]] = None) -> Dict[str, Animation]:
     """
     Carga todas las animaciones de un personaje.
+    Los frames se comparten a través de la caché; cada llamada recibe sus
+    propios objetos Animation con un cursor independiente.
     Args:
         character_name: Nombre de la carpeta del personaje
         animations_config: Diccionario con {nombre_animacion: (prefijo_archivo, num_frames)}
         size: Tamaño opcional para escalar los sprites
     """
-    animations = {}
-    
-    for anim_name, (prefix, frame_count) in animations_config.items():
-        # Usar el formato correcto de carpeta (ej: 'Geralt/Idle' para animación 'idle')
-        folder = f"{character_name}/{anim_name.capitalize()}"
-        frames = load_animation(folder, prefix, frame_count, size)
-        animations[anim_name] = Animation(frames)
-    
-    return animations
+    frames = load_animation_frames(character_name, animations_config, size)
+    return {anim_name: Animation(anim_frames, flipped_frames=flipped)
+            for anim_name, (anim_frames, flipped) in frames.items()}
         
+def animation_folder(character_name: str, anim_name: str) -> str:
+    """
+    Nombre lógico de una animación (ej: 'Geralt/Idle' para la animación 'idle').
+    No tiene que coincidir con la carpeta real: find_frame_path la resuelve con
+    el índice de frames.
+    """
+    return f"{character_name}/{anim_name.capitalize()}"
+
+# Índice de los frames de personajes, construido con un solo recorrido de
+# assets/images/characters en lugar de probar nombres con exists() por frame.
+# personaje normalizado -> prefijo normalizado -> {carpeta normalizada: rutas en orden natural}
+FrameIndex = Dict[str, Dict[str, Dict[str, List[Path]]]]
+_frame_index: Optional[FrameIndex] = None
+_frame_index_lock = threading.Lock()
+_FRAME_NAME = re.compile(r'^(.*?)[ _-]?(\d+)$')
+
+_NAME_SEPARATORS = str.maketrans('', '', ' _-')
+
+def _normalize_name(name: str) -> str:
+    """'Idle_Blink', 'Idle Blink' e 'idle-blink' se consideran el mismo nombre."""
+    return name.translate(_NAME_SEPARATORS).lower()
+
+def build_frame_index(root: Optional[Path] = None) -> FrameIndex:
+    """
+    Recorre una vez la carpeta de personajes y agrupa los PNG por personaje,
+    prefijo y carpeta. Los frames se ordenan por su número final (orden
+    natural: _2 va antes que _10), sea base 0 (_000) o base 1 (_1).
+    """
+    root = root or ASSETS_DIR / "images" / "characters"
+    index: FrameIndex = {}
+    if not root.is_dir():
+        return index
+    for character_dir in os.scandir(root):
+        if not character_dir.is_dir():
+            continue
+        prefixes = index.setdefault(_normalize_name(character_dir.name), {})
+        numbered: Dict[Tuple[str, str], List[Tuple[int, str]]] = {}
+        # (carpeta relativa, ruta) pendientes de recorrer; el personaje es la carpeta ''
+        pending = [('', character_dir.path)]
+        while pending:
+            folder, path = pending.pop()
+            for entry in os.scandir(path):
+                if entry.is_dir():
+                    pending.append((f"{folder}/{entry.name}" if folder else entry.name, entry.path))
+                    continue
+                stem, extension = os.path.splitext(entry.name)
+                match = _FRAME_NAME.match(stem) if extension.lower() == '.png' else None
+                if match is None:
+                    continue
+                key = (_normalize_name(match.group(1)), _normalize_name(folder))
+                numbered.setdefault(key, []).append((int(match.group(2)), entry.path))
+        for (prefix, folder), frames in sorted(numbered.items()):
+            frames.sort()
+            prefixes.setdefault(prefix, {})[folder] = [Path(path) for _, path in frames]
+    return index
+
+# (nombre lógico, prefijo) -> frames ya resueltos
+_frame_paths_cache: Dict[Tuple[str, str], List[Path]] = {}
+
+def get_frame_index() -> FrameIndex:
+    global _frame_index
+    if _frame_index is None:
+        # Los hilos del precargador pueden pedirlo a la vez: se construye una sola vez
+        with _frame_index_lock:
+            if _frame_index is None:
+                _frame_index = build_frame_index()
+    return _frame_index
+
+def refresh_frame_index():
+    """Descarta el índice para volver a recorrer el disco (ej: tras añadir assets)."""
+    global _frame_index
+    _frame_index = None
+    _frame_paths_cache.clear()
+
+def find_frame_paths(folder: str, prefix: str) -> List[Path]:
+    """
+    Frames de una animación en orden. `folder` es el nombre lógico de
+    animation_folder ('Personaje/Animación'). El prefijo se busca en todas las
+    carpetas del personaje sin distinguir mayúsculas, espacios ni guiones
+    bajos; si aparece en varias, se prefiere la carpeta que coincide con el
+    nombre de la animación.
+    """
+    paths = _frame_paths_cache.get((folder, prefix))
+    if paths is None:
+        paths = _frame_paths_cache[(folder, prefix)] = _resolve_frame_paths(folder, prefix)
+    return paths
+
+def _resolve_frame_paths(folder: str, prefix: str) -> List[Path]:
+    character, _, anim_name = folder.partition('/')
+    candidates = get_frame_index().get(_normalize_name(character), {}).get(_normalize_name(prefix))
+    if not candidates:
+        return []
+    anim_key = _normalize_name(anim_name)
+    if anim_key in candidates:
+        return candidates[anim_key]
+    for folder_key, paths in candidates.items():
+        if folder_key.startswith(anim_key) or anim_key.startswith(folder_key):
+            return paths
+    return next(iter(candidates.values()))
+
+def find_frame_path(folder: str, prefix: str, index: int) -> Optional[Path]:
+    """Archivo del frame `index` (base 0) de una animación, o None si no existe."""
+    paths = find_frame_paths(folder, prefix)
+    return paths[index] if index < len(paths) else None
+
+def decode_frame(frame_path: Path, size: Optional[Tuple[int, int]] = None) -> pygame.Surface:
+    """
+    Decodifica y escala un frame sin convertirlo al formato de pantalla.
+    Es seguro llamarla desde hilos de fondo; convert_alpha() queda para el hilo principal.
+    """
+    frame = pygame.image.load(str(frame_path))
+    if size:
+        frame = pygame.transform.scale(frame, size)
+    return frame
+
 def load_animation(folder: str, prefix: str, frame_count: int, size: Optional[Tuple[int, int]] = None) -> List[pygame.Surface]:
     """
     Carga una secuencia de imágenes para animación.
+    Si hay un paquete de assets cargado, los frames se toman ya escalados de él.
     Args:
         folder: Carpeta del personaje (ej: 'Geralt/Idle')
         prefix: Prefijo del archivo (ej: 'geralt_idle')
         frame_count: Número de frames
         size: Tamaño opcional para escalar los sprites
     """
+    if _asset_pack is not None:
+        packed = _asset_pack.get_frames(folder, prefix, frame_count, size)
+        if packed is not None:
+            return packed
+
+    paths = find_frame_paths(folder, prefix)
     frames = []
-    base_path = ASSETS_DIR / "images" / "characters"
-    
-    for i in range(frame_count):  # Cambiado para empezar desde 0
-        # Intentar diferentes formatos de nombre de archivo
-        possible_names = [
-            f"{prefix}_{i:03d}.png",       # formato 3 dígitos: prefix_000.png
-            f"{prefix}_{i + 1}.png",        # formato normal: prefix_1.png (para Geralt)
-        ]
-        
-        frame_loaded = False
-        for frame_name in possible_names:
-            frame_path = base_path / folder / frame_name
-            
+    missing = 0
+    for i in range(frame_count):
+        frame = None
+        if i < len(paths):
             try:
-                if frame_path.exists():
-                    frame = pygame.image.load(str(frame_path)).convert_alpha()
-                    if size:
-                        frame = pygame.transform.scale(frame, size)
-                    frames.append(frame)
-                    frame_loaded = True
-                    break
+                frame = decode_frame(paths[i], size).convert_alpha()
             except Exception as e:
-                continue
+                print(f"❌ Error cargando frame {paths[i]}: {e}")
+                frame = None
         
-        if not frame_loaded:
-            print(f"⚠️ No se encontró el archivo: {frame_path}")
-            frames.append(create_placeholder_image(size or DEFAULT_SIZE))
+        if frame is None:
+            missing += 1
+            frame = get_placeholder_image(size or DEFAULT_SIZE)
+        frames.append(frame)
+    if missing:
+        print(f"⚠️ Faltan {missing} de {frame_count} frames de {folder}/{prefix}")
     
-    return frames if frames else [create_placeholder_image(size or DEFAULT_SIZE)]
\ No newline at end of file
+    return frames if frames else [get_placeholder_image(size or DEFAULT_SIZE)]
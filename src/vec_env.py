@@ -0,0 +1,471 @@
+"""
+Entorno vectorizado estilo Gym sobre los niveles headless.
+
+VecEnv ejecuta N partidas (HeadlessRunner) repartidas entre procesos
+trabajadores. Las observaciones, recompensas, fines de episodio y acciones
+viven en un bloque de memoria compartida (multiprocessing.shared_memory):
+step() solo escribe las acciones, manda un comando corto por pipe a cada
+trabajador y lee los resultados como arrays NumPy. No se dibuja nada salvo
+que se pida un frame con render(i).
+
+Los episodios terminados se reinician solos (con la siguiente semilla) y su
+resultado va en `infos`. Las estadísticas de enemigos y del jugador se
+pueden sobrescribir para ajustar el balance por fuerza bruta.
+
+Uso:
+    env = VecEnv(1, num_envs=8, enemy_overrides={'Golem1': {'attack_damage': 30}})
+    obs = env.reset(seed=0)
+    obs, rewards, dones, infos = env.step(actions)
+    env.close()
+
+    python -m src.vec_env --level 1 --envs 8 --ticks 3600
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import multiprocessing
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pygame
+
+from src.utils import set_time_source
+from src.headless import SCREEN_SIZE, IDLE_FRAME, HeadlessRunner, InputFrame, ScriptedInput, init_headless
+
+# Acciones discretas: índice -> input de un tick
+ACTIONS: Tuple[InputFrame, ...] = (
+    InputFrame(),                                           # 0 nada
+    InputFrame(frozenset([pygame.K_LEFT])),                 # 1 izquierda
+    InputFrame(frozenset([pygame.K_RIGHT])),                # 2 derecha
+    InputFrame(pressed=(pygame.K_UP,)),                     # 3 saltar
+    InputFrame(frozenset([pygame.K_LEFT]), (pygame.K_UP,)), # 4 saltar a la izquierda
+    InputFrame(frozenset([pygame.K_RIGHT]), (pygame.K_UP,)),# 5 saltar a la derecha
+    InputFrame(pressed=(pygame.K_SPACE,)),                  # 6 atacar
+    InputFrame(pressed=(pygame.K_1,)),                      # 7 fuego
+    InputFrame(pressed=(pygame.K_2,)),                      # 8 hielo
+    InputFrame(pressed=(pygame.K_3,))                       # 9 trueno
+)
+
+# Observación (float32): jugador y los MAX_ENEMIES enemigos más cercanos en x
+PLAYER_FEATURES = ('x', 'y', 'velocity_x', 'velocity_y', 'health', 'mana', 'facing_right', 'is_jumping')
+ENEMY_FEATURES = ('dx', 'dy', 'health', 'present')
+MAX_ENEMIES = 8
+OBS_SIZE = len(PLAYER_FEATURES) + MAX_ENEMIES * len(ENEMY_FEATURES)
+
+DEFAULT_MAX_TICKS = 60 * 60
+
+Overrides = Dict[str, Dict[str, object]]
+
+# Atributo que el enemigo no tenía antes de aplicar un ajuste
+_MISSING = object()
+
+def _buffer_layout(num_envs: int) -> Tuple[int, Dict[str, Tuple[int, tuple, type]]]:
+    """Tamaño total y (offset, forma, dtype) de cada array del bloque compartido."""
+    layout = {}
+    offset = 0
+    for name, shape, dtype in (('obs', (num_envs, OBS_SIZE), np.float32),
+                               ('rewards', (num_envs,), np.float32),
+                               ('actions', (num_envs,), np.int32),
+                               ('dones', (num_envs,), np.bool_)):
+        layout[name] = (offset, shape, dtype)
+        offset += int(np.prod(shape)) * np.dtype(dtype).itemsize
+    return offset, layout
+
+def _buffer_views(buffer, num_envs: int) -> Dict[str, np.ndarray]:
+    _, layout = _buffer_layout(num_envs)
+    return {name: np.ndarray(shape, dtype, buffer=buffer, offset=offset)
+            for name, (offset, shape, dtype) in layout.items()}
+
+class _EnvSlot:
+    """
+    Una partida del entorno vectorizado.
+    Cada partida guarda su propio estado de `random` y activa su reloj simulado
+    antes de avanzar, así varias partidas pueden compartir proceso sin
+    interferir (y cada una es reproducible con su semilla).
+    """
+    def __init__(self, level: int, screen: pygame.Surface, max_ticks: int,
+                 enemy_overrides: Optional[Overrides], player_overrides: Optional[Dict[str, object]]):
+        self.level_number = level
+        self.screen = screen
+        self.max_ticks = max_ticks
+        self.enemy_overrides = enemy_overrides or {}
+        self.player_overrides = player_overrides or {}
+        self.runner: Optional[HeadlessRunner] = None
+        self.frame = IDLE_FRAME
+        self.rng_state = None
+        # Enemigo ajustado -> sus valores originales (se restauran antes de volver al pool)
+        self.tuned: Dict[object, Dict[str, object]] = {}
+        self.episode_return = 0.0
+        self.last_score = 0
+        self.last_health = 0.0
+
+    def reset(self, seed: int):
+        if self.runner is not None:
+            self._release()
+        state = random.getstate()
+        try:
+            self.runner = HeadlessRunner(self.level_number, ScriptedInput(policy=self._next_frame),
+                                         seed=seed, screen=self.screen)
+            self.rng_state = random.getstate()
+        finally:
+            random.setstate(state)
+            set_time_source(None)
+        level = self.runner.level
+        self._apply_player_overrides(level.player)
+        self._apply_enemy_overrides(level)
+        self.episode_return = 0.0
+        self.last_score = level.score
+        self.last_health = float(level.player.health)
+
+    def step(self, action: int) -> Tuple[float, bool]:
+        """Avanza un tick con `action` (índice de ACTIONS). Retorna (recompensa, terminado)."""
+        runner = self.runner
+        set_time_source(runner.clock.get_ticks)
+        state = random.getstate()
+        random.setstate(self.rng_state)
+        try:
+            self.frame = ACTIONS[action]
+            running = runner.step()
+            self._apply_enemy_overrides(runner.level)
+        finally:
+            self.rng_state = random.getstate()
+            random.setstate(state)
+            set_time_source(None)
+
+        # Recompensa: puntos ganados menos vida perdida
+        level = runner.level
+        health = float(level.player.health)
+        reward = float(level.score - self.last_score) - max(0.0, self.last_health - health)
+        self.last_score = level.score
+        self.last_health = health
+        self.episode_return += reward
+        return reward, not running or runner.tick >= self.max_ticks
+
+    def _next_frame(self, level, tick: int) -> InputFrame:
+        return self.frame
+
+    def observe(self, out: np.ndarray):
+        """Escribe la observación actual en `out` (fila de OBS_SIZE floats)."""
+        player = self.runner.level.player
+        out[:len(PLAYER_FEATURES)] = (player.rect.x, player.rect.y, player.velocity_x, player.velocity_y,
+                                      player.health, player.mana, player.facing_right, player.is_jumping)
+        enemies = out[len(PLAYER_FEATURES):].reshape(MAX_ENEMIES, len(ENEMY_FEATURES))
+        enemies.fill(0.0)
+        px, py = player.rect.center
+        nearest = sorted(self.runner.level.enemies, key=lambda enemy: abs(enemy.rect.centerx - px))
+        for row, enemy in zip(enemies, nearest):
+            row[:] = (enemy.rect.centerx - px, enemy.rect.centery - py, enemy.health, 1.0)
+
+    def result(self) -> Dict[str, object]:
+        result = self.runner.result()
+        result['episode_return'] = self.episode_return
+        return result
+
+    def render(self) -> bytes:
+        """Dibuja la partida entera en la pantalla y retorna sus píxeles RGB."""
+        level = self.runner.level
+        set_time_source(self.runner.clock.get_ticks)
+        try:
+            renderer = getattr(level, 'renderer', None)
+            if renderer is not None:
+                renderer.invalidate()
+            level.draw()
+            if renderer is not None:
+                renderer.end_frame()
+        finally:
+            set_time_source(None)
+        return pygame.image.tobytes(self.screen, 'RGB')
+
+    def close(self):
+        if self.runner is not None:
+            self._release()
+            self.runner = None
+
+    def _release(self):
+        """Devuelve a los pools los enemigos y textos de la partida anterior."""
+        level = self.runner.level
+        for enemy in list(self.tuned):
+            self._restore_enemy(enemy)
+        if hasattr(level, 'release_enemies'):
+            level.release_enemies()
+        floating_texts = getattr(level, 'floating_texts', None)
+        if floating_texts is not None:
+            floating_texts.clear()
+
+    def _apply_player_overrides(self, player):
+        for name, value in self.player_overrides.items():
+            if name == 'abilities':
+                # Se mezcla por habilidad: {'fire': {'damage': 50}}
+                for ability, stats in value.items():
+                    player.abilities[ability].update(stats)
+            else:
+                setattr(player, name, value)
+        if 'max_health' in self.player_overrides:
+            player.health = player.max_health
+        if 'max_mana' in self.player_overrides:
+            player.mana = player.max_mana
+
+    def _apply_enemy_overrides(self, level):
+        """
+        Aplica las estadísticas sobrescritas a los enemigos que aún no las
+        tienen. Los enemigos vienen del enemy_pool compartido, así que los que
+        el nivel ya devolvió al pool recuperan aquí sus valores originales.
+        """
+        if not self.enemy_overrides:
+            return
+        tuned = self.tuned
+        for enemy in [enemy for enemy in tuned if enemy not in level.enemies]:
+            self._restore_enemy(enemy)
+        for enemy in level.enemies:
+            if enemy in tuned:
+                continue
+            overrides = self.enemy_overrides.get(type(enemy).__name__) or {}
+            tuned[enemy] = {name: vars(enemy).get(name, _MISSING) for name in overrides}
+            for name, value in overrides.items():
+                setattr(enemy, name, value)
+            if 'max_health' in overrides:
+                enemy.health = enemy.max_health
+
+    def _restore_enemy(self, enemy):
+        """Deshace los ajustes de `enemy` (el pool lo reinicia con su vida máxima original)."""
+        for name, value in self.tuned.pop(enemy).items():
+            if value is _MISSING:
+                delattr(enemy, name)
+            else:
+                setattr(enemy, name, value)
+
+class _EnvGroup:
+    """Las partidas de un trabajador, escribiendo en sus filas de los arrays compartidos."""
+    def __init__(self, indices: Sequence[int], views: Dict[str, np.ndarray], level: int, max_ticks: int,
+                 enemy_overrides: Optional[Overrides], player_overrides: Optional[Dict[str, object]]):
+        screen = init_headless()
+        self.indices = list(indices)
+        self.views = views
+        self.slots = [_EnvSlot(level, screen, max_ticks, enemy_overrides, player_overrides)
+                      for _ in self.indices]
+        self.seeds = [0] * len(self.indices)
+
+    def reset(self, seeds: Sequence[int]):
+        obs = self.views['obs']
+        for i, (index, slot, seed) in enumerate(zip(self.indices, self.slots, seeds)):
+            self.seeds[i] = seed
+            slot.reset(seed)
+            slot.observe(obs[index])
+        self.views['rewards'][self.indices] = 0.0
+        self.views['dones'][self.indices] = False
+
+    def step(self, seed_stride: int) -> Dict[int, Dict[str, object]]:
+        """Avanza todas las partidas; retorna el resultado de las que terminaron (por índice)."""
+        views = self.views
+        obs, rewards, dones, actions = views['obs'], views['rewards'], views['dones'], views['actions']
+        infos = {}
+        for i, (index, slot) in enumerate(zip(self.indices, self.slots)):
+            reward, done = slot.step(int(actions[index]))
+            rewards[index] = reward
+            dones[index] = done
+            if done:
+                infos[index] = slot.result()
+                self.seeds[i] += seed_stride
+                slot.reset(self.seeds[i])
+            slot.observe(obs[index])
+        return infos
+
+    def render(self, index: int) -> bytes:
+        return self.slots[self.indices.index(index)].render()
+
+    def close(self):
+        for slot in self.slots:
+            slot.close()
+
+def _worker(connection, buffer_name: str, num_envs: int, indices: Sequence[int], level: int,
+            max_ticks: int, enemy_overrides: Optional[Overrides], player_overrides: Optional[Dict[str, object]]):
+    """Bucle de un proceso trabajador: ejecuta los comandos que llegan por el pipe."""
+    buffer = shared_memory.SharedMemory(name=buffer_name)
+    group = None
+    try:
+        group = _EnvGroup(indices, _buffer_views(buffer.buf, num_envs), level, max_ticks,
+                          enemy_overrides, player_overrides)
+        connection.send(('ready', None))
+        while True:
+            command, argument = connection.recv()
+            if command == 'reset':
+                group.reset(argument)
+                connection.send(('ok', None))
+            elif command == 'step':
+                connection.send(('ok', group.step(argument)))
+            elif command == 'render':
+                connection.send(('ok', group.render(argument)))
+            elif command == 'close':
+                break
+    except Exception as e:
+        connection.send(('error', f"{type(e).__name__}: {e}"))
+    finally:
+        if group is not None:
+            group.close()
+        # Las vistas NumPy deben soltarse antes de cerrar el bloque
+        group = None
+        buffer.close()
+        connection.close()
+
+class VecEnv:
+    """
+    N partidas headless de un nivel con API estilo Gym vectorizado.
+
+    Con workers=0 todas las partidas se ejecutan en este proceso (útil para
+    depurar); si no, se reparten en `workers` procesos (por defecto, uno por
+    núcleo) que comparten los arrays de observaciones con este.
+    """
+    def __init__(self, level: int = 1, num_envs: int = 8, workers: Optional[int] = None,
+                 max_ticks: int = DEFAULT_MAX_TICKS, enemy_overrides: Optional[Overrides] = None,
+                 player_overrides: Optional[Dict[str, object]] = None):
+        if level not in (1, 2):
+            raise ValueError("VecEnv solo admite Level1 y Level2")
+        self.level = level
+        self.num_envs = num_envs
+        self.workers = min(num_envs, os.cpu_count() or 1) if workers is None else min(workers, num_envs)
+        self.num_actions = len(ACTIONS)
+        self.observation_shape = (num_envs, OBS_SIZE)
+        self._buffer = None
+        self._connections = []
+        self._processes = []
+        self._local: Optional[_EnvGroup] = None
+        self._closed = False
+
+        if self.workers == 0:
+            self._views = _buffer_views(bytearray(_buffer_layout(num_envs)[0]), num_envs)
+            self._local = _EnvGroup(range(num_envs), self._views, level, max_ticks,
+                                    enemy_overrides, player_overrides)
+            self._owner = {index: None for index in range(num_envs)}
+            return
+
+        self._buffer = shared_memory.SharedMemory(create=True, size=_buffer_layout(num_envs)[0])
+        self._views = _buffer_views(self._buffer.buf, num_envs)
+        self._views['actions'][:] = 0
+        self._owner = {}
+        try:
+            for worker, indices in enumerate(np.array_split(np.arange(num_envs), self.workers)):
+                indices = [int(index) for index in indices]
+                parent, child = multiprocessing.Pipe()
+                process = multiprocessing.Process(
+                    target=_worker, name=f"vec_env-{worker}", daemon=True,
+                    args=(child, self._buffer.name, num_envs, indices, level, max_ticks,
+                          enemy_overrides, player_overrides))
+                process.start()
+                child.close()
+                self._connections.append(parent)
+                self._processes.append(process)
+                for index in indices:
+                    self._owner[index] = worker
+            self._gather()
+        except Exception:
+            self.close()
+            raise
+
+    def reset(self, seed: int = 0) -> np.ndarray:
+        """Reinicia todas las partidas; la partida i usa la semilla seed + i."""
+        seeds = [seed + index for index in range(self.num_envs)]
+        if self._local is not None:
+            self._local.reset(seeds)
+        else:
+            for worker, connection in enumerate(self._connections):
+                connection.send(('reset', [seeds[index] for index, owner in self._owner.items() if owner == worker]))
+            self._gather()
+        return self._views['obs'].copy()
+
+    def step(self, actions) -> Tuple[np.ndarray, np.ndarray, np.ndarray, List[Dict[str, object]]]:
+        """
+        Avanza un tick todas las partidas. `actions` son índices de ACTIONS.
+        Retorna (observaciones, recompensas, terminados, infos); infos[i] tiene
+        el resultado del episodio si la partida i terminó (y ya se reinició).
+        """
+        self._views['actions'][:] = actions
+        if self._local is not None:
+            finished = self._local.step(self.num_envs)
+        else:
+            for connection in self._connections:
+                connection.send(('step', self.num_envs))
+            finished = {}
+            for infos in self._gather():
+                finished.update(infos)
+        infos = [finished.get(index, {}) for index in range(self.num_envs)]
+        views = self._views
+        return views['obs'].copy(), views['rewards'].copy(), views['dones'].copy(), infos
+
+    def render(self, index: int = 0) -> np.ndarray:
+        """Frame actual de la partida `index` como array (alto, ancho, 3) de uint8."""
+        if self._local is not None:
+            pixels = self._local.render(index)
+        else:
+            connection = self._connections[self._owner[index]]
+            connection.send(('render', index))
+            pixels = self._reply(connection)
+        width, height = SCREEN_SIZE
+        return np.frombuffer(pixels, np.uint8).reshape(height, width, 3)
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        if self._local is not None:
+            self._local.close()
+        for connection in self._connections:
+            try:
+                connection.send(('close', None))
+            except (BrokenPipeError, OSError):
+                pass
+        for process in self._processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        for connection in self._connections:
+            connection.close()
+        if self._buffer is not None:
+            self._views = None
+            self._buffer.close()
+            self._buffer.unlink()
+            self._buffer = None
+
+    def __enter__(self) -> 'VecEnv':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _gather(self) -> list:
+        return [self._reply(connection) for connection in self._connections]
+
+    def _reply(self, connection):
+        status, value = connection.recv()
+        if status == 'error':
+            raise RuntimeError(f"Error en un trabajador de VecEnv: {value}")
+        return value
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Mide el rendimiento de rollouts con acciones al azar."""
+    parser = argparse.ArgumentParser(description="Rollouts vectorizados con acciones al azar")
+    parser.add_argument('--level', type=int, default=1, choices=[1, 2])
+    parser.add_argument('--envs', type=int, default=8)
+    parser.add_argument('--workers', type=int, help="Procesos trabajadores (0 = en este proceso)")
+    parser.add_argument('--ticks', type=int, default=600, help="Ticks a avanzar cada partida")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    with VecEnv(args.level, args.envs, args.workers) as env:
+        env.reset(args.seed)
+        episodes = []
+        start = time.perf_counter()
+        for _ in range(args.ticks):
+            _, _, _, infos = env.step(rng.integers(0, env.num_actions, args.envs))
+            episodes.extend(info for info in infos if info)
+        elapsed = time.perf_counter() - start
+    steps = args.ticks * args.envs
+    print(f"⏱️ {steps} pasos ({args.envs} partidas, {env.workers} trabajadores) en {elapsed:.2f} s "
+          f"({steps / max(elapsed, 1e-9):.0f} pasos/s), {len(episodes)} episodios terminados")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())